@@ -0,0 +1,230 @@
+"""
+Bulk profile analysis for whole cohorts.
+
+Input is a directory or a zip archive with one transcript and one resume per student,
+named `<student>_transcript.pdf` + `<student>_resume.pdf` (in any folder), or
+`<student>/transcript.pdf` + `<student>/resume.pdf`. An optional `manifest.csv`
+(columns: student_id, desired_position, github_profile) overrides per-student settings.
+Student ids are case-insensitive; hidden files and macOS `__MACOSX/` entries are skipped.
+Documents are read when their chunk is analyzed, each up to MAX_PDF_BYTES.
+
+Usage:
+    python -m app.batch cohort.zip --position "Data Scientist" > results.jsonl
+"""
+import argparse
+import csv
+import functools
+import io
+import json
+import os
+import re
+import sys
+import zipfile
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from app import config
+from app.data_processor import DataProcessor
+from app.pdf_ingest import PDFLimitError
+from app.recommendation_engine import RecommendationEngine
+
+DOCUMENT_KINDS = ("transcript", "resume")
+
+
+@dataclass
+class BatchItem:
+    student_id: str
+    # Document kind -> reads its bytes (from the archive or directory, when analyzed)
+    documents: Dict[str, Callable[[], bytes]] = field(default_factory=dict)
+    desired_position: Optional[str] = None
+    github_profile: Optional[str] = None
+
+
+def _classify_path(path: str):
+    """Returns (student_id, kind) for a PDF path, or None if it is not a transcript/resume."""
+    parts = [p for p in re.split(r"[\\/]", path) if p]
+    # macOS zips carry AppleDouble copies (__MACOSX/.../._<name>) of every file
+    if any(part.startswith(".") or part == "__MACOSX" for part in parts):
+        return None
+    name = parts[-1].lower()
+    if not name.endswith(".pdf"):
+        return None
+    kind = next((k for k in DOCUMENT_KINDS if k in name), None)
+    if kind is None:
+        return None
+    stem = re.sub(kind, "", parts[-1][:-4], flags=re.IGNORECASE).strip(" _-.")
+    if stem:
+        return stem, kind
+    return (parts[-2] if len(parts) > 1 else "student"), kind
+
+
+def _group(entries: Iterable, read: Callable[[str], bytes]) -> List[BatchItem]:
+    # Keyed by the casefolded id; the item keeps the first spelling seen
+    items: Dict[str, BatchItem] = {}
+    manifest = None
+    for path in entries:
+        if os.path.basename(path).lower() == "manifest.csv":
+            manifest = read(path).decode("utf-8-sig")
+            continue
+        classified = _classify_path(path)
+        if classified is None:
+            continue
+        student_id, kind = classified
+        item = items.setdefault(student_id.casefold(), BatchItem(student_id))
+        item.documents[kind] = functools.partial(read, path)
+    if manifest:
+        for row in csv.DictReader(io.StringIO(manifest)):
+            item = items.get((row.get("student_id") or "").strip().casefold())
+            if item is not None:
+                item.desired_position = (row.get("desired_position") or "").strip() or None
+                item.github_profile = (row.get("github_profile") or "").strip() or None
+    return [items[key] for key in sorted(items)]
+
+
+def _check_size(name: str, size: int):
+    if size > config.MAX_PDF_BYTES:
+        raise PDFLimitError(f"{name} is larger than {config.MAX_PDF_BYTES} bytes")
+
+
+def collect_from_zip(archive: zipfile.ZipFile) -> List[BatchItem]:
+    """Groups the PDFs of an open zip archive by student; it must stay open until they are analyzed."""
+    def read(name):
+        info = archive.getinfo(name)
+        # The declared size bounds what zipfile will decompress
+        _check_size(name, info.file_size)
+        return archive.read(info)
+
+    names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    return _group(names, read)
+
+
+def collect_from_directory(root: str) -> List[BatchItem]:
+    """Groups the PDFs under a directory by student."""
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        paths.extend(os.path.relpath(os.path.join(dirpath, name), root) for name in filenames)
+
+    def read(rel_path):
+        path = os.path.join(root, rel_path)
+        _check_size(rel_path, os.path.getsize(path))
+        with open(path, "rb") as f:
+            return f.read()
+
+    return _group(sorted(paths), read)
+
+
+def _chunks(items: List[BatchItem], size: int) -> Iterator[List[BatchItem]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def analyze_batch(data_processor: DataProcessor,
+                  recommendation_engine: Optional[RecommendationEngine],
+                  items: List[BatchItem],
+                  desired_position: str,
+                  chunk_size: int = 16) -> Iterator[Dict]:
+    """
+    Analyzes students chunk by chunk and yields one result per student.
+    Within a chunk, skill extraction and resume section extraction share a
+    single NER pass and a single encoder call across all resumes.
+    """
+    for chunk in _chunks(items, max(1, chunk_size)):
+        ready, errors = [], []
+        for item in chunk:
+            missing = [kind for kind in DOCUMENT_KINDS if kind not in item.documents]
+            if missing:
+                errors.append((item, f"missing {' and '.join(missing)}"))
+                continue
+            try:
+                texts = {
+                    kind: data_processor.extract_text_from_pdf(io.BytesIO(item.documents[kind]()))
+                    for kind in DOCUMENT_KINDS
+                }
+            except Exception as e:
+                errors.append((item, f"could not read PDF: {e}"))
+                continue
+            ready.append((item, texts))
+        for item, message in errors:
+            yield {"student_id": item.student_id, "status": "error", "message": message}
+        if not ready:
+            continue
+        # One NER pass and one encoder call per chunk, shared by skills and sections
+        contexts = data_processor.document_contexts([texts["resume"] for _, texts in ready])
+        data_processor.prepare_contexts(contexts, skills=True, sections=True)
+        skills_batch = data_processor.skills_from_contexts(contexts)
+        structured_resumes = data_processor.structured_resume_from_contexts(contexts)
+        for (item, texts), skills, structured_resume in zip(ready, skills_batch, structured_resumes):
+            position = item.desired_position or desired_position
+            try:
+                education = data_processor.extract_education(texts["transcript"])
+                github_data = data_processor.analyze_github_profile(item.github_profile)
+                experience_level = data_processor.calculate_experience_level({
+                    "skills": skills,
+                    "education": education,
+                    "github_data": github_data
+                })
+                recommendations = None
+                if recommendation_engine is not None:
+                    recommendations = recommendation_engine.get_recommendations(
+                        desired_position=position,
+                        experience_level=experience_level,
+                        skills=skills
+                    )
+                yield {
+                    "student_id": item.student_id,
+                    "status": "success",
+                    "data": {
+                        "desired_position": position,
+                        "experience_level": experience_level,
+                        "skills": skills,
+                        "education": education,
+                        "github_data": github_data,
+                        "structured_resume": structured_resume,
+                        "structured_transcript": data_processor.extract_structured_transcript(texts["transcript"]),
+                        "recommendations": recommendations
+                    }
+                }
+            except Exception as e:
+                yield {"student_id": item.student_id, "status": "error", "message": str(e)}
+
+
+def to_jsonl(results: Iterable[Dict]) -> Iterator[str]:
+    for result in results:
+        yield json.dumps(result, ensure_ascii=False) + "\n"
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Analyze a cohort of student profiles and write JSON Lines.")
+    parser.add_argument("input", help="directory or .zip archive with transcripts and resumes")
+    parser.add_argument("--position", required=True, help="desired position (overridable in manifest.csv)")
+    parser.add_argument("--output", "-o", help="output .jsonl file (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=16, help="resumes encoded per batch")
+    parser.add_argument("--no-recommendations", action="store_true", help="skip Stepik/hh.ru lookups")
+    args = parser.parse_args(argv)
+
+    archive = None
+    if os.path.isdir(args.input):
+        items = collect_from_directory(args.input)
+    else:
+        try:
+            archive = zipfile.ZipFile(args.input)
+        except (OSError, zipfile.BadZipFile) as e:
+            parser.error(f"cannot read {args.input}: {e}")
+        items = collect_from_zip(archive)
+    data_processor = DataProcessor()
+    recommendation_engine = None if args.no_recommendations else RecommendationEngine(encode=data_processor.encode)
+    results = analyze_batch(data_processor, recommendation_engine, items, args.position, args.chunk_size)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for line in to_jsonl(results):
+            out.write(line)
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if archive is not None:
+            archive.close()
+
+
+if __name__ == "__main__":
+    main()
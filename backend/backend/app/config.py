@@ -0,0 +1,108 @@
+import os
+
+# Sentence embedding model used for semantic similarity
+SIM_MODEL_NAME = os.getenv("SIM_MODEL_NAME", "paraphrase-multilingual-MiniLM-L12-v2")
+# Encoder backend: "torch" (reference), "int8" (dynamic quantization) or "onnx" (ONNX Runtime)
+SIM_BACKEND = os.getenv("SIM_BACKEND", "torch").lower()
+# ONNX file inside the model repository (e.g. "onnx/model_qint8_avx512_vnni.onnx"); exported when unset
+SIM_ONNX_FILE = os.getenv("SIM_ONNX_FILE") or None
+
+# Shared model server (python -m app.inference); workers load no models of their own when set
+INFERENCE_SOCKET = os.getenv("INFERENCE_SOCKET") or None
+INFERENCE_TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", "30"))
+INFERENCE_CONNECT_TIMEOUT = float(os.getenv("INFERENCE_CONNECT_TIMEOUT", "120"))
+INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", "256"))
+INFERENCE_BATCH_WAIT_MS = float(os.getenv("INFERENCE_BATCH_WAIT_MS", "5"))
+
+# Load models in a background thread at startup (otherwise on the first request)
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") not in ("0", "false", "no")
+
+# Embedding cache: in-memory LRU size and optional on-disk tier (disabled when unset)
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "50000"))
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR") or None
+
+# Add a Server-Timing header with per-stage durations to every response
+SERVER_TIMING = os.getenv("SERVER_TIMING", "0") not in ("0", "false", "no")
+
+# Background analyses (/jobs/analyze-profile): jobs processed at once, jobs that may wait
+# (more are rejected with 503), and seconds a finished job's result stays available
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+# Size of the thread pool that runs CPU-bound stages (PDF parsing, spaCy, encoding)
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Encode requests of concurrent analyses are merged into batches of up to ENCODE_MAX_BATCH texts,
+# waiting at most ENCODE_MAX_WAIT_MS for more; callers block while ENCODE_QUEUE_SIZE requests are queued
+ENCODE_SCHEDULER = os.getenv("ENCODE_SCHEDULER", "1") not in ("0", "false", "no")
+ENCODE_MAX_BATCH = int(os.getenv("ENCODE_MAX_BATCH", "128"))
+ENCODE_MAX_WAIT_MS = float(os.getenv("ENCODE_MAX_WAIT_MS", "2"))
+ENCODE_QUEUE_SIZE = int(os.getenv("ENCODE_QUEUE_SIZE", "256"))
+ENCODE_QUEUE_TIMEOUT = float(os.getenv("ENCODE_QUEUE_TIMEOUT", "30"))
+ENCODE_WORKERS = int(os.getenv("ENCODE_WORKERS", "1"))
+# Intra-op threads of the encoder; by default the cores are split between the threads
+# that run model calls (scheduler workers, or CPU workers without the scheduler; 0 = library default)
+_ENCODING_THREADS = ENCODE_WORKERS if ENCODE_SCHEDULER else CPU_WORKERS
+ENCODER_THREADS = int(os.getenv("ENCODER_THREADS", str(max(1, (os.cpu_count() or 1) // max(1, _ENCODING_THREADS)))))
+# Upstream API endpoints (overridable, e.g. to point at local fixture servers)
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+STEPIK_API_URL = os.getenv("STEPIK_API_URL", "https://stepik.org/api/courses")
+HH_API_URL = os.getenv("HH_API_URL", "https://api.hh.ru/vacancies")
+# GitHub: optional token (5000 instead of 60 requests/hour), page ETag cache
+# (shared between workers through SQLite when a path is set) and pagination limits
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN") or None
+GITHUB_CACHE_PATH = os.getenv("GITHUB_CACHE_PATH") or None
+GITHUB_CACHE_SIZE = int(os.getenv("GITHUB_CACHE_SIZE", "20000"))
+GITHUB_MAX_PAGES = int(os.getenv("GITHUB_MAX_PAGES", "10"))
+GITHUB_PAGE_CONCURRENCY = int(os.getenv("GITHUB_PAGE_CONCURRENCY", "4"))
+
+# Shared outbound HTTP client: connection limit, timeout, retries and circuit breaker
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "5"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BREAKER_FAILURES = int(os.getenv("HTTP_BREAKER_FAILURES", "5"))
+HTTP_BREAKER_RESET = float(os.getenv("HTTP_BREAKER_RESET", "30"))
+# Stepik keyword searches run in parallel per recommendation (1 = sequential)
+STEPIK_SEARCH_CONCURRENCY = int(os.getenv("STEPIK_SEARCH_CONCURRENCY", "8"))
+# Roles that desired positions are resolved to (bundled app/data/positions.json when unset);
+# positions without an alias match go to the up to POSITION_MAX_ROLES nearest roles above the threshold
+POSITION_TAXONOMY_PATH = os.getenv("POSITION_TAXONOMY_PATH") or None
+POSITION_MATCH_THRESHOLD = float(os.getenv("POSITION_MATCH_THRESHOLD", "0.6"))
+POSITION_MAX_ROLES = int(os.getenv("POSITION_MAX_ROLES", "2"))
+# hh.ru vacancies fetched per query and ranked against the profile's skills (top 5 are returned)
+HH_RANK_POOL = int(os.getenv("HH_RANK_POOL", "50"))
+VACANCY_EMBEDDING_CACHE_SIZE = int(os.getenv("VACANCY_EMBEDDING_CACHE_SIZE", "20000"))
+# Local Stepik catalog (python -m app.course_catalog): courses are looked up in this SQLite
+# store instead of searching Stepik per request; reloaded when a newer sync has finished
+COURSE_CATALOG_PATH = os.getenv("COURSE_CATALOG_PATH") or None
+COURSE_CATALOG_RELOAD = float(os.getenv("COURSE_CATALOG_RELOAD", "300"))
+STEPIK_SYNC_MAX_PAGES = int(os.getenv("STEPIK_SYNC_MAX_PAGES", "5000"))
+# Local hh.ru vacancies (python -m app.ingestion): served from this SQLite store instead of
+# live searches; live hh.ru is queried only for positions the store has nothing for
+VACANCY_STORE_PATH = os.getenv("VACANCY_STORE_PATH") or None
+VACANCY_STORE_RELOAD = float(os.getenv("VACANCY_STORE_RELOAD", "60"))
+VACANCY_LIVE_FALLBACK = os.getenv("VACANCY_LIVE_FALLBACK", "1") not in ("0", "false", "no")
+# Ingestion worker: polling intervals, hh.ru pages (100 vacancies each) per role and level,
+# and how long a vacancy no search returns any more is kept
+INGEST_VACANCY_INTERVAL = float(os.getenv("INGEST_VACANCY_INTERVAL", "3600"))
+INGEST_COURSE_INTERVAL = float(os.getenv("INGEST_COURSE_INTERVAL", "86400"))
+INGEST_HH_PAGES = int(os.getenv("INGEST_HH_PAGES", "2"))
+VACANCY_MAX_AGE = float(os.getenv("VACANCY_MAX_AGE", "259200"))
+
+# Stepik/hh.ru response cache; shared between workers through SQLite when a path is set
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH") or None
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "10000"))
+STEPIK_CACHE_TTL = float(os.getenv("STEPIK_CACHE_TTL", "86400"))
+HH_CACHE_TTL = float(os.getenv("HH_CACHE_TTL", "3600"))
+RESPONSE_CACHE_STALE_TTL = float(os.getenv("RESPONSE_CACHE_STALE_TTL", "600"))
+RESPONSE_CACHE_ERROR_TTL = float(os.getenv("RESPONSE_CACHE_ERROR_TTL", "30"))
+
+# Per-document analysis cache keyed by PDF content hash; survives restarts when a path is set
+PROFILE_CACHE_PATH = os.getenv("PROFILE_CACHE_PATH") or None
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "2000"))
+
+# PDF ingestion limits; documents with many pages are split across worker processes
+MAX_PDF_BYTES = int(os.getenv("MAX_PDF_BYTES", str(20 * 1024 * 1024)))
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "200"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
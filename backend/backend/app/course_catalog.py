@@ -0,0 +1,246 @@
+"""
+Local copy of the public Stepik course catalog.
+
+A periodic sync job pages through the Stepik API into a SQLite store,
+precomputing each course's language, level flags and embedding:
+
+    python -m app.course_catalog --db /var/lib/advisor/courses.db
+
+With COURSE_CATALOG_PATH pointing at that store, RecommendationEngine answers
+course lookups from memory (an inverted keyword index plus an embedding matrix
+for ranking against the user's skills) instead of searching Stepik per request.
+The store is reloaded when a newer sync has finished.
+"""
+import argparse
+import functools
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app import config
+from app.keyword_matcher import KeywordMatcher, compile_keywords, detect_language
+from app.local_store import SQLiteStore, StoreSnapshot, stack_embeddings
+
+# A course for beginners mentions one of these; intermediate/advanced courses
+# must mention none of them and at least one of IN_DEPTH_KEYWORDS
+INTRODUCTORY_KEYWORDS = [
+    "введение", "beginner", "основы", "для начинающих", "introduction",
+    "егэ", "школьный", "с нуля", "новичок"
+]
+IN_DEPTH_KEYWORDS = [
+    "data science", "machine learning", "deep learning", "statistics", "analysis",
+    "python", "ml", "ai", "specialization", "advanced", "pro", "expert", "intermediate"
+]
+INTRODUCTORY_MATCHER = KeywordMatcher(INTRODUCTORY_KEYWORDS)
+IN_DEPTH_MATCHER = KeywordMatcher(IN_DEPTH_KEYWORDS)
+TOKEN_PATTERN = re.compile(r"\w+")
+EMBEDDING_TEXT_CHARS = 500
+
+
+def classify_course(title: str, summary: str) -> Dict:
+    """Language and level flags of a course, as used by the course filters."""
+    lowered_title, lowered_summary = title.lower(), summary.lower()
+    return {
+        "language": detect_language(lowered_title + lowered_summary),
+        "introductory": INTRODUCTORY_MATCHER.search(lowered_title) or INTRODUCTORY_MATCHER.search(lowered_summary),
+        "in_depth": IN_DEPTH_MATCHER.search(lowered_title) or IN_DEPTH_MATCHER.search(lowered_summary),
+    }
+
+
+def level_allows(flags: Dict, level: Optional[str]) -> bool:
+    if level in ("intermediate", "advanced"):
+        return not flags["introductory"] and flags["in_depth"]
+    if level == "beginner":
+        return flags["introductory"]
+    return True
+
+
+def embedding_text(title: str, summary: str) -> str:
+    return f"{title}. {summary}"[:EMBEDDING_TEXT_CHARS]
+
+
+class CourseStore(SQLiteStore):
+    """SQLite table of courses with their precomputed flags and embeddings."""
+
+    table = "courses"
+    text_columns = "title, summary"
+
+    def create_tables(self):
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS courses (id INTEGER PRIMARY KEY, title TEXT NOT NULL, "
+            "summary TEXT NOT NULL, language TEXT, introductory INTEGER NOT NULL, in_depth INTEGER NOT NULL, "
+            "embedding BLOB, updated_at REAL NOT NULL)"
+        )
+
+    def embedding_input(self, title: str, summary: str) -> str:
+        return embedding_text(title, summary)
+
+    def upsert(self, courses: Iterable[Dict]) -> int:
+        """Stores courses; the embedding of a new or edited course is cleared. Returns the number changed."""
+        changed = 0
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            for course in courses:
+                title, summary = course.get("title") or "", course.get("summary") or ""
+                row = self._conn.execute("SELECT title, summary FROM courses WHERE id = ?", (course["id"],)).fetchone()
+                if row == (title, summary):
+                    continue
+                flags = classify_course(title, summary)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO courses (id, title, summary, language, introductory, in_depth, "
+                    "embedding, updated_at) VALUES (?, ?, ?, ?, ?, ?, NULL, ?)",
+                    (course["id"], title, summary, flags["language"], int(flags["introductory"]),
+                     int(flags["in_depth"]), now),
+                )
+                self._record_change(course["id"], "insert" if row is None else "update", now)
+                changed += 1
+            self._conn.execute("COMMIT")
+        return changed
+
+    def rows(self) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, title, summary, language, introductory, in_depth, embedding FROM courses ORDER BY id"
+            ).fetchall()
+
+
+def sync_catalog(store: CourseStore, http, api_url: str, max_pages: int,
+                 encode: Optional[Callable[[List[str]], np.ndarray]] = None, model: Optional[str] = None) -> Dict:
+    """Pages through the public Stepik catalog into the store, then embeds new and edited courses."""
+    pages = changed = 0
+    for page in range(1, max_pages + 1):
+        resp = http.get(api_url, params={"is_public": "true", "page": page})
+        resp.raise_for_status()
+        data = resp.json()
+        changed += store.upsert(data.get("courses", []))
+        pages += 1
+        if not data.get("meta", {}).get("has_next"):
+            break
+    embedded = store.embed_missing(encode, model) if encode is not None else 0
+    store.set_meta("synced_at", repr(time.time()))
+    return {"pages": pages, "courses": len(store), "changed": changed, "embedded": embedded}
+
+
+@dataclass
+class Course:
+    id: int
+    title: str
+    summary: str
+    language: Optional[str]
+    introductory: bool
+    in_depth: bool
+
+    @property
+    def text(self) -> str:
+        return f"{self.title} {self.summary}".lower()
+
+    def as_result(self) -> Dict:
+        return {"title": self.title, "url": f"https://stepik.org/course/{self.id}", "summary": self.summary}
+
+
+class CatalogIndex:
+    """In-memory catalog: courses, an inverted token index and (optionally) their embeddings."""
+
+    def __init__(self, courses: List[Course], embeddings: Optional[np.ndarray] = None, model: Optional[str] = None):
+        self.courses = courses
+        self.embeddings = embeddings
+        self.model = model
+        self.texts = [course.text for course in courses]
+        self.postings: Dict[str, List[int]] = {}
+        for i, text in enumerate(self.texts):
+            for token in set(TOKEN_PATTERN.findall(text)):
+                self.postings.setdefault(token, []).append(i)
+
+    @classmethod
+    def from_store(cls, store: CourseStore) -> "CatalogIndex":
+        courses, vectors = [], []
+        for course_id, title, summary, language, introductory, in_depth, embedding in store.rows():
+            courses.append(Course(course_id, title, summary, language, bool(introductory), bool(in_depth)))
+            vectors.append(embedding)
+        return cls(courses, stack_embeddings(vectors), store.get_meta("encoder"))
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    def search(self, keyword: str) -> List[int]:
+        """Courses whose title or summary contains the keyword, in catalog order."""
+        keyword = keyword.lower()
+        tokens = TOKEN_PATTERN.findall(keyword)
+        if not tokens:
+            return []
+        # Rarest token first; phrases are confirmed on the text
+        postings = sorted((self.postings.get(token, []) for token in set(tokens)), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return [i for i in sorted(candidates) if keyword in self.texts[i]]
+
+    def find(self, search_keywords: Sequence[str], thematic_keywords: Sequence[str], level: Optional[str]) -> List[int]:
+        """
+        Courses matching any search keyword (in keyword-priority order) that pass the
+        language and level filters and mention one of the thematic keywords.
+        """
+        thematic = compile_keywords(tuple(thematic_keywords))
+        found, seen = [], set()
+        for keyword in search_keywords:
+            for i in self.search(keyword):
+                if i in seen:
+                    continue
+                seen.add(i)
+                course = self.courses[i]
+                if course.language not in ("ru", "en"):
+                    continue
+                if not level_allows({"introductory": course.introductory, "in_depth": course.in_depth}, level):
+                    continue
+                # Title and summary are matched separately, like the live Stepik filter
+                if thematic.search(course.title.lower()) or thematic.search(course.summary.lower()):
+                    found.append(i)
+        return found
+
+    def rank(self, indices: List[int], query: np.ndarray) -> List[int]:
+        """Orders courses by cosine similarity to a normalized query embedding (stable for ties)."""
+        if self.embeddings is None or not indices:
+            return indices
+        scores = self.embeddings[indices] @ query
+        return [indices[j] for j in np.argsort(-scores, kind="stable")]
+
+
+class LocalCatalog(StoreSnapshot):
+    """The CatalogIndex of a course store, rebuilt after each sync."""
+
+    def __init__(self, store: CourseStore, reload_interval: float = 300):
+        super().__init__(store, CatalogIndex.from_store, reload_interval)
+
+
+def build_course_catalog() -> Optional[LocalCatalog]:
+    """The local catalog described by app.config (None: search the Stepik API per request)."""
+    if not config.COURSE_CATALOG_PATH:
+        return None
+    return LocalCatalog(CourseStore(config.COURSE_CATALOG_PATH), config.COURSE_CATALOG_RELOAD)
+
+
+def main(argv: Optional[List[str]] = None):
+    from app.encoders import encoder_id, load_encoder
+    from app.http_client import default_client
+
+    parser = argparse.ArgumentParser(description="Sync the public Stepik catalog into the local course store.")
+    parser.add_argument("--db", default=config.COURSE_CATALOG_PATH, required=not config.COURSE_CATALOG_PATH)
+    parser.add_argument("--max-pages", type=int, default=config.STEPIK_SYNC_MAX_PAGES)
+    parser.add_argument("--no-embeddings", action="store_true", help="skip encoding (no semantic ranking)")
+    args = parser.parse_args(argv)
+
+    encode = model = None
+    if not args.no_embeddings:
+        encoder = load_encoder()
+        model = encoder_id()
+        encode = functools.partial(encoder.encode, convert_to_numpy=True, normalize_embeddings=True, batch_size=64)
+
+    report = sync_catalog(CourseStore(args.db), default_client(), config.STEPIK_API_URL, args.max_pages, encode, model)
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Bounded thread pool for blocking, CPU-bound stages (PDF parsing, NLP, encoding),
+shared by the API handlers and the recommendation engine so they never run on
+the event loop and never exceed CPU_WORKERS threads between them.
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from app import config
+
+cpu_executor = ThreadPoolExecutor(max_workers=config.CPU_WORKERS, thread_name_prefix="cpu-stage")
+
+
+async def run_cpu(func, *args, **kwargs):
+    """Runs a blocking stage in the bounded CPU executor (in the caller's context, for stage timings)."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(cpu_executor, functools.partial(context.run, func, *args, **kwargs))
@@ -1,9 +1,19 @@
-import spacy
-import pymupdf
+import threading
 from typing import Dict, List, Optional
-import requests
-from bs4 import BeautifulSoup
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+from app import config
+from app.document_context import DocumentContext
+from app.embedding_cache import EmbeddingCache
+from app.embedding_index import EmbeddingIndex
+from app.encode_scheduler import build_encode_scheduler
+from app.encoders import encoder_id, load_encoder
+from app.field_extraction import scan_contacts, scan_dated_entries, scan_skills_block, scan_transcript
+from app.github_client import GitHubAPIError, RepoAggregate, build_github_client
+from app.http_client import TRANSPORT_ERRORS, OutboundClient, default_client
+from app.inference import InferenceClient, RemoteEncoder, RemoteInferenceError, RemoteNLP
+from app.keyword_matcher import KeywordMatcher
+from app.metrics import record_encode, timed, timed_stage
+from app.pdf_ingest import iter_pdf_pages
 
 # Example list of IT skills for keyword search
 IT_SKILLS = [
@@ -16,11 +26,153 @@ IT_SKILLS = [
     'powerbi', 'excel', 'jira', 'agile', 'scrum', 'rest', 'graphql', 'api', 'sqlalchemy'
 ]
 
+# Anchor keywords for each resume section; a line belongs to a section if it
+# is semantically close to any of its anchors
+SECTION_KEYWORDS = {
+    "projects": ["project", "проект"],
+    "certifications": ["certificate", "сертификат", "certification"],
+    "languages": ["language", "язык"],
+    "summary": ["summary", "objective", "цель", "о себе"],
+    "achievements": ["achievement", "award", "достижение", "награда"],
+    "interests": ["interest", "hobby", "интерес", "хобби"],
+    "publications": ["publication", "публикация"],
+    "volunteer": ["volunteer", "extracurricular", "волонтер", "внеучебная"],
+}
+SECTION_THRESHOLD = 0.6
+
+# Degree keywords for extract_education (substring match on lowercased lines)
+EDUCATION_KEYWORDS = {
+    "BSc": ["bachelor", "bsc", "бакалавр"],
+    "MSc": ["master", "msc", "магистр"],
+    "PhD": ["phd", "кандидат наук"],
+}
+DEGREE_ORDER = list(EDUCATION_KEYWORDS)
+EDUCATION_MATCHER = KeywordMatcher(
+    [kw for kws in EDUCATION_KEYWORDS.values() for kw in kws],
+    [degree for degree, kws in EDUCATION_KEYWORDS.items() for _ in kws],
+)
+
+# Only NER is used; these components are skipped when present in the pipeline
+NLP_UNUSED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+NLP_BATCH_SIZE = 32
+
+def load_nlp():
+    """spaCy pipeline with every component but NER (and what it depends on) disabled."""
+    import spacy
+    nlp = spacy.load("en_core_web_sm")
+    for name in NLP_UNUSED_PIPES:
+        if name not in nlp.pipe_names:
+            continue
+        # Keep a shared tok2vec if NER listens to it (it has its own in en_core_web_sm)
+        if "ner" in getattr(nlp.get_pipe(name), "listening_components", []):
+            continue
+        nlp.disable_pipe(name)
+    return nlp
+
 class DataProcessor:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        # Multilingual model for semantic similarity (English, Russian, etc.)
-        self.sim_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+    def __init__(self, http: Optional[OutboundClient] = None, inference: Optional[InferenceClient] = None):
+        self.http = http if http is not None else default_client()
+        # With a model server, spaCy and the encoder run there instead of in this process
+        if inference is None and config.INFERENCE_SOCKET:
+            inference = InferenceClient(config.INFERENCE_SOCKET)
+        self.inference = inference
+        # Repository pages are fetched conditionally; unchanged profiles cost no rate limit
+        self.github = build_github_client(self.http)
+        # Models are loaded on first use (or by warm_up); spaCy, torch and
+        # sentence_transformers are not imported until then
+        self._nlp = None
+        self._sim_model = None
+        self._skill_index = None
+        self._section_index = None
+        self._load_lock = threading.RLock()
+        self.warmup_error: Optional[str] = None
+        # Repeated strings (skills, section keywords, common lines) are encoded only once
+        self.embedding_cache = EmbeddingCache(
+            encoder_id(), config.EMBEDDING_CACHE_SIZE, config.EMBEDDING_CACHE_DIR
+        )
+        # Concurrent encode calls (all requests of this process) are batched together
+        self.encode_scheduler = build_encode_scheduler(self._run_encoder)
+        # Section each column of the section anchor index belongs to
+        self.section_anchor_sections = [section for section, kws in SECTION_KEYWORDS.items() for _ in kws]
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            with self._load_lock:
+                if self._nlp is None:
+                    self._nlp = RemoteNLP(self.inference) if self.inference else load_nlp()
+        return self._nlp
+
+    @property
+    def sim_model(self):
+        if self._sim_model is None:
+            with self._load_lock:
+                if self._sim_model is None:
+                    # Multilingual model for semantic similarity (English, Russian, etc.)
+                    self._sim_model = RemoteEncoder(self.inference) if self.inference else load_encoder()
+        return self._sim_model
+
+    @property
+    def skill_index(self) -> EmbeddingIndex:
+        # Skill vocabulary is encoded once; resumes are scored against it in one call
+        if self._skill_index is None:
+            with self._load_lock:
+                if self._skill_index is None:
+                    self._skill_index = EmbeddingIndex(IT_SKILLS, self.encode)
+        return self._skill_index
+
+    @property
+    def section_index(self) -> EmbeddingIndex:
+        # All section anchors in one matrix
+        if self._section_index is None:
+            with self._load_lock:
+                if self._section_index is None:
+                    self._section_index = EmbeddingIndex(
+                        [kw for kws in SECTION_KEYWORDS.values() for kw in kws], self.encode
+                    )
+        return self._section_index
+
+    @property
+    def is_ready(self) -> bool:
+        return None not in (self._nlp, self._sim_model, self._skill_index, self._section_index)
+
+    def warm_up(self):
+        """
+        Loads both models (or waits for the inference server) and builds the embedding indexes.
+        Meant to run in a background thread.
+        """
+        try:
+            if self.inference:
+                server = self.inference.wait_ready(config.INFERENCE_CONNECT_TIMEOUT)
+                if server.get("encoder") != encoder_id():
+                    raise RemoteInferenceError(
+                        f"inference server encodes with {server.get('encoder')}, expected {encoder_id()}"
+                    )
+            self.nlp
+            self.sim_model
+            self.skill_index
+            self.section_index
+        except Exception as e:
+            self.warmup_error = str(e)
+            raise
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encodes texts into L2-normalized embeddings (one row per text), served from the cache when possible.
+        """
+        return self.embedding_cache.encode(texts, self._encode_uncached)
+
+    def _encode_uncached(self, texts: List[str]) -> np.ndarray:
+        with timed("encode"):
+            if self.encode_scheduler is None:
+                return self._run_encoder(texts)
+            # Load the model in the calling thread: it may hold _load_lock (index builds)
+            self.sim_model
+            return self.encode_scheduler.encode(texts)
+
+    def _run_encoder(self, texts: List[str]) -> np.ndarray:
+        record_encode(len(texts))
+        return self.sim_model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
 
     def semantic_match(self, query: str, candidates: list, threshold: float = 0.7) -> list:
         """
@@ -28,95 +180,143 @@ class DataProcessor:
         """
         if not candidates:
             return []
-        emb_query = self.sim_model.encode(query, convert_to_tensor=True)
-        emb_cand = self.sim_model.encode(candidates, convert_to_tensor=True)
-        cos_scores = util.cos_sim(emb_query, emb_cand)[0].cpu().numpy()
+        emb_query = self.encode([query])[0]
+        emb_cand = self.encode(candidates)
+        cos_scores = emb_cand @ emb_query
         return [candidates[i] for i, score in enumerate(cos_scores) if score >= threshold]
 
+    @timed_stage("pdf_text")
     def extract_text_from_pdf(self, pdf_file) -> str:
         """Extract text from PDF file."""
-        doc = pymupdf.open(stream=pdf_file.read())
-        text = ""
-        for page in doc: # iterate the document pages
-            text += "\n".join([block[4].replace("\n", " ") for block in page.get_text("blocks")])
-        return text
+        return "".join(iter_pdf_pages(pdf_file))
 
     def extract_skills(self, text: str) -> List[str]:
         """
         Extracts skills from text using semantic similarity (multilingual) and keyword matching.
         """
-        doc = self.nlp(text.lower())
-        found_skills = set()
-        # Semantic search for each skill in IT_SKILLS
-        for skill in IT_SKILLS:
-            matches = self.semantic_match(skill, [text], threshold=0.45)
-            if matches:
-                found_skills.add(skill)
-        # Entity search (e.g., ORG, PRODUCT)
-        for ent in doc.ents:
-            if ent.label_ in ["ORG", "PRODUCT"]:
-                matches = self.semantic_match(ent.text.lower(), IT_SKILLS, threshold=0.7)
-                found_skills.update(matches)
-        return sorted(list(found_skills))
+        return self.extract_skills_batch([text])[0]
+
+    def extract_skills_batch(self, texts: List[str]) -> List[List[str]]:
+        """
+        Extracts skills from several documents with one NER pass and one encoder call.
+        """
+        return self.skills_from_contexts(self.document_contexts(texts))
+
+    def document_contexts(self, texts: List[str]) -> List[DocumentContext]:
+        return [DocumentContext(text) for text in texts]
+
+    def prepare_contexts(self, contexts: List[DocumentContext], skills: bool = False, sections: bool = False):
+        """
+        Computes the model outputs needed for skill and/or section extraction, for all
+        documents at once: one spaCy NER pass and one encoder call. Outputs already
+        present in a context are reused, never recomputed.
+        """
+        pending_ner = [c for c in contexts if skills and c.entities is None]
+        if pending_ner:
+            # Entity search (e.g., ORG, PRODUCT)
+            with timed("ner"):
+                docs = self.nlp.pipe([c.text.lower() for c in pending_ner], batch_size=NLP_BATCH_SIZE)
+                for context, doc in zip(pending_ner, docs):
+                    context.entities = [ent.text.lower() for ent in doc.ents if ent.label_ in ["ORG", "PRODUCT"]]
+        pending = []  # (context, attribute, texts to encode)
+        for context in contexts:
+            if skills and not context.has_skill_inputs:
+                pending.append((context, "text_embedding", [context.text]))
+                pending.append((context, "entity_embeddings", context.entities))
+            if sections and not context.has_section_inputs:
+                unique_lines = list(dict.fromkeys(context.lines))
+                context.line_rows = {line: i for i, line in enumerate(unique_lines)}
+                pending.append((context, "line_embeddings", unique_lines))
+        if not pending:
+            return
+        flat = [text for _, _, texts in pending for text in texts]
+        embeddings = self.encode(flat) if flat else np.zeros((0, 0), dtype=np.float32)
+        offset = 0
+        for context, attribute, texts in pending:
+            rows = embeddings[offset:offset + len(texts)]
+            offset += len(texts)
+            setattr(context, attribute, rows[0] if attribute == "text_embedding" else rows)
+
+    @timed_stage("skills")
+    def skills_from_contexts(self, contexts: List[DocumentContext]) -> List[List[str]]:
+        """
+        Skills per document: the whole text is scored against every skill, and so are its entities.
+        """
+        self.prepare_contexts(contexts, skills=True)
+        results = []
+        for context in contexts:
+            hits = self.skill_index.scores(context.text_embedding[None, :])[0] >= 0.45
+            hits = hits | (self.skill_index.scores(context.entity_embeddings) >= 0.7).any(axis=0)
+            results.append(sorted(skill for skill, hit in zip(IT_SKILLS, hits) if hit))
+        return results
 
+    @timed_stage("education")
     def extract_education(self, text: str) -> str:
         """
         Extracts education information from text.
         """
-        # Simple search by keywords
-        education_keywords = {
-            "BSc": ["bachelor", "bsc", "бакалавр"],
-            "MSc": ["master", "msc", "магистр"],
-            "PhD": ["phd", "кандидат наук"],
-        }
-        degrees = dict()
-        for line in text.splitlines():
-            for degree, degree_kw in education_keywords.items():
-                for kw in degree_kw:
-                    if kw.lower() in line.lower():
-                        degrees[degree] = line
-                        break
+        # Degrees in order of the first line mentioning them
+        first_line = {}
+        for n, line in enumerate(text.lower().splitlines()):
+            for degree in EDUCATION_MATCHER.found(line):
+                first_line.setdefault(degree, n)
+        degrees = sorted(first_line, key=lambda degree: (first_line[degree], DEGREE_ORDER.index(degree)))
+        return ", ".join(degrees)
 
-        return ", ".join(degrees.keys())
+    def _github_username(self, github_url: str) -> str:
+        # Remove @ and spaces if present
+        github_url = github_url.strip().replace('@', '')
+        return github_url.rstrip('/').split('/')[-1]
 
+    @timed_stage("github")
     def analyze_github_profile(self, github_url: Optional[str]) -> Dict:
         """Analyze GitHub profile and extract relevant information using GitHub API."""
         if not github_url:
             return {}
-        # Remove @ and spaces if present
-        github_url = github_url.strip().replace('@', '')
-        username = github_url.rstrip('/').split('/')[-1]
-        api_url = f"https://api.github.com/users/{username}/repos"
-        headers = {
-            "Accept": "application/vnd.github.v3+json"
+        username = self._github_username(github_url)
+        try:
+            repos = self.github.repositories(username)
+        except GitHubAPIError as e:
+            return self._github_error(e, username)
+        except TRANSPORT_ERRORS as e:
+            return self._github_unavailable(e, username)
+        return self._summarize_github_repos(repos, username)
+
+    @timed_stage("github")
+    async def analyze_github_profile_async(self, github_url: Optional[str]) -> Dict:
+        """Non-blocking variant of analyze_github_profile for the async API."""
+        if not github_url:
+            return {}
+        username = self._github_username(github_url)
+        try:
+            repos = await self.github.repositories_async(username)
+        except GitHubAPIError as e:
+            return self._github_error(e, username)
+        except TRANSPORT_ERRORS as e:
+            return self._github_unavailable(e, username)
+        return self._summarize_github_repos(repos, username)
+
+    def _github_error(self, error: GitHubAPIError, username: str) -> Dict:
+        if error.status_code == 200:
+            return {"error": "Unexpected response from GitHub API", "raw": error.detail}
+        return {
+            "error": str(error),
+            "detail": error.detail,
+            "api_url": self.github.repos_url(username),
+            "username": username
         }
-        response = requests.get(api_url, headers=headers)
-        # Log status and response body for debugging
-        if response.status_code != 200:
-            return {
-                "error": f"GitHub API error: {response.status_code}",
-                "detail": response.json() if response.content else {},
-                "api_url": api_url,
-                "username": username
-            }
-        repos = response.json()
-        if not isinstance(repos, list):
-            return {"error": "Unexpected response from GitHub API", "raw": repos}
-        languages = set()
-        stars = 0
-        forks = 0
-        for repo in repos:
-            lang = repo.get('language')
-            if lang:
-                languages.add(lang.lower())
-            stars += repo.get('stargazers_count', 0)
-            forks += repo.get('forks_count', 0)
-        activity_score = len(repos) + stars + forks
+
+    def _github_unavailable(self, error: Exception, username: str) -> Dict:
+        # GitHub down or its circuit open: the analysis goes on without GitHub data
+        return {"error": f"GitHub API error: {str(error)}", "username": username}
+
+    def _summarize_github_repos(self, repos: RepoAggregate, username: str) -> Dict:
+        activity_score = repos.repositories + repos.stars + repos.forks
         return {
-            "repositories": len(repos),
-            "languages": sorted(list(languages)),
-            "stars": stars,
-            "forks": forks,
+            "repositories": repos.repositories,
+            "languages": sorted(repos.languages),
+            "stars": repos.stars,
+            "forks": repos.forks,
             "activity_score": activity_score,
             "username": username
         }
@@ -161,269 +361,188 @@ class DataProcessor:
             "github_data": github_data
         }
 
+    def classify_sections(self, text: str) -> Dict[str, List[str]]:
+        """
+        Assigns resume lines to sections in a single pass.
+        All distinct lines are encoded in one batch and scored against every section anchor.
+        """
+        return self.classify_sections_batch([text])[0]
+
+    def classify_sections_batch(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        """
+        classify_sections for several documents, encoding the distinct lines of all of them in one batch.
+        """
+        return self.sections_from_contexts(self.document_contexts(texts))
+
+    @timed_stage("sections")
+    def sections_from_contexts(self, contexts: List[DocumentContext]) -> List[Dict[str, List[str]]]:
+        self.prepare_contexts(contexts, sections=True)
+        columns = {section: [] for section in SECTION_KEYWORDS}
+        for col, section in enumerate(self.section_anchor_sections):
+            columns[section].append(col)
+        results = []
+        for context in contexts:
+            hits = self.section_index.scores(context.line_embeddings) >= SECTION_THRESHOLD
+            line_hits = {section: hits[:, cols].any(axis=1) for section, cols in columns.items()}
+            sections = {section: [] for section in SECTION_KEYWORDS}
+            for line in context.lines:
+                row = context.line_rows[line]
+                for section in SECTION_KEYWORDS:
+                    if line_hits[section][row]:
+                        sections[section].append(line.strip())
+            results.append(sections)
+        return results
+
     def extract_projects_section(self, text: str) -> list:
         """
         Extracts projects from resume text using semantic and keyword search.
         """
-        # Simple heuristic: look for lines containing 'project' or 'проект'
-        projects = []
-        for line in text.splitlines():
-            if any(self.semantic_match(line, [kw], threshold=0.6) for kw in ["project", "проект"]):
-                projects.append(line.strip())
-        return projects
+        return self.classify_sections(text)["projects"]
 
     def extract_certifications_section(self, text: str) -> list:
         """
         Extracts certifications from resume text.
         """
-        certs = []
-        for line in text.splitlines():
-            if any(self.semantic_match(line, [kw], threshold=0.6) for kw in ["certificate", "сертификат", "certification"]):
-                certs.append(line.strip())
-        return certs
+        return self.classify_sections(text)["certifications"]
 
     def extract_languages_section(self, text: str) -> list:
         """
         Extracts languages from resume text.
         """
-        langs = []
-        for line in text.splitlines():
-            if any(self.semantic_match(line, [kw], threshold=0.6) for kw in ["language", "язык"]):
-                langs.append(line.strip())
-        return langs
+        return self.classify_sections(text)["languages"]
 
     def extract_summary_section(self, text: str) -> str:
         """
         Extracts summary/objective from resume text.
         """
-        for line in text.splitlines():
-            if any(self.semantic_match(line, [kw], threshold=0.6) for kw in ["summary", "objective", "цель", "о себе"]):
-                return line.strip()
-        return ""
+        summary = self.classify_sections(text)["summary"]
+        return summary[0] if summary else ""
 
     def extract_achievements_section(self, text: str) -> list:
         """
         Extracts achievements/awards from resume text.
         """
-        achievements = []
-        for line in text.splitlines():
-            if any(self.semantic_match(line, [kw], threshold=0.6) for kw in ["achievement", "award", "достижение", "награда"]):
-                achievements.append(line.strip())
-        return achievements
+        return self.classify_sections(text)["achievements"]
 
     def extract_interests_section(self, text: str) -> list:
         """
         Extracts interests/hobbies from resume text.
         """
-        interests = []
-        for line in text.splitlines():
-            if any(self.semantic_match(line, [kw], threshold=0.6) for kw in ["interest", "hobby", "интерес", "хобби"]):
-                interests.append(line.strip())
-        return interests
+        return self.classify_sections(text)["interests"]
 
     def extract_publications_section(self, text: str) -> list:
         """
         Extracts publications from resume text.
         """
-        pubs = []
-        for line in text.splitlines():
-            if any(self.semantic_match(line, [kw], threshold=0.6) for kw in ["publication", "публикация"]):
-                pubs.append(line.strip())
-        return pubs
+        return self.classify_sections(text)["publications"]
 
     def extract_volunteer_section(self, text: str) -> list:
         """
         Extracts volunteer/extracurricular from resume text.
         """
-        vols = []
-        for line in text.splitlines():
-            if any(self.semantic_match(line, [kw], threshold=0.6) for kw in ["volunteer", "extracurricular", "волонтер", "внеучебная"]):
-                vols.append(line.strip())
-        return vols
+        return self.classify_sections(text)["volunteer"]
 
     def extract_contacts_section(self, text: str) -> dict:
         """
         Extracts contacts (email, phone, social) from resume text.
         """
-        import re
-        contacts = {}
-        email = re.search(r'[\w\.-]+@[\w\.-]+', text)
-        phone = re.search(r'\+?\d[\d\-\s\(\)]{7,}\d', text)
-        if email:
-            contacts['email'] = email.group(0)
-        if phone:
-            contacts['phone'] = phone.group(0)
-        # Socials (simple heuristic)
-        socials = re.findall(r'(linkedin\.com/\S+|github\.com/\S+|vk\.com/\S+)', text, re.IGNORECASE)
-        if socials:
-            contacts['socials'] = socials
-        return contacts
+        return scan_contacts(text)
 
     def extract_structured_resume(self, text: str) -> dict:
         """
         Returns structured resume with all relevant blocks for recommendations.
         """
-        return {
-            "experience": self.extract_experience_section(text),
-            "education": self.extract_education_section(text),
-            "skills": self.extract_skills_section(text),
-            "projects": self.extract_projects_section(text),
-            "certifications": self.extract_certifications_section(text),
-            "languages": self.extract_languages_section(text),
-            "summary": self.extract_summary_section(text),
-            "achievements": self.extract_achievements_section(text),
-            "interests": self.extract_interests_section(text),
-            "publications": self.extract_publications_section(text),
-            "volunteer": self.extract_volunteer_section(text),
-            "contacts": self.extract_contacts_section(text)
-        }
+        return self.extract_structured_resume_batch([text])[0]
+
+    def extract_structured_resume_batch(self, texts: List[str]) -> List[dict]:
+        """
+        Structured resumes for several documents; semantic sections share one encoder call.
+        """
+        return self.structured_resume_from_contexts(self.document_contexts(texts))
+
+    def structured_resume_from_contexts(self, contexts: List[DocumentContext]) -> List[dict]:
+        results = []
+        for context, sections in zip(contexts, self.sections_from_contexts(contexts)):
+            text = context.text
+            results.append({
+                "experience": self.extract_experience_section(text, context.dated_entries),
+                "education": self.extract_education_section(text, context.dated_entries),
+                "skills": self.extract_skills_section(text),
+                "projects": sections["projects"],
+                "certifications": sections["certifications"],
+                "languages": sections["languages"],
+                "summary": sections["summary"][0] if sections["summary"] else "",
+                "achievements": sections["achievements"],
+                "interests": sections["interests"],
+                "publications": sections["publications"],
+                "volunteer": sections["volunteer"],
+                "contacts": self.extract_contacts_section(text)
+            })
+        return results
 
     def extract_courses_grades_credits(self, text: str) -> list:
         """
         Extracts courses, grades, and credits from transcript text.
         """
-        import re
-        courses = []
-        # Example: MA030111 Introduction to Data Science 3 A 108 Term 1B 2022-2023
-        course_pattern = re.compile(
-            r'([A-Z]{2,}\d{6,})\s+([A-Za-zА-Яа-я0-9 ,\-&]+)\s+(\d+)\s+([A-FPassFail]+)\s+(\d+)\s+Term\s+\d+[A-B]?\s+\d{4}-\d{4}',
-            re.IGNORECASE
-        )
-        for match in course_pattern.finditer(text):
-            code, name, ects, grade, hours = match.groups()
-            courses.append({
-                "code": code,
-                "name": name.strip(),
-                "ects": ects,
-                "grade": grade,
-                "hours": hours
-            })
-        return courses
+        return scan_transcript(text)["courses"]
 
     def extract_personal_info_from_transcript(self, text: str) -> dict:
         """
         Extracts personal info (full name, date of birth, student ID, etc.) from transcript text.
         """
-        import re
-        info = {}
-        fio_match = re.search(r"Student ([A-Za-zА-Яа-я ]+)", text)
-        if fio_match:
-            info["full_name"] = fio_match.group(1).strip()
-        dob_match = re.search(r"Date of Birth ([0-9]{4}-[A-Za-z]{3}-[0-9]{2})", text)
-        if dob_match:
-            info["date_of_birth"] = dob_match.group(1)
-        id_match = re.search(r"Student ID ([0-9A-Za-z-]+)", text)
-        if id_match:
-            info["student_id"] = id_match.group(1)
-        return info
+        return scan_transcript(text)["personal_info"]
 
     def extract_degree_from_transcript(self, text: str) -> str:
         """
         Extracts degree/program from transcript (e.g., MSc Educational Program Data Science).
         """
-        import re
-        degree_match = re.search(r'Completion Level (.+?) Educational Program (.+?) Field of Knowledge', text)
-        if degree_match:
-            return degree_match.group(1).strip() + ' ' + degree_match.group(2).strip()
-        return ""
+        return scan_transcript(text)["degree"]
 
     def extract_major_program(self, text: str) -> str:
         """
         Extracts major/program from transcript text.
         """
-        import re
-        match = re.search(r'Program ([A-Za-zА-Яа-я0-9 ]+?) Field of Knowledge', text)
-        if match:
-            return match.group(1).strip()
-        return ""
+        return scan_transcript(text)["major_program"]
 
     def extract_dates(self, text: str) -> dict:
         """
         Extracts matriculation and completion dates from transcript text.
         """
-        import re
-        dates = {}
-        matric = re.search(r'Matriculation Date ([0-9]{4}-[A-Za-z]{3}-[0-9]{2})', text)
-        if matric:
-            dates['matriculation'] = matric.group(1)
-        compl = re.search(r'Date of Completion / Expected Date of ([0-9]{4}-[A-Za-z]{3}-[0-9]{2})', text)
-        if compl:
-            dates['completion'] = compl.group(1)
-        return dates
+        return scan_transcript(text)["dates"]
 
+    @timed_stage("structured_transcript")
     def extract_structured_transcript(self, text: str) -> dict:
         """
         Returns structured transcript with all relevant blocks for recommendations.
+        All fields are extracted in a single scan of the text.
         """
-        import re
-        gpa = re.search(r'GPA[:\s]+([0-9\.]+)', text, re.IGNORECASE)
-        university = re.search(r'(Skolkovo Institute of Science and Technology|[A-Za-zА-Яа-я ]+University)', text)
-        lang_instr = re.search(r'language of instruction is ([A-Za-z]+)', text, re.IGNORECASE)
-        return {
-            "courses": self.extract_courses_grades_credits(text),
-            "personal_info": self.extract_personal_info_from_transcript(text),
-            "degree": self.extract_degree_from_transcript(text),
-            "major_program": self.extract_major_program(text),
-            "dates": self.extract_dates(text),
-            "gpa": gpa.group(1) if gpa else None,
-            "university": university.group(0) if university else None,
-            "language_of_instruction": lang_instr.group(1) if lang_instr else None
-        }
+        return scan_transcript(text)
 
-    def extract_experience_section(self, text: str) -> list:
+    def extract_experience_section(self, text: str, entries: Optional[list] = None) -> list:
         """
         Extracts work experience entries from resume text (company, position, years).
-        """
-        import re
-        experience = []
-        # Example: Company, Position, 2020-2022
-        exp_pattern = re.compile(
-            r'([A-Za-zА-Яа-я0-9 .,&-]+),\s*([A-Za-zА-Яа-я0-9 .,&-]+),\s*(\d{4})[-–](\d{4}|Present|Now|Настоящее время)',
-            re.IGNORECASE
-        )
-        for match in exp_pattern.finditer(text):
-            company, position, start, end = match.groups()
-            experience.append({
-                "company": company.strip(),
-                "position": position.strip(),
-                "start": start,
-                "end": end
-            })
-        return experience
+        Pass entries from scan_dated_entries to reuse a scan shared with extract_education_section.
+        """
+        if entries is None:
+            entries = scan_dated_entries(text)
+        return [
+            {"company": company, "position": position, "start": start, "end": end}
+            for company, position, start, end in entries
+        ]
 
-    def extract_education_section(self, text: str) -> list:
+    def extract_education_section(self, text: str, entries: Optional[list] = None) -> list:
         """
         Extracts education entries from resume text (institution, degree, years).
         """
-        import re
-        education = []
-        edu_pattern = re.compile(
-            r'([A-Za-zА-Яа-я0-9 .,&-]+),\s*([A-Za-zА-Яа-я0-9 .,&-]+),\s*(\d{4})[-–](\d{4}|Present|Now|Настоящее время)',
-            re.IGNORECASE
-        )
-        for match in edu_pattern.finditer(text):
-            institution, degree, start, end = match.groups()
-            education.append({
-                "institution": institution.strip(),
-                "degree": degree.strip(),
-                "start": start,
-                "end": end
-            })
-        return education
+        if entries is None:
+            entries = scan_dated_entries(text)
+        return [
+            {"institution": institution, "degree": degree, "start": start, "end": end}
+            for institution, degree, start, end in entries
+        ]
 
     def extract_skills_section(self, text: str) -> list:
         """
         Extracts skills from resume text (comma, semicolon, or line separated lists, multilingual).
         """
-        import re
-        skills = []
-        # Look for a block after 'skills' or 'навыки'
-        skills_block = re.search(r'(skills|навыки)[:\n]+([\s\S]+?)(\n\w+:|\n\n|$)', text, re.IGNORECASE)
-        if skills_block:
-            block = skills_block.group(2)
-            # Split by comma, semicolon, bullet, or newline
-            for skill in re.split(r'[\n,;•·]', block):
-                skill = skill.strip()
-                if skill and len(skill) < 40:  # filter out noise
-                    skills.append(skill)
-        return skills
\ No newline at end of file
+        return scan_skills_block(text)
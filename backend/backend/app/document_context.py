@@ -0,0 +1,45 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.field_extraction import scan_dated_entries
+
+
+@dataclass
+class DocumentContext:
+    """
+    Per-document analysis shared by every resume extractor.
+    Model outputs are filled in once by DataProcessor.prepare_contexts and reused afterwards.
+    """
+    text: str
+    # Lowercased ORG/PRODUCT entities from the spaCy NER pass
+    entities: Optional[List[str]] = None
+    text_embedding: Optional[np.ndarray] = None
+    entity_embeddings: Optional[np.ndarray] = None
+    # One row per distinct line, looked up through line_rows
+    line_embeddings: Optional[np.ndarray] = None
+    line_rows: Dict[str, int] = field(default_factory=dict)
+    _lines: Optional[List[str]] = field(default=None, repr=False)
+    _dated_entries: Optional[List[Tuple[str, str, str, str]]] = field(default=None, repr=False)
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self.text.splitlines()
+        return self._lines
+
+    @property
+    def dated_entries(self) -> List[Tuple[str, str, str, str]]:
+        # Shared by the experience and education extractors
+        if self._dated_entries is None:
+            self._dated_entries = scan_dated_entries(self.text)
+        return self._dated_entries
+
+    @property
+    def has_skill_inputs(self) -> bool:
+        return self.text_embedding is not None and self.entity_embeddings is not None
+
+    @property
+    def has_section_inputs(self) -> bool:
+        return self.line_embeddings is not None
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class DiskEmbeddingStore:
+    """
+    Append-only embedding file for one model, read through a memory map.
+    Rows are located by text hash via a sidecar index file, so several
+    worker processes can share (and extend) the same store.
+    """
+
+    def __init__(self, directory: str, model_name: str):
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.data_path = os.path.join(directory, f"{slug}.f32")
+        self.index_path = os.path.join(directory, f"{slug}.idx")
+        self.meta_path = os.path.join(directory, f"{slug}.json")
+        self.dim: Optional[int] = None
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self.dim = json.load(f)["dim"]
+        self._rows: Dict[str, int] = {}
+        self._index_offset = 0
+        self._mmap = None
+        self._lock = threading.Lock()
+        self._refresh_index()
+
+    def _refresh_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_offset)
+            chunk = f.read()
+        # Ignore a trailing partial line written concurrently by another process
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        self._index_offset += len(complete)
+        for line in complete.decode("ascii").splitlines():
+            key, row = line.split("\t")
+            self._rows[key] = int(row)
+
+    def _row(self, row: int) -> Optional[np.ndarray]:
+        if self._mmap is None or row >= len(self._mmap):
+            n_rows = os.path.getsize(self.data_path) // (self.dim * 4)
+            if row >= n_rows:
+                return None
+            self._mmap = np.memmap(self.data_path, dtype=np.float32, mode="r", shape=(n_rows, self.dim))
+        return np.array(self._mmap[row])
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            if key not in self._rows:
+                self._refresh_index()
+            row = self._rows.get(key)
+            if row is None or self.dim is None:
+                return None
+            return self._row(row)
+
+    def put(self, key: str, embedding: np.ndarray):
+        embedding = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            if key in self._rows:
+                return
+            if self.dim is None:
+                self.dim = int(embedding.shape[0])
+                with open(self.meta_path, "w") as f:
+                    json.dump({"dim": self.dim}, f)
+            with open(self.data_path, "ab") as data, open(self.index_path, "a") as index:
+                if fcntl:
+                    fcntl.flock(data, fcntl.LOCK_EX)
+                try:
+                    data.seek(0, os.SEEK_END)
+                    row = data.tell() // (self.dim * 4)
+                    data.write(embedding.tobytes())
+                    data.flush()
+                    index.write(f"{key}\t{row}\n")
+                    index.flush()
+                finally:
+                    if fcntl:
+                        fcntl.flock(data, fcntl.LOCK_UN)
+            self._rows[key] = row
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache in front of an encoder.
+    A bounded in-memory LRU tier is backed by an optional on-disk tier.
+    """
+
+    def __init__(self, model_name: str, max_entries: int = 50000, disk_dir: Optional[str] = None):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.disk = DiskEmbeddingStore(disk_dir, model_name) if disk_dir else None
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        key = text_key(text)
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return embedding
+        if self.disk is not None:
+            embedding = self.disk.get(key)
+            if embedding is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, embedding)
+                return embedding
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, text: str, embedding: np.ndarray):
+        key = text_key(text)
+        self._remember(key, embedding)
+        if self.disk is not None:
+            self.disk.put(key, embedding)
+
+    def _remember(self, key: str, embedding: np.ndarray):
+        with self._lock:
+            self._memory[key] = embedding
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self.evictions += 1
+
+    def encode(self, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Returns embeddings for texts, encoding only the distinct texts not cached yet (in one batch).
+        """
+        rows: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if text in missing:
+                missing[text].append(i)
+                continue
+            rows[i] = self.get(text)
+            if rows[i] is None:
+                missing[text] = [i]
+        if missing:
+            for text, embedding in zip(missing, encode_fn(list(missing))):
+                self.put(text, embedding)
+                for i in missing[text]:
+                    rows[i] = embedding
+        if not rows:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack(rows)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,34 @@
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+
+class EmbeddingIndex:
+    """
+    Fixed vocabulary encoded once into a normalized embedding matrix.
+    Queries are scored against every entry with a single matrix product.
+    """
+
+    def __init__(self, labels: Sequence[str], encode: Callable[[List[str]], np.ndarray]):
+        self.labels = list(labels)
+        self.encode = encode
+        self.matrix = encode(self.labels) if self.labels else np.zeros((0, 0), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def scores(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Returns cosine similarities (queries x labels) for normalized query embeddings.
+        """
+        if not self.labels or len(embeddings) == 0:
+            return np.zeros((len(embeddings), len(self.labels)), dtype=np.float32)
+        return np.asarray(embeddings) @ self.matrix.T
+
+    def score_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encodes texts in one batch and scores them against the whole index.
+        """
+        if not texts:
+            return np.zeros((0, len(self.labels)), dtype=np.float32)
+        return self.scores(self.encode(list(texts)))
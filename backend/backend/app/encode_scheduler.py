@@ -0,0 +1,146 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app import config
+from app.metrics import REGISTRY
+
+REGISTRY.histogram("encode_queue_wait_seconds", "Time encode requests waited for their batch")
+REGISTRY.counter("encode_queue_rejected_total", "Encode requests rejected because the queue stayed full")
+
+
+class EncodeQueueFull(RuntimeError):
+    """Raised when an encode request could not be queued within the submit timeout."""
+
+
+class EncodeScheduler:
+    """
+    Merges encode requests from concurrent threads into batches.
+
+    A batch is closed when it holds max_batch texts or max_wait seconds after its
+    first request was taken from the queue; requests already waiting are always
+    added first, so batches grow with load. The queue is bounded: submit blocks
+    (backpressure) and gives up with EncodeQueueFull after submit_timeout.
+    """
+
+    def __init__(self,
+                 encode_fn: Callable[[List[str]], np.ndarray],
+                 max_batch: int = 128,
+                 max_wait: float = 0.002,
+                 max_queue: int = 256,
+                 workers: int = 1,
+                 submit_timeout: float = 30.0):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.submit_timeout = submit_timeout
+        self.workers = max(1, workers)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        # One worker forms a batch at a time; the others may be running theirs
+        self._collect_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.texts = 0
+        self.running = 0
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if not self._threads:
+                for i in range(self.workers):
+                    thread = threading.Thread(target=self._work, name=f"encode-scheduler-{i}", daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+
+    def submit(self, texts: List[str]) -> Future:
+        future: Future = Future()
+        if not texts:
+            future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return future
+        self._ensure_started()
+        try:
+            self._queue.put((list(texts), future, time.perf_counter()), timeout=self.submit_timeout)
+        except queue.Full:
+            REGISTRY.inc("encode_queue_rejected_total")
+            raise EncodeQueueFull(f"encode queue full for {self.submit_timeout}s") from None
+        with self._stats_lock:
+            self.requests += 1
+        return future
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Blocks until the batch holding these texts has been encoded."""
+        return self.submit(texts).result()
+
+    def _collect(self) -> list:
+        with self._collect_lock:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            return batch
+
+    def _work(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            for _, _, queued_at in batch:
+                REGISTRY.observe("encode_queue_wait_seconds", started - queued_at)
+            texts = [text for item_texts, _, _ in batch for text in item_texts]
+            with self._stats_lock:
+                self.running += 1
+            try:
+                embeddings = self.encode_fn(texts)
+            except BaseException as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            finally:
+                with self._stats_lock:
+                    self.running -= 1
+            with self._stats_lock:
+                self.batches += 1
+                self.texts += len(texts)
+            offset = 0
+            for item_texts, future, _ in batch:
+                future.set_result(embeddings[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "running_batches": self.running,
+                "requests": self.requests,
+                "batches": self.batches,
+                "avg_batch_texts": self.texts / self.batches if self.batches else 0.0,
+                "requests_per_batch": self.requests / self.batches if self.batches else 0.0,
+            }
+
+
+def build_encode_scheduler(encode_fn: Callable[[List[str]], np.ndarray]) -> Optional[EncodeScheduler]:
+    """Creates the scheduler described by app.config (None when disabled)."""
+    if not config.ENCODE_SCHEDULER:
+        return None
+    return EncodeScheduler(
+        encode_fn,
+        max_batch=config.ENCODE_MAX_BATCH,
+        max_wait=config.ENCODE_MAX_WAIT_MS / 1000,
+        max_queue=config.ENCODE_QUEUE_SIZE,
+        workers=config.ENCODE_WORKERS,
+        submit_timeout=config.ENCODE_QUEUE_TIMEOUT,
+    )
@@ -0,0 +1,59 @@
+"""
+Sentence encoder backends for CPU inference.
+
+- "torch": the reference full-precision PyTorch model;
+- "int8": the same model with its Linear layers dynamically quantized to int8;
+- "onnx": ONNX Runtime through sentence-transformers (exported on first load unless
+  SIM_ONNX_FILE names a file shipped with the model, e.g. an optimized/quantized one).
+
+All backends return SentenceTransformer objects, so encode() is used the same way.
+"""
+from typing import Optional
+
+from app import config
+
+ENCODER_BACKENDS = ("torch", "int8", "onnx")
+
+
+def encoder_id(model_name: str = config.SIM_MODEL_NAME,
+               backend: str = config.SIM_BACKEND,
+               onnx_file: Optional[str] = config.SIM_ONNX_FILE) -> str:
+    """
+    Identifies what produced an embedding; cache keys include it because the
+    backends return slightly different vectors for the same text.
+    """
+    if backend == "torch":
+        return model_name
+    if backend == "onnx" and onnx_file:
+        return f"{model_name}:onnx:{onnx_file}"
+    return f"{model_name}:{backend}"
+
+
+def load_encoder(model_name: str = config.SIM_MODEL_NAME,
+                 backend: str = config.SIM_BACKEND,
+                 threads: int = config.ENCODER_THREADS,
+                 onnx_file: Optional[str] = config.SIM_ONNX_FILE):
+    """Loads the sentence encoder for the given backend with at most `threads` intra-op threads."""
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend {backend!r}, expected one of {', '.join(ENCODER_BACKENDS)}")
+    from sentence_transformers import SentenceTransformer
+    if backend == "onnx":
+        import onnxruntime
+        session_options = onnxruntime.SessionOptions()
+        if threads > 0:
+            session_options.intra_op_num_threads = threads
+            session_options.inter_op_num_threads = 1
+        model_kwargs = {"provider": "CPUExecutionProvider", "session_options": session_options}
+        if onnx_file:
+            model_kwargs["file_name"] = onnx_file
+        return SentenceTransformer(model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+
+    import torch
+    if threads > 0:
+        # Process-wide: CPU_WORKERS stages may encode at the same time
+        torch.set_num_threads(threads)
+    model = SentenceTransformer(model_name, device="cpu")
+    if backend == "int8":
+        torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    model.eval()
+    return model
@@ -0,0 +1,179 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Example: MA030111 Introduction to Data Science 3 A 108 Term 1B 2022-2023
+COURSE_PATTERN = re.compile(
+    r'([A-Z]{2,}\d{6,})\s+([A-Za-zА-Яа-я0-9 ,\-&]+)\s+(\d+)\s+([A-FPassFail]+)\s+(\d+)\s+Term\s+\d+[A-B]?\s+\d{4}-\d{4}',
+    re.IGNORECASE
+)
+FULL_NAME_PATTERN = re.compile(r"Student ([A-Za-zА-Яа-я ]+)")
+DATE_OF_BIRTH_PATTERN = re.compile(r"Date of Birth ([0-9]{4}-[A-Za-z]{3}-[0-9]{2})")
+STUDENT_ID_PATTERN = re.compile(r"Student ID ([0-9A-Za-z-]+)")
+DEGREE_PATTERN = re.compile(r'Completion Level (.+?) Educational Program (.+?) Field of Knowledge')
+MAJOR_PROGRAM_PATTERN = re.compile(r'Program ([A-Za-zА-Яа-я0-9 ]+?) Field of Knowledge')
+MATRICULATION_PATTERN = re.compile(r'Matriculation Date ([0-9]{4}-[A-Za-z]{3}-[0-9]{2})')
+COMPLETION_PATTERN = re.compile(r'Date of Completion / Expected Date of ([0-9]{4}-[A-Za-z]{3}-[0-9]{2})')
+GPA_PATTERN = re.compile(r'GPA[:\s]+([0-9\.]+)', re.IGNORECASE)
+UNIVERSITY_PATTERN = re.compile(r'(Skolkovo Institute of Science and Technology|[A-Za-zА-Яа-я ]+University)')
+LANGUAGE_OF_INSTRUCTION_PATTERN = re.compile(r'language of instruction is ([A-Za-z]+)', re.IGNORECASE)
+
+# Example: Company, Position, 2020-2022 (also used for Institution, Degree, years)
+DATED_ENTRY_PATTERN = re.compile(
+    r'([A-Za-zА-Яа-я0-9 .,&-]+),\s*([A-Za-zА-Яа-я0-9 .,&-]+),\s*(\d{4})[-–](\d{4}|Present|Now|Настоящее время)',
+    re.IGNORECASE
+)
+EMAIL_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+')
+PHONE_PATTERN = re.compile(r'\+?\d[\d\-\s\(\)]{7,}\d')
+SOCIALS_PATTERN = re.compile(r'(linkedin\.com/\S+|github\.com/\S+|vk\.com/\S+)', re.IGNORECASE)
+SKILLS_BLOCK_PATTERN = re.compile(r'(skills|навыки)[:\n]+([\s\S]+?)(\n\w+:|\n\n|$)', re.IGNORECASE)
+SKILLS_SPLIT_PATTERN = re.compile(r'[\n,;•·]')
+
+# Single-value transcript fields, each found by its first (leftmost) match,
+# indexed by the characters a match can start with
+TRANSCRIPT_FIELDS = [
+    ("full_name", FULL_NAME_PATTERN, "S"),
+    ("date_of_birth", DATE_OF_BIRTH_PATTERN, "D"),
+    ("student_id", STUDENT_ID_PATTERN, "S"),
+    ("degree", DEGREE_PATTERN, "C"),
+    ("major_program", MAJOR_PROGRAM_PATTERN, "P"),
+    ("matriculation", MATRICULATION_PATTERN, "M"),
+    ("completion", COMPLETION_PATTERN, "D"),
+    ("gpa", GPA_PATTERN, "Gg"),
+    ("language_of_instruction", LANGUAGE_OF_INSTRUCTION_PATTERN, "Ll"),
+]
+FIELDS_BY_INITIAL: Dict[str, list] = {}
+for _name, _pattern, _initials in TRANSCRIPT_FIELDS:
+    for _initial in _initials:
+        FIELDS_BY_INITIAL.setdefault(_initial, []).append((_name, _pattern))
+# Zero-width scanner that stops at every position where any transcript field can start
+TRANSCRIPT_ANCHORS = re.compile(
+    r'(?=Student |Date of |Completion Level |Program |Matriculation Date |(?i:GPA)'
+    r'|(?i:language of instruction is )|(?i:[A-Z]{2,}\d{6,})'
+    r'|Skolkovo Institute of Science and Technology|University)'
+)
+# Characters of the [A-Za-zА-Яа-я ] class in UNIVERSITY_PATTERN
+UNIVERSITY_RUN_CHARS = frozenset(
+    [chr(c) for lo, hi in (("A", "Z"), ("a", "z"), ("А", "Я"), ("а", "я")) for c in range(ord(lo), ord(hi) + 1)] + [" "]
+)
+
+
+def _run_start(text: str, pos: int) -> int:
+    """Start of the run of UNIVERSITY_PATTERN name characters that ends at pos."""
+    while pos > 0 and text[pos - 1] in UNIVERSITY_RUN_CHARS:
+        pos -= 1
+    return pos
+
+
+def scan_transcript(text: str) -> Dict:
+    """
+    Extracts every transcript field in one scan over the text.
+    Results are the same as running each pattern's search/finditer separately.
+    """
+    first: Dict[str, re.Match] = {}
+    courses = []
+    course_end = 0
+    university_at: Optional[int] = None
+    # Nothing to look for when the literals are absent (cheap C-level checks)
+    university_run_found = "University" not in text
+    has_skolkovo = "Skolkovo Institute of Science and Technology" in text
+    for anchor in TRANSCRIPT_ANCHORS.finditer(text):
+        pos = anchor.start()
+        if pos >= course_end:
+            course = COURSE_PATTERN.match(text, pos)
+            if course:
+                courses.append(course)
+                course_end = course.end()
+        for name, pattern in FIELDS_BY_INITIAL.get(text[pos], ()):
+            if name not in first:
+                match = pattern.match(text, pos)
+                if match:
+                    first[name] = match
+        if university_at is None and text.startswith("Skolkovo Institute of Science and Technology", pos):
+            university_at = pos
+        if not university_run_found and text.startswith("University", pos):
+            # The leftmost "...University" match starts where its run of name characters starts
+            start = _run_start(text, pos)
+            if UNIVERSITY_PATTERN.match(text, start):
+                university_run_found = True
+                university_at = start if university_at is None else min(university_at, start)
+        university_settled = university_run_found and (university_at is not None or not has_skolkovo)
+        if university_settled and len(first) == len(TRANSCRIPT_FIELDS):
+            # Every single-value field is settled: only course rows remain
+            courses.extend(COURSE_PATTERN.finditer(text, course_end))
+            break
+    university = UNIVERSITY_PATTERN.match(text, university_at) if university_at is not None else None
+
+    def group(name: str) -> Optional[str]:
+        return first[name].group(1) if name in first else None
+
+    personal_info = {}
+    if "full_name" in first:
+        personal_info["full_name"] = group("full_name").strip()
+    if "date_of_birth" in first:
+        personal_info["date_of_birth"] = group("date_of_birth")
+    if "student_id" in first:
+        personal_info["student_id"] = group("student_id")
+    dates = {}
+    if "matriculation" in first:
+        dates['matriculation'] = group("matriculation")
+    if "completion" in first:
+        dates['completion'] = group("completion")
+    degree = first.get("degree")
+    return {
+        "courses": [
+            {
+                "code": code,
+                "name": name.strip(),
+                "ects": ects,
+                "grade": grade,
+                "hours": hours
+            }
+            for code, name, ects, grade, hours in (m.groups() for m in courses)
+        ],
+        "personal_info": personal_info,
+        "degree": degree.group(1).strip() + ' ' + degree.group(2).strip() if degree else "",
+        "major_program": group("major_program").strip() if "major_program" in first else "",
+        "dates": dates,
+        "gpa": group("gpa"),
+        "university": university.group(0) if university else None,
+        "language_of_instruction": group("language_of_instruction")
+    }
+
+
+def scan_dated_entries(text: str) -> List[Tuple[str, str, str, str]]:
+    """
+    "Name, Title, YYYY-YYYY" entries, shared by the experience and education extractors.
+    """
+    return [
+        (first.strip(), second.strip(), start, end)
+        for first, second, start, end in (m.groups() for m in DATED_ENTRY_PATTERN.finditer(text))
+    ]
+
+
+def scan_contacts(text: str) -> Dict:
+    contacts = {}
+    email = EMAIL_PATTERN.search(text)
+    phone = PHONE_PATTERN.search(text)
+    if email:
+        contacts['email'] = email.group(0)
+    if phone:
+        contacts['phone'] = phone.group(0)
+    # Socials (simple heuristic)
+    socials = SOCIALS_PATTERN.findall(text)
+    if socials:
+        contacts['socials'] = socials
+    return contacts
+
+
+def scan_skills_block(text: str) -> List[str]:
+    skills = []
+    # Look for a block after 'skills' or 'навыки'
+    skills_block = SKILLS_BLOCK_PATTERN.search(text)
+    if skills_block:
+        block = skills_block.group(2)
+        # Split by comma, semicolon, bullet, or newline
+        for skill in SKILLS_SPLIT_PATTERN.split(block):
+            skill = skill.strip()
+            if skill and len(skill) < 40:  # filter out noise
+                skills.append(skill)
+    return skills
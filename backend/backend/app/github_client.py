@@ -0,0 +1,187 @@
+"""
+GitHub repository ingestion for profile analysis.
+
+All pages of /users/{username}/repos are fetched (per_page=100; pages after the
+first concurrently, their count taken from the Link header). Every page is a
+conditional request: its ETag is kept with the page's aggregates, and a
+304 Not Modified answer, which does not count against GitHub's rate limit,
+reuses them. Repositories are folded into the aggregates page by page, so a
+profile's repository list is never kept in memory or in the cache.
+"""
+import asyncio
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from app import config
+from app.response_cache import MemoryBackend, SQLiteBackend
+
+LAST_PAGE_PATTERN = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+
+class GitHubAPIError(Exception):
+    """Raised when GitHub answers a repository page with an error status or an unexpected body."""
+
+    def __init__(self, status_code: int, detail):
+        super().__init__(f"GitHub API error: {status_code}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class RepoAggregate:
+    repositories: int = 0
+    stars: int = 0
+    forks: int = 0
+    languages: Set[str] = field(default_factory=set)
+
+    def add(self, repo: Dict):
+        lang = repo.get("language")
+        if lang:
+            self.languages.add(lang.lower())
+        self.repositories += 1
+        self.stars += repo.get("stargazers_count", 0)
+        self.forks += repo.get("forks_count", 0)
+
+    def merge(self, other: "RepoAggregate"):
+        self.repositories += other.repositories
+        self.stars += other.stars
+        self.forks += other.forks
+        self.languages |= other.languages
+
+    def as_dict(self) -> Dict:
+        return {"repositories": self.repositories, "stars": self.stars, "forks": self.forks,
+                "languages": sorted(self.languages)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RepoAggregate":
+        return cls(data["repositories"], data["stars"], data["forks"], set(data["languages"]))
+
+
+def last_page(link_header: Optional[str]) -> int:
+    match = LAST_PAGE_PATTERN.search(link_header or "")
+    return int(match.group(1)) if match else 1
+
+
+class GitHubClient:
+    """
+    Fetches and aggregates a user's public repositories through the shared
+    OutboundClient; page ETags and aggregates live in a MemoryBackend or SQLiteBackend.
+    """
+
+    def __init__(self, http, backend=None, token: Optional[str] = None, api_url: Optional[str] = None,
+                 per_page: int = 100, max_pages: int = 10, concurrency: int = 4):
+        self.http = http
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.token = token
+        self.api_url = api_url
+        self.per_page = per_page
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self.not_modified = 0
+        self.fetched = 0
+        self.rate_limit_remaining: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def repos_url(self, username: str) -> str:
+        return f"{self.api_url or config.GITHUB_API_URL}/users/{username}/repos"
+
+    def _key(self, username: str, page: int) -> str:
+        return f"{username.lower()}:{self.per_page}:{page}"
+
+    def _request(self, username: str, page: int) -> Tuple[str, Dict, Dict, Optional[Dict]]:
+        key = self._key(username, page)
+        entry = self.backend.get(key)
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if entry is not None:
+            headers["If-None-Match"] = entry["etag"]
+        return key, {"per_page": self.per_page, "page": page}, headers, entry
+
+    def _page(self, key: str, entry: Optional[Dict], response) -> Tuple[RepoAggregate, int]:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            self.rate_limit_remaining = int(remaining)
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.not_modified += 1
+            return RepoAggregate.from_dict(entry["aggregate"]), entry["last_page"]
+        try:
+            body = response.json() if response.content else {}
+        except ValueError:
+            body = response.text
+        if response.status_code != 200 or not isinstance(body, list):
+            raise GitHubAPIError(response.status_code, body)
+        with self._lock:
+            self.fetched += 1
+        aggregate = RepoAggregate()
+        for repo in body:
+            aggregate.add(repo)
+        pages = last_page(response.headers.get("Link"))
+        etag = response.headers.get("ETag")
+        if etag:
+            self.backend.set(key, {"etag": etag, "last_page": pages, "aggregate": aggregate.as_dict()})
+        return aggregate, pages
+
+    def fetch_page(self, username: str, page: int) -> Tuple[RepoAggregate, int]:
+        key, params, headers, entry = self._request(username, page)
+        return self._page(key, entry, self.http.get(self.repos_url(username), params=params, headers=headers))
+
+    async def fetch_page_async(self, username: str, page: int) -> Tuple[RepoAggregate, int]:
+        key, params, headers, entry = self._request(username, page)
+        response = await self.http.aget(self.repos_url(username), params=params, headers=headers)
+        return self._page(key, entry, response)
+
+    def repositories(self, username: str) -> RepoAggregate:
+        """Aggregates over all public repositories of the user (raises GitHubAPIError)."""
+        total, pages = self.fetch_page(username, 1)
+        rest = range(2, min(pages, self.max_pages) + 1)
+        if len(rest) > 1 and self.concurrency > 1:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(rest))) as pool:
+                results: List = list(pool.map(lambda page: self.fetch_page(username, page), rest))
+        else:
+            results = [self.fetch_page(username, page) for page in rest]
+        for aggregate, _ in results:
+            total.merge(aggregate)
+        return total
+
+    async def repositories_async(self, username: str) -> RepoAggregate:
+        """Non-blocking variant of repositories."""
+        total, pages = await self.fetch_page_async(username, 1)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(page: int):
+            async with semaphore:
+                return await self.fetch_page_async(username, page)
+
+        results = await asyncio.gather(*(fetch(page) for page in range(2, min(pages, self.max_pages) + 1)))
+        for aggregate, _ in results:
+            total.merge(aggregate)
+        return total
+
+    def stats(self) -> Dict:
+        with self._lock:
+            requests = self.not_modified + self.fetched
+            return {
+                "entries": len(self.backend),
+                "hits": self.not_modified,
+                "misses": self.fetched,
+                "hit_rate": self.not_modified / requests if requests else 0.0,
+            }
+
+
+def build_github_client(http) -> GitHubClient:
+    """Creates the GitHub client described by app.config (ETag cache in SQLite when a path is set)."""
+    if config.GITHUB_CACHE_PATH:
+        backend = SQLiteBackend(config.GITHUB_CACHE_PATH, config.GITHUB_CACHE_SIZE, table="github_pages")
+    else:
+        backend = MemoryBackend(config.GITHUB_CACHE_SIZE)
+    return GitHubClient(
+        http, backend,
+        token=config.GITHUB_TOKEN,
+        max_pages=config.GITHUB_MAX_PAGES,
+        concurrency=config.GITHUB_PAGE_CONCURRENCY,
+    )
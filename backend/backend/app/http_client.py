@@ -0,0 +1,273 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app import config
+
+RETRY_STATUSES = {429, 502, 503, 504}
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class CircuitOpenError(Exception):
+    """Raised without a network call while a host's circuit breaker is open."""
+
+
+# What get/aget raise when a host stays unreachable: callers degrade on these instead of failing
+TRANSPORT_ERRORS = (CircuitOpenError, requests.RequestException, httpx.HTTPError)
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures and fails fast for reset_timeout seconds.
+    After that one trial request is let through (half-open) to probe the host.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+
+    def release_trial(self):
+        """For a request that ended without an outcome (cancelled): lets the next one probe the host."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class HostStats:
+    """Request counters and a latency histogram for one upstream host."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.rejected = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._lock = threading.Lock()
+
+    def observe(self, latency: float, error: bool):
+        with self._lock:
+            self.requests += 1
+            self.errors += int(error)
+            self.latency_sum += latency
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    self.latency_buckets[i] += 1
+                    break
+            else:
+                self.latency_buckets[-1] += 1
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "rejected": self.rejected,
+                "latency_sum": self.latency_sum,
+                "avg_latency": self.latency_sum / self.requests if self.requests else 0.0,
+                "latency_buckets": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], self.latency_buckets)),
+            }
+
+
+class OutboundClient:
+    """
+    Shared HTTP client for all outbound integrations (GitHub, Stepik, hh.ru).
+
+    Sync calls use a pooled requests.Session, async calls a pooled httpx.AsyncClient;
+    both keep connections alive per host and share timeouts, retry with jittered
+    exponential backoff, per-host circuit breakers and per-host latency stats.
+    """
+
+    def __init__(self,
+                 timeout: float = 5,
+                 retries: int = 2,
+                 backoff: float = 0.2,
+                 max_backoff: float = 2.0,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30,
+                 pool_size: int = 20):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_loop = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, url: str):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._stats[host] = HostStats()
+            return host, self._breakers[host], self._stats[host]
+
+    def _delay(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, capped exponential backoff]
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None) -> requests.Response:
+        host, breaker, stats = self._host_state(url)
+        for attempt in range(self.retries + 1):
+            if not breaker.allow():
+                stats.rejected += 1
+                raise CircuitOpenError(f"circuit open for {host}")
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                stats.observe(time.perf_counter() - started, error=True)
+                breaker.record_failure()
+                if attempt == self.retries:
+                    raise
+            except Exception:
+                # Not retried (e.g. TooManyRedirects), but still a failed request
+                stats.observe(time.perf_counter() - started, error=True)
+                breaker.record_failure()
+                raise
+            except BaseException:
+                breaker.release_trial()
+                raise
+            else:
+                failed = response.status_code >= 500
+                stats.observe(time.perf_counter() - started, error=failed)
+                if failed:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+            stats.retries += 1
+            time.sleep(self._delay(attempt))
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        # httpx connection pools are bound to the event loop that created them
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=config.HTTP_MAX_CONNECTIONS,
+                                    max_keepalive_connections=self.pool_size),
+                timeout=self.timeout,
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    async def aget(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                   timeout: Optional[float] = None) -> httpx.Response:
+        host, breaker, stats = self._host_state(url)
+        client = self._get_async_client()
+        for attempt in range(self.retries + 1):
+            if not breaker.allow():
+                stats.rejected += 1
+                raise CircuitOpenError(f"circuit open for {host}")
+            started = time.perf_counter()
+            try:
+                response = await client.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+            except httpx.TransportError:
+                stats.observe(time.perf_counter() - started, error=True)
+                breaker.record_failure()
+                if attempt == self.retries:
+                    raise
+            except Exception:
+                # Not retried (e.g. DecodingError, TooManyRedirects), but still a failed request
+                stats.observe(time.perf_counter() - started, error=True)
+                breaker.record_failure()
+                raise
+            except BaseException:
+                # Cancelled (the caller stopped waiting): says nothing about the host
+                breaker.release_trial()
+                raise
+            else:
+                failed = response.status_code >= 500
+                stats.observe(time.perf_counter() - started, error=failed)
+                if failed:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+            stats.retries += 1
+            await asyncio.sleep(self._delay(attempt))
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            hosts = list(self._stats.items())
+        return {
+            host: dict(stats.as_dict(), circuit=self._breakers[host].state)
+            for host, stats in hosts
+        }
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.session.close()
+
+
+_default_client: Optional[OutboundClient] = None
+
+
+def default_client() -> OutboundClient:
+    """Process-wide client shared by DataProcessor and RecommendationEngine."""
+    global _default_client
+    if _default_client is None:
+        _default_client = OutboundClient(
+            timeout=config.HTTP_TIMEOUT,
+            retries=config.HTTP_RETRIES,
+            failure_threshold=config.HTTP_BREAKER_FAILURES,
+            reset_timeout=config.HTTP_BREAKER_RESET,
+        )
+    return _default_client
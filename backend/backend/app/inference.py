@@ -0,0 +1,306 @@
+"""
+Model server shared by all API workers of a host.
+
+The spaCy pipeline and the sentence encoder are loaded once, in a dedicated
+process that answers encode/NER requests over a Unix socket. Requests from
+different workers that arrive within INFERENCE_BATCH_WAIT_MS are run as one
+model call (up to INFERENCE_MAX_BATCH texts).
+
+    python -m app.inference --socket /run/advisor/inference.sock
+    INFERENCE_SOCKET=/run/advisor/inference.sock uvicorn app.main:app --workers 4
+
+Protocol: length-prefixed frames (4-byte big-endian size). A request is one JSON
+frame {"op": "encode" | "ner" | "ping", "texts": [...]}; the reply is a JSON frame
+{"ok": ..., ...}, followed for "encode" by one frame of float32 row-major data.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from app import config
+
+_HEADER = struct.Struct(">I")
+
+
+class RemoteInferenceError(RuntimeError):
+    """Raised when the inference server rejects a request or cannot be reached."""
+
+
+# ---- client side -----------------------------------------------------------
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks, remaining = [], size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            raise ConnectionError("inference server closed the connection")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_frame(sock: socket.socket) -> bytes:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return _recv_exact(sock, size)
+
+
+def _send_frame(sock: socket.socket, payload: bytes):
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+@dataclass
+class RemoteEntity:
+    text: str
+    label_: str
+
+
+@dataclass
+class RemoteDoc:
+    ents: List[RemoteEntity]
+
+
+class InferenceClient:
+    """
+    Blocking client, safe to share between threads: each thread keeps its own
+    connection to the server and reconnects once if it was dropped.
+    """
+
+    def __init__(self, path: str, timeout: float = config.INFERENCE_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            self._local.sock = sock
+        return sock
+
+    def _drop_connection(self):
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def _call(self, op: str, texts: List[str]):
+        request = json.dumps({"op": op, "texts": texts}, ensure_ascii=False).encode("utf-8")
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                _send_frame(sock, request)
+                reply = json.loads(_recv_frame(sock))
+                data = _recv_frame(sock) if reply.get("ok") and op == "encode" else None
+                break
+            except (ConnectionError, FileNotFoundError, socket.timeout, OSError) as e:
+                self._drop_connection()
+                if attempt:
+                    raise RemoteInferenceError(f"inference server at {self.path} unavailable: {e}") from e
+        if not reply.get("ok"):
+            raise RemoteInferenceError(reply.get("error", "inference server error"))
+        return reply, data
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """L2-normalized embeddings, one row per text."""
+        reply, data = self._call("encode", list(texts))
+        return np.frombuffer(data, dtype=np.float32).reshape(reply["shape"])
+
+    def entities(self, texts: List[str]) -> List[List[RemoteEntity]]:
+        reply, _ = self._call("ner", list(texts))
+        return [[RemoteEntity(text, label) for text, label in ents] for ents in reply["entities"]]
+
+    def ping(self) -> dict:
+        reply, _ = self._call("ping", [])
+        return reply
+
+    def wait_ready(self, timeout: float) -> dict:
+        """Waits until the server answers (it may still be loading models)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.ping()
+            except RemoteInferenceError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.5)
+
+
+class RemoteEncoder:
+    """Stands in for SentenceTransformer in DataProcessor (embeddings are always normalized)."""
+
+    def __init__(self, client: InferenceClient):
+        self.client = client
+
+    def encode(self, texts, convert_to_numpy: bool = True, normalize_embeddings: bool = True, **kwargs):
+        return self.client.encode(texts)
+
+
+class RemoteNLP:
+    """Stands in for the spaCy pipeline in DataProcessor; only entities are returned."""
+
+    def __init__(self, client: InferenceClient):
+        self.client = client
+
+    def pipe(self, texts, batch_size: Optional[int] = None):
+        return [RemoteDoc(ents) for ents in self.client.entities(list(texts))]
+
+
+# ---- server side -----------------------------------------------------------
+
+class MicroBatcher:
+    """
+    Queues requests and runs them as one model call: a batch closes when it holds
+    max_batch texts or max_wait seconds after its first request arrived.
+    """
+
+    def __init__(self, run: Callable[[List[str]], object], max_batch: int, max_wait: float, executor):
+        self.run = run
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.executor = executor
+        self.queue: "asyncio.Queue" = asyncio.Queue()
+        self.batches = 0
+
+    async def submit(self, texts: List[str]):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, future))
+        return await future
+
+    async def run_forever(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            try:
+                results = await loop.run_in_executor(self.executor, self.run, texts) if texts else []
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            offset = 0
+            for item_texts, future in batch:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+
+class InferenceServer:
+    def __init__(self, path: str,
+                 max_batch: int = config.INFERENCE_MAX_BATCH,
+                 max_wait: float = config.INFERENCE_BATCH_WAIT_MS / 1000):
+        self.path = path
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.nlp = None
+        self.encoder = None
+
+    def load(self):
+        from app.data_processor import load_nlp
+        from app.encoders import load_encoder
+        self.nlp = load_nlp()
+        self.encoder = load_encoder()
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        embeddings = self.encoder.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    def _entities(self, texts: List[str]) -> list:
+        return [[(ent.text, ent.label_) for ent in doc.ents] for doc in self.nlp.pipe(texts)]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        from app.encoders import encoder_id
+
+        async def send(payload: bytes):
+            writer.write(_HEADER.pack(len(payload)) + payload)
+            await writer.drain()
+
+        try:
+            while True:
+                try:
+                    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                    request = json.loads(await reader.readexactly(size))
+                except asyncio.IncompleteReadError:
+                    return
+                op, texts = request.get("op"), request.get("texts") or []
+                try:
+                    if op == "encode":
+                        embeddings = await self.encode_batcher.submit(texts)
+                        await send(json.dumps({"ok": True, "shape": list(embeddings.shape)}).encode())
+                        await send(embeddings.tobytes())
+                    elif op == "ner":
+                        entities = await self.ner_batcher.submit(texts)
+                        await send(json.dumps({"ok": True, "entities": entities}, ensure_ascii=False).encode("utf-8"))
+                    elif op == "ping":
+                        await send(json.dumps({
+                            "ok": True, "encoder": encoder_id(), "pid": os.getpid(),
+                            "batches": {"encode": self.encode_batcher.batches, "ner": self.ner_batcher.batches},
+                        }).encode())
+                    else:
+                        await send(json.dumps({"ok": False, "error": f"unknown op {op!r}"}).encode())
+                except Exception as e:
+                    await send(json.dumps({"ok": False, "error": str(e)}).encode())
+        finally:
+            writer.close()
+
+    async def serve(self):
+        # One model call at a time per model; parallelism comes from the encoder's own threads
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="inference")
+        self.encode_batcher = MicroBatcher(self._encode, self.max_batch, self.max_wait, executor)
+        self.ner_batcher = MicroBatcher(self._entities, self.max_batch, self.max_wait, executor)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = await asyncio.start_unix_server(self._handle, path=self.path)
+        os.chmod(self.path, 0o660)
+        batchers = [asyncio.ensure_future(b.run_forever()) for b in (self.encode_batcher, self.ner_batcher)]
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in batchers:
+                task.cancel()
+            executor.shutdown(wait=False)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serve spaCy NER and sentence embeddings over a Unix socket.")
+    parser.add_argument("--socket", default=config.INFERENCE_SOCKET or "/tmp/advisor-inference.sock")
+    parser.add_argument("--max-batch", type=int, default=config.INFERENCE_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=config.INFERENCE_BATCH_WAIT_MS)
+    args = parser.parse_args(argv)
+    server = InferenceServer(args.socket, args.max_batch, args.max_wait_ms / 1000)
+    server.load()
+    print(f"Inference server listening on {args.socket}", flush=True)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Background ingestion of hh.ru vacancies and the Stepik catalog into the local stores.
+
+    python -m app.ingestion --vacancy-db /var/lib/advisor/vacancies.db --course-db /var/lib/advisor/courses.db
+
+Vacancies are polled for every taxonomy role at every experience level, courses by
+paging the public catalog; only new or edited items are re-embedded. The server
+(VACANCY_STORE_PATH / COURSE_CATALOG_PATH) then answers without external calls.
+"""
+import argparse
+import functools
+import json
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app import config
+from app.course_catalog import CourseStore, sync_catalog
+from app.position_taxonomy import PositionTaxonomy
+from app.vacancy_store import LEVEL_PREFIXES, VacancyStore, parse_vacancies, vacancy_search_text
+
+HH_PAGE_SIZE = 100  # hh.ru maximum
+
+
+class IngestionWorker:
+    def __init__(self, taxonomy: PositionTaxonomy, http,
+                 vacancies: Optional[VacancyStore] = None, courses: Optional[CourseStore] = None,
+                 encode: Optional[Callable[[List[str]], np.ndarray]] = None, model: Optional[str] = None,
+                 hh_pages: int = 2, max_age: float = 259200, course_pages: int = 5000):
+        self.taxonomy = taxonomy
+        self.http = http
+        self.vacancies = vacancies
+        self.courses = courses
+        self.encode = encode
+        self.model = model
+        self.hh_pages = hh_pages
+        self.max_age = max_age
+        self.course_pages = course_pages
+        self.hh_api_url = config.HH_API_URL
+        self.hh_area = 113  # Russia
+
+    def vacancy_queries(self) -> List[str]:
+        """hh.ru search texts the server looks vacancies up by: each role at each level."""
+        return list(dict.fromkeys(
+            vacancy_search_text(role.name, level) for role in self.taxonomy.roles for level in LEVEL_PREFIXES
+        ))
+
+    def _fetch_query(self, query: str) -> List[Dict]:
+        vacancies = []
+        for page in range(self.hh_pages):
+            params = {"text": query, "area": self.hh_area, "per_page": HH_PAGE_SIZE, "page": page}
+            resp = self.http.get(self.hh_api_url, params=params)
+            resp.raise_for_status()
+            data = resp.json()
+            vacancies.extend(parse_vacancies(data))
+            if page + 1 >= data.get("pages", 1):
+                break
+        return vacancies
+
+    def ingest_vacancies(self, now: Optional[float] = None) -> Dict:
+        """
+        One polling round. A failed query is skipped (its vacancies stay until max_age);
+        vacancies no query returned for max_age seconds are removed.
+        """
+        now = time.time() if now is None else now
+        queries = self.vacancy_queries()
+        changed = 0
+        failed = []
+        for query in queries:
+            try:
+                vacancies = self._fetch_query(query)
+            except Exception as e:
+                failed.append({"query": query, "error": str(e)})
+                continue
+            changed += self.vacancies.upsert(query, vacancies, now)
+        embedded = self.vacancies.embed_missing(self.encode, self.model) if self.encode is not None else 0
+        purged = self.vacancies.purge(self.max_age, now)
+        self.vacancies.set_meta("synced_at", repr(time.time()))
+        return {
+            "queries": len(queries), "failed": failed, "vacancies": len(self.vacancies),
+            "changed": changed, "embedded": embedded, "purged": purged,
+        }
+
+    def ingest_courses(self) -> Dict:
+        return sync_catalog(self.courses, self.http, config.STEPIK_API_URL, self.course_pages, self.encode, self.model)
+
+    def run_once(self) -> Dict:
+        report = {}
+        if self.vacancies is not None:
+            report["vacancies"] = self.ingest_vacancies()
+        if self.courses is not None:
+            report["courses"] = self.ingest_courses()
+        return report
+
+    def run_forever(self, vacancy_interval: float, course_interval: float,
+                    report: Callable[[Dict], None] = print):
+        """Runs each ingestion job on its own interval; a failing round is reported and retried next time."""
+        jobs = []
+        if self.vacancies is not None:
+            jobs.append(["vacancies", self.ingest_vacancies, vacancy_interval, 0.0])
+        if self.courses is not None:
+            jobs.append(["courses", self.ingest_courses, course_interval, 0.0])
+        while jobs:
+            for job in jobs:
+                name, run, interval, due = job
+                if time.monotonic() < due:
+                    continue
+                try:
+                    report(json.dumps({name: run()}))
+                except Exception as e:
+                    report(json.dumps({name: {"error": str(e)}}))
+                job[3] = time.monotonic() + interval
+            time.sleep(max(0.0, min(job[3] for job in jobs) - time.monotonic()))
+
+
+def main(argv: Optional[List[str]] = None):
+    from app.encoders import encoder_id, load_encoder
+    from app.http_client import default_client
+
+    parser = argparse.ArgumentParser(description="Poll hh.ru and Stepik into the local vacancy and course stores.")
+    parser.add_argument("--vacancy-db", default=config.VACANCY_STORE_PATH)
+    parser.add_argument("--course-db", default=config.COURSE_CATALOG_PATH)
+    parser.add_argument("--once", action="store_true", help="run one round of each job and exit")
+    parser.add_argument("--no-embeddings", action="store_true", help="skip encoding (no semantic ranking)")
+    args = parser.parse_args(argv)
+    if not args.vacancy_db and not args.course_db:
+        parser.error("set --vacancy-db and/or --course-db")
+
+    encode = model = None
+    if not args.no_embeddings:
+        encoder = load_encoder()
+        model = encoder_id()
+        encode = functools.partial(encoder.encode, convert_to_numpy=True, normalize_embeddings=True, batch_size=64)
+
+    worker = IngestionWorker(
+        PositionTaxonomy.load(config.POSITION_TAXONOMY_PATH), default_client(),
+        vacancies=VacancyStore(args.vacancy_db) if args.vacancy_db else None,
+        courses=CourseStore(args.course_db) if args.course_db else None,
+        encode=encode, model=model, hh_pages=config.INGEST_HH_PAGES,
+        max_age=config.VACANCY_MAX_AGE, course_pages=config.STEPIK_SYNC_MAX_PAGES,
+    )
+    if args.once:
+        print(json.dumps(worker.run_once()))
+    else:
+        worker.run_forever(config.INGEST_VACANCY_INTERVAL, config.INGEST_COURSE_INTERVAL)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+In-process job queue for long analyses (/jobs/analyze-profile).
+
+Submitting returns a job id at once; a fixed number of worker tasks take jobs by
+priority (higher first, then submission order). A job publishes an event per
+finished stage, which clients poll (/jobs/{id}) or stream as Server-Sent Events
+(/jobs/{id}/events). Jobs live in the process that accepted them.
+"""
+import asyncio
+import contextvars
+import itertools
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.metrics import REGISTRY
+
+REGISTRY.histogram("job_queue_wait_seconds", "Time jobs waited for a worker")
+REGISTRY.counter("job_queue_rejected_total", "Jobs rejected because the queue was full")
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# A job body: receives emit(stage, data) and returns the final result
+JobFunc = Callable[[Callable[[str, Any], None]], Awaitable[Any]]
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when a job is submitted while max_queued jobs are already waiting."""
+
+
+@dataclass
+class Job:
+    id: str
+    priority: int
+    run: Optional[JobFunc]
+    state: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # (stage, data) in the order the stages finished; the last one is "result" or "error"
+    events: List[tuple] = field(default_factory=list)
+    result: Any = None
+    error: Optional[str] = None
+    # Set (and replaced) whenever an event is published
+    changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (DONE, FAILED)
+
+    def publish(self, stage: str, data: Any):
+        self.events.append((stage, data))
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    def as_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "stages": {stage: data for stage, data in self.events if stage not in ("result", "error")},
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    def __init__(self, workers: int = 2, max_queued: int = 100, result_ttl: float = 3600):
+        self.workers = max(1, workers)
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._max_queued = max_queued
+        self._tasks: List[asyncio.Task] = []
+        self._order = itertools.count()
+        self.running = 0
+
+    def _ensure_started(self):
+        # Workers belong to the event loop of the first submission (the server's loop)
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self._max_queued)
+        # Workers start in an empty context: they outlive the submitting request and must not
+        # inherit its context variables (e.g. its timings list)
+        self._tasks = [contextvars.Context().run(asyncio.ensure_future, self._work()) for _ in range(self.workers)]
+
+    def submit(self, run: JobFunc, priority: int = 0) -> Job:
+        """Queues a job (higher priority runs first); raises JobQueueFull when the queue is full."""
+        self._ensure_started()
+        self._expire()
+        job = Job(uuid.uuid4().hex, priority, run)
+        try:
+            self._queue.put_nowait((-priority, next(self._order), job))
+        except asyncio.QueueFull:
+            REGISTRY.inc("job_queue_rejected_total")
+            raise JobQueueFull(f"{self._max_queued} jobs are already queued") from None
+        self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._expire()
+        return self.jobs.get(job_id)
+
+    def _expire(self):
+        cutoff = time.time() - self.result_ttl
+        for job_id in [j.id for j in self.jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    async def _work(self):
+        while True:
+            _, _, job = await self._queue.get()
+            job.state, job.started_at = RUNNING, time.time()
+            REGISTRY.observe("job_queue_wait_seconds", job.started_at - job.created_at)
+            self.running += 1
+            try:
+                job.result = await job.run(job.publish)
+                job.state = DONE
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.error, job.state = str(e) or type(e).__name__, FAILED
+            finally:
+                self.running -= 1
+                job.finished_at = time.time()
+                job.run = None
+                self._queue.task_done()
+            job.publish("result" if job.state == DONE else "error",
+                        job.result if job.state == DONE else {"message": job.error})
+
+    async def events(self, job: Job, since: int = 0) -> AsyncIterator[tuple]:
+        """Yields (event number, stage, data) from event `since` on, until the job has finished."""
+        position = since
+        while True:
+            changed = job.changed
+            if len(job.events) <= position:
+                if job.finished:
+                    return
+                await changed.wait()
+                continue
+            for stage, data in job.events[position:]:
+                position += 1
+                yield position, stage, data
+                if stage in ("result", "error"):
+                    return
+
+    def stats(self) -> Dict:
+        return {"queued": self._queue.qsize() if self._queue is not None else 0, "running": self.running}
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+def sse_event(event_id: int, stage: str, data: Any) -> str:
+    return f"id: {event_id}\nevent: {stage}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
@@ -0,0 +1,119 @@
+"""
+Multi-keyword substring matching and script detection for the text filters.
+
+KeywordMatcher compiles a keyword set into an Aho-Corasick automaton, so a text
+is scanned once however many keywords there are (the `any(kw in text ...)`
+loops it replaces scan it once per keyword). Matching is case-sensitive:
+keywords are lowercased on compile, and callers pass lowercased text.
+"""
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+KAZAKH_LETTERS = "әғқңөұүһі"
+CYRILLIC_LETTERS = "абвгдежзийклмнопрстуфхцчшщъыьэюяё"
+LATIN_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+CYRILLIC, LATIN, KAZAKH = "cyrillic", "latin", "kazakh"
+CHAR_SCRIPTS: Dict[str, str] = {
+    ch: script
+    for letters, script in ((CYRILLIC_LETTERS, CYRILLIC), (LATIN_LETTERS, LATIN), (KAZAKH_LETTERS, KAZAKH))
+    for ch in letters + letters.upper()
+}
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed keyword set; a keyword matches wherever
+    it occurs as a substring. Optional labels map keywords to groups (e.g. degrees).
+    """
+
+    def __init__(self, keywords: Iterable[str], labels: Optional[Sequence[str]] = None):
+        keywords = [kw.lower() for kw in keywords]
+        labels = list(labels) if labels is not None else keywords
+        self.keywords: List[str] = []
+        self.labels: List[str] = []
+        for kw, label in zip(keywords, labels):
+            if kw and kw not in self.keywords:
+                self.keywords.append(kw)
+                self.labels.append(label)
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Tuple[int, ...]] = [()]
+        for i, kw in enumerate(self.keywords):
+            node = 0
+            for ch in kw:
+                child = goto[node].get(ch)
+                if child is None:
+                    child = len(goto)
+                    goto[node][ch] = child
+                    goto.append({})
+                    output.append(())
+                node = child
+            output[node] += (i,)
+        # Breadth-first: a node's failure link is the longest proper suffix that is also in the trie
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(ch, 0)
+                output[child] += output[fail[child]]
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yields (end position, keyword index) for every occurrence, in text order."""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for pos, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for i in output[node]:
+                yield pos, i
+
+    def search(self, text: str) -> bool:
+        """True if any keyword occurs in the text (stops at the first match)."""
+        for _ in self.iter_matches(text):
+            return True
+        return False
+
+    def found(self, text: str) -> Set[str]:
+        """Labels of all keywords occurring in the text."""
+        return {self.labels[i] for _, i in self.iter_matches(text)}
+
+
+@lru_cache(maxsize=256)
+def compile_keywords(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """Shared matcher for a keyword list that is built at runtime (e.g. a position's keywords)."""
+    return KeywordMatcher(keywords)
+
+
+def script_counts(text: str) -> Dict[str, int]:
+    """Letters per script (Cyrillic, Latin, Kazakh-specific), counted in one pass over the text."""
+    counts = {CYRILLIC: 0, LATIN: 0, KAZAKH: 0}
+    for ch, n in Counter(text).items():
+        script = CHAR_SCRIPTS.get(ch)
+        if script is not None:
+            counts[script] += n
+    return counts
+
+
+def detect_language(text: str) -> Optional[str]:
+    """"kk" if Kazakh letters occur, otherwise "ru" or "en" by the dominant script (None without letters)."""
+    counts = script_counts(text)
+    if counts[KAZAKH]:
+        return "kk"
+    if counts[CYRILLIC] > counts[LATIN]:
+        return "ru"
+    if counts[LATIN] > counts[CYRILLIC]:
+        return "en"
+    return None
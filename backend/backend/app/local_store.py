@@ -0,0 +1,130 @@
+"""
+Shared plumbing of the local SQLite stores filled by the ingestion jobs
+(courses, vacancies): connection setup, a key/value meta table, a change feed,
+incremental embedding, and in-memory snapshots that follow new syncs.
+"""
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+import time
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+class SQLiteStore(ABC):
+    """
+    Abstract base: subclasses set `table` (with `id`, `embedding` columns), `meta_table`
+    and `text_columns`, create their tables in `create_tables` and build the text
+    to embed in `embedding_input`. Every insert/update/delete of an item is appended
+    to the `changes` table, which consumers read incrementally by sequence number.
+    """
+
+    table = ""
+    meta_table = "meta"
+    text_columns = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {self.meta_table} (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, "
+            "item_id TEXT NOT NULL, op TEXT NOT NULL, at REAL NOT NULL)"
+        )
+        self.create_tables()
+
+    @abstractmethod
+    def create_tables(self):
+        """Creates the store's item tables (called once the connection is open)."""
+
+    @abstractmethod
+    def embedding_input(self, *columns) -> str:
+        """The text to embed for an item, given its `text_columns` values."""
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT value FROM {self.meta_table} WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute(f"INSERT OR REPLACE INTO {self.meta_table} (key, value) VALUES (?, ?)", (key, value))
+
+    def _record_change(self, item_id, op: str, at: float):
+        # Called with the lock held, inside the caller's transaction
+        self._conn.execute("INSERT INTO changes (kind, item_id, op, at) VALUES (?, ?, ?, ?)",
+                           (self.table, str(item_id), op, at))
+
+    def changes(self, since: int = 0, limit: int = 1000) -> List[Dict]:
+        """This store's changes after sequence number `since`, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, item_id, op, at FROM changes WHERE kind = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (self.table, since, limit),
+            ).fetchall()
+        return [{"seq": seq, "id": item_id, "op": op, "at": at} for seq, item_id, op, at in rows]
+
+    def embed_missing(self, encode: Callable[[List[str]], np.ndarray], model: str, batch_size: int = 256) -> int:
+        """Encodes items without an embedding (all of them when the model changed)."""
+        if self.get_meta("encoder") != model:
+            with self._lock:
+                self._conn.execute(f"UPDATE {self.table} SET embedding = NULL")
+            self.set_meta("encoder", model)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, {self.text_columns} FROM {self.table} WHERE embedding IS NULL"
+            ).fetchall()
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            embeddings = np.asarray(encode([self.embedding_input(*row[1:]) for row in batch]), dtype=np.float32)
+            with self._lock:
+                self._conn.executemany(
+                    f"UPDATE {self.table} SET embedding = ? WHERE id = ?",
+                    [(embedding.tobytes(), row[0]) for row, embedding in zip(batch, embeddings)],
+                )
+        return len(rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+def stack_embeddings(blobs: List[Optional[bytes]]) -> Optional[np.ndarray]:
+    """Embedding matrix of stored rows, or None unless every row has one."""
+    if not blobs or any(blob is None for blob in blobs):
+        return None
+    return np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), -1)
+
+
+class StoreSnapshot(Generic[T]):
+    """
+    Holds an in-memory index built from a store and swaps in a new one once a
+    later sync has finished (checked at most every reload_interval seconds).
+    """
+
+    def __init__(self, store: SQLiteStore, build: Callable[[SQLiteStore], T], reload_interval: float = 300):
+        self.store = store
+        self.build = build
+        self.reload_interval = reload_interval
+        self._index: Optional[T] = None
+        self._version: Optional[str] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def index(self) -> T:
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < self.reload_interval:
+            return self._index
+        with self._lock:
+            if self._index is None or now - self._checked_at >= self.reload_interval:
+                version = self.store.get_meta("synced_at")
+                if self._index is None or version != self._version:
+                    self._index = self.build(self.store)
+                    self._version = version
+                self._checked_at = now
+        return self._index
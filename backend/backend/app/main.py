@@ -1,11 +1,43 @@
-from fastapi import FastAPI, UploadFile, File, Form
+import asyncio
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 from typing import List, Optional
 import uvicorn
+from app import config, metrics
+from app.batch import analyze_batch, collect_from_zip, to_jsonl
+from app.cpu_pool import cpu_executor, run_cpu
 from app.data_processor import DataProcessor
+from app.document_context import DocumentContext
+from app.encode_scheduler import EncodeQueueFull
+from app.http_client import default_client
+from app.jobs import JobQueue, JobQueueFull, sse_event
+from app.pdf_ingest import PDFLimitError
+from app.profile_cache import build_profile_cache, file_digest
 from app.recommendation_engine import RecommendationEngine
-app = FastAPI(title="AI Career Path Advisor")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models load in the background so the app answers /health right away
+    if config.WARMUP_ON_STARTUP:
+        threading.Thread(target=data_processor.warm_up, name="model-warmup", daemon=True).start()
+    try:
+        yield
+    finally:
+        await job_queue.close()
+        recommendation_engine.close()
+        await default_client().aclose()
+        cpu_executor.shutdown(wait=False)
+
+app = FastAPI(title="AI Career Path Advisor", lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -16,9 +48,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize our services
+@app.middleware("http")
+async def record_timings(request: Request, call_next):
+    # Stages timed while handling the request are also reported in Server-Timing
+    start = time.perf_counter()
+    with metrics.collect_timings() as timings:
+        with metrics.timed("request"):
+            response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.REGISTRY.observe(
+        "http_request_duration_seconds", time.perf_counter() - start,
+        path=route.path if route is not None else "unmatched", status=str(response.status_code)
+    )
+    if config.SERVER_TIMING:
+        response.headers["Server-Timing"] = metrics.server_timing_header(timings)
+    return response
+
+@app.exception_handler(PDFLimitError)
+async def pdf_limit_handler(request: Request, exc: PDFLimitError):
+    return JSONResponse(status_code=413, content={"status": "error", "message": str(exc)})
+
+@app.exception_handler(EncodeQueueFull)
+async def encode_queue_full_handler(request: Request, exc: EncodeQueueFull):
+    return JSONResponse(status_code=503, content={"status": "error", "message": "Server is overloaded, retry later"},
+                        headers={"Retry-After": "5"})
+
+@app.exception_handler(JobQueueFull)
+async def job_queue_full_handler(request: Request, exc: JobQueueFull):
+    return JSONResponse(status_code=503, content={"status": "error", "message": "Too many queued jobs, retry later"},
+                        headers={"Retry-After": "10"})
+
+# Initialize our services (cheap: models are loaded lazily)
 data_processor = DataProcessor()
-recommendation_engine = RecommendationEngine()
+recommendation_engine = RecommendationEngine(encode=data_processor.encode)
+profile_cache = build_profile_cache()
+# Background analyses submitted to /jobs/analyze-profile
+job_queue = JobQueue(config.JOB_WORKERS, config.JOB_QUEUE_SIZE, config.JOB_RESULT_TTL)
 
 class UserProfile(BaseModel):
     desired_position: str
@@ -27,6 +92,105 @@ class UserProfile(BaseModel):
     experience_level: str
     github_profile: Optional[str] = None
 
+async def parse_transcript(transcript):
+    """
+    Returns (content hash, analysis, text); a cached analysis already holds the structured transcript.
+    """
+    digest = await run_cpu(file_digest, transcript)
+    cached = profile_cache.get("transcript", digest)
+    if cached is not None:
+        return digest, cached, None
+    text = await run_cpu(data_processor.extract_text_from_pdf, transcript)
+    education = await run_cpu(data_processor.extract_education, text)
+    return digest, {"text": text, "education": education}, text
+
+async def parse_resume(resume):
+    """
+    Returns (content hash, analysis, document context); the context carries the NER
+    and embedding outputs over to the structured extraction.
+    """
+    digest = await run_cpu(file_digest, resume)
+    cached = profile_cache.get("resume", digest)
+    if cached is not None:
+        return digest, cached, None
+    text = await run_cpu(data_processor.extract_text_from_pdf, resume)
+    context = DocumentContext(text)
+    skills = (await run_cpu(data_processor.skills_from_contexts, [context]))[0]
+    return digest, {"text": text, "skills": skills}, context
+
+async def complete_analysis(kind: str, digest: str, analysis: dict, field: str, extract, *args):
+    """Adds the structured extraction on a cache miss and stores the full analysis."""
+    if field not in analysis:
+        analysis = {**analysis, field: await run_cpu(extract, *args)}
+        profile_cache.set(kind, digest, analysis)
+    return analysis[field]
+
+def structured_resume_from_context(context: DocumentContext) -> dict:
+    return data_processor.structured_resume_from_contexts([context])[0]
+
+def no_events(stage: str, data):
+    pass
+
+async def run_analysis(desired_position: str, transcript, resume, github_profile: Optional[str], emit=no_events) -> dict:
+    """
+    Full profile analysis of two PDF file objects. emit(stage, data) is called as
+    stages finish: "skills" first, then "structured" and "recommendations" in
+    whichever order they complete.
+    """
+    # Stage 1: transcript, resume and GitHub are independent of each other
+    transcript_result, resume_result, github_data = await asyncio.gather(
+        parse_transcript(transcript),
+        parse_resume(resume),
+        data_processor.analyze_github_profile_async(github_profile),
+    )
+    transcript_digest, transcript_analysis, transcript_text = transcript_result
+    resume_digest, resume_analysis, resume_context = resume_result
+    education = transcript_analysis["education"]
+    skills = resume_analysis["skills"]
+    experience_level = data_processor.calculate_experience_level({
+        "skills": skills,
+        "education": education,
+        "github_data": github_data
+    })
+    emit("skills", {
+        "experience_level": experience_level,
+        "skills": skills,
+        "education": education,
+        "github_data": github_data
+    })
+
+    async def recommend():
+        recommendations = await recommendation_engine.get_recommendations_async(
+            desired_position=desired_position,
+            experience_level=experience_level,
+            skills=skills
+        )
+        emit("recommendations", recommendations)
+        return recommendations
+
+    async def structure():
+        sections = await asyncio.gather(
+            complete_analysis("transcript", transcript_digest, transcript_analysis,
+                              "structured_transcript", data_processor.extract_structured_transcript, transcript_text),
+            complete_analysis("resume", resume_digest, resume_analysis,
+                              "structured_resume", structured_resume_from_context, resume_context),
+        )
+        emit("structured", {"structured_transcript": sections[0], "structured_resume": sections[1]})
+        return sections
+
+    # Stage 2: recommendations overlap with the structured extraction (skipped for cached documents)
+    recommendations, (structured_transcript, structured_resume) = await asyncio.gather(recommend(), structure())
+
+    return {
+        "experience_level": experience_level,
+        "skills": skills,
+        "education": education,
+        "github_data": github_data,
+        "structured_resume": structured_resume,
+        "structured_transcript": structured_transcript,
+        "recommendations": recommendations
+    }
+
 @app.post("/analyze-profile")
 async def analyze_profile(
     desired_position: str = Form(...),
@@ -34,45 +198,146 @@ async def analyze_profile(
     resume: UploadFile = File(...),
     github_profile: Optional[str] = Form(None)
 ):
-    # Process uploaded files
-    transcript_text = data_processor.extract_text_from_pdf(transcript.file)
-    resume_text = data_processor.extract_text_from_pdf(resume.file)
-    
-    # Structured extraction for transcript and resume (all expanded sections)
-    structured_transcript = data_processor.extract_structured_transcript(transcript_text)
-    structured_resume = data_processor.extract_structured_resume(resume_text)
-    
-    # Process profile data
-    profile_data = data_processor.process_profile(
-        transcript_text=transcript_text,
-        resume_text=resume_text,
-        github_profile=github_profile
-    )
-    
-    # Get recommendations
-    recommendations = recommendation_engine.get_recommendations(
-        desired_position=desired_position,
-        experience_level=profile_data["experience_level"],
-        skills=profile_data["skills"]
-    )
-    
+    data = await run_analysis(desired_position, transcript.file, resume.file, github_profile)
     return {
         "status": "success",
         "message": "Profile analysis completed",
-        "data": {
-            "experience_level": profile_data["experience_level"],
-            "skills": profile_data["skills"],
-            "education": profile_data["education"],
-            "github_data": profile_data["github_data"],
-            "structured_resume": structured_resume,
-            "structured_transcript": structured_transcript,
-            "recommendations": recommendations
-        }
+        "data": data
     }
 
+def copy_upload(upload: UploadFile):
+    """Copy of an upload that outlives the request (uploads are closed once the response is sent)."""
+    copy = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+    upload.file.seek(0)
+    shutil.copyfileobj(upload.file, copy)
+    copy.seek(0)
+    return copy
+
+@app.post("/jobs/analyze-profile", status_code=202)
+async def submit_profile_analysis(
+    desired_position: str = Form(...),
+    transcript: UploadFile = File(...),
+    resume: UploadFile = File(...),
+    github_profile: Optional[str] = Form(None),
+    priority: int = Form(0, ge=-10, le=10)
+):
+    """
+    Queues a profile analysis and returns its job id at once. Poll /jobs/{job_id}
+    or stream /jobs/{job_id}/events (Server-Sent Events) for the stages and result.
+    """
+    transcript_copy = await run_cpu(copy_upload, transcript)
+    resume_copy = await run_cpu(copy_upload, resume)
+
+    async def run(emit):
+        try:
+            return await run_analysis(desired_position, transcript_copy, resume_copy, github_profile, emit)
+        finally:
+            transcript_copy.close()
+            resume_copy.close()
+
+    try:
+        job = job_queue.submit(run, priority)
+    except JobQueueFull:
+        transcript_copy.close()
+        resume_copy.close()
+        raise
+    return JSONResponse(
+        status_code=202,
+        content={"status": "success", "message": "Profile analysis queued", "data": {"job_id": job.id, "state": job.state}},
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+def unknown_job(job_id: str) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"status": "error", "message": f"Unknown job {job_id}"})
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job state, the stages finished so far and, once done, the full analysis."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return unknown_job(job_id)
+    return {"status": "success", "data": job.as_dict()}
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, last_event_id: Optional[int] = Header(None)):
+    """
+    Server-Sent Events: one event per finished stage, then "result" (or "error").
+    Reconnecting clients resume after the Last-Event-ID they received.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return unknown_job(job_id)
+
+    async def events():
+        async for event_id, stage, data in job_queue.events(job, last_event_id or 0):
+            yield sse_event(event_id, stage, data)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/analyze-batch")
+async def analyze_batch_profiles(
+    desired_position: str = Form(...),
+    archive: UploadFile = File(...),
+    chunk_size: int = Form(16)
+):
+    """
+    Analyzes a zip of transcript/resume pairs (see app.batch) and streams one JSON line per student.
+    """
+    try:
+        zf = await run_cpu(zipfile.ZipFile, archive.file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="archive is not a valid zip file") from None
+    try:
+        items = await run_cpu(collect_from_zip, zf)
+    except BaseException:
+        zf.close()
+        raise
+    results = analyze_batch(data_processor, recommendation_engine, items, desired_position, chunk_size)
+    # Sync generator: Starlette iterates it in a worker thread, off the event loop; documents are
+    # read from the archive chunk by chunk, so it is closed only once the stream has ended
+    return StreamingResponse(to_jsonl(results), media_type="application/x-ndjson",
+                             background=BackgroundTask(zf.close))
+
 @app.get("/health")
 async def health_check():
+    """Liveness: the process is up and serving requests."""
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Stage timings, encoder calls, outbound requests per host and cache hit rates (Prometheus format)."""
+    lines = metrics.REGISTRY.render()
+    lines += metrics.outbound_lines(default_client().stats())
+    lines += metrics.cache_lines({
+        "embedding": data_processor.embedding_cache.stats(),
+        "response": recommendation_engine.cache.stats(),
+        "profile": profile_cache.stats(),
+        "github": data_processor.github.stats(),
+        "vacancy_embedding": recommendation_engine.vacancy_ranker.stats(),
+    })
+    if data_processor.github.rate_limit_remaining is not None:
+        lines += metrics.gauge_lines("github_rate_limit_remaining", "GitHub requests left in the current window",
+                                     [({}, data_processor.github.rate_limit_remaining)])
+    jobs = job_queue.stats()
+    lines += metrics.gauge_lines("job_queue_depth", "Analysis jobs waiting for a worker", [({}, jobs["queued"])])
+    lines += metrics.gauge_lines("jobs_running", "Analysis jobs being processed", [({}, jobs["running"])])
+    if data_processor.encode_scheduler is not None:
+        scheduler = data_processor.encode_scheduler.stats()
+        lines += metrics.gauge_lines("encode_queue_depth", "Encode requests waiting for a batch",
+                                     [({}, scheduler["queue_depth"])])
+        lines += metrics.gauge_lines("encode_requests_per_batch", "Average encode requests merged per model call",
+                                     [({}, scheduler["requests_per_batch"])])
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: models are loaded and profile analysis will not block on warm-up."""
+    if data_processor.is_ready:
+        return {"status": "ready"}
+    if data_processor.warmup_error:
+        return JSONResponse(status_code=503, content={"status": "error", "detail": data_processor.warmup_error})
+    return JSONResponse(status_code=503, content={"status": "loading"})
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""
+In-process metrics in the Prometheus text format.
+
+Stages are timed with `timed("stage")`; the durations go to a histogram and, when
+request timings are being collected (see `collect_timings`), to the Server-Timing
+header of the current response.
+"""
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+PREFIX = "advisor_"
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+
+class Registry:
+    """Counters and histograms keyed by name and labels."""
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = DURATION_BUCKETS):
+        with self._lock:
+            self._buckets[name] = buckets
+            self._help[name] = help_text
+            self._histograms.setdefault(name, {})
+
+    def counter(self, name: str, help_text: str):
+        with self._lock:
+            self._help[name] = help_text
+            self._counters.setdefault(name, {})
+
+    def observe(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(self._buckets.get(name, DURATION_BUCKETS))
+            series[key].observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def value(self, name: str, **labels) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> List[str]:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.extend(_header(name, "counter", self._help.get(name)))
+                for labels, value in sorted(series.items()):
+                    lines.append(_sample(name, dict(labels), value))
+            for name, series in sorted(self._histograms.items()):
+                lines.extend(_header(name, "histogram", self._help.get(name)))
+                for labels, histogram in sorted(series.items()):
+                    lines.extend(histogram_samples(
+                        name, dict(labels), histogram.buckets, histogram.counts, histogram.sum, histogram.count
+                    ))
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _sample(name: str, labels: Dict[str, str], value: float) -> str:
+    return f"{PREFIX}{name}{_format_labels(labels)} {value}"
+
+
+def _header(name: str, kind: str, help_text: Optional[str] = None) -> List[str]:
+    lines = [f"# HELP {PREFIX}{name} {help_text}"] if help_text else []
+    return lines + [f"# TYPE {PREFIX}{name} {kind}"]
+
+
+def histogram_samples(name: str, labels: Dict[str, str], buckets: Sequence[float],
+                      counts: Sequence[int], total: float, count: int) -> Iterator[str]:
+    """Cumulative bucket, sum and count lines from per-bucket counts (the last one is +Inf)."""
+    cumulative = 0
+    for bound, bucket_count in zip(list(buckets) + ["+Inf"], counts):
+        cumulative += bucket_count
+        yield _sample(f"{name}_bucket", dict(labels, le=str(bound)), cumulative)
+    yield _sample(f"{name}_sum", labels, float(total))
+    yield _sample(f"{name}_count", labels, count)
+
+
+def gauge_lines(name: str, help_text: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    """Renders values read at scrape time (cache sizes, hit rates, circuit states)."""
+    samples = list(samples)
+    if not samples:
+        return []
+    return _header(name, "gauge", help_text) + [_sample(name, labels, value) for labels, value in samples]
+
+
+def outbound_lines(host_stats: Dict[str, Dict]) -> List[str]:
+    """Per-host request counters and latency histograms from OutboundClient.stats()."""
+    if not host_stats:
+        return []
+    lines: List[str] = []
+    for field in ("requests", "errors", "retries", "rejected"):
+        name = f"outbound_{field}_total"
+        lines.extend(_header(name, "counter"))
+        lines.extend(_sample(name, {"host": host}, stats[field]) for host, stats in sorted(host_stats.items()))
+    name = "outbound_request_duration_seconds"
+    lines.extend(_header(name, "histogram"))
+    for host, stats in sorted(host_stats.items()):
+        buckets = stats["latency_buckets"]
+        bounds = [bound for bound in buckets if bound != "+Inf"]
+        lines.extend(histogram_samples(
+            name, {"host": host}, bounds, list(buckets.values()), stats["latency_sum"], stats["requests"]
+        ))
+    lines.extend(gauge_lines(
+        "outbound_circuit_open", "1 while the host's circuit breaker rejects requests",
+        (({"host": host}, int(stats["circuit"] == "open")) for host, stats in sorted(host_stats.items()))
+    ))
+    return lines
+
+
+def cache_lines(cache_stats: Dict[str, Dict]) -> List[str]:
+    """Hit/miss counters, sizes and hit rates from the caches' stats()."""
+    lines: List[str] = []
+    for field in ("hits", "misses", "stale_hits", "negative_hits", "disk_hits", "evictions"):
+        name = f"cache_{field}_total"
+        samples = [({"cache": cache}, stats[field]) for cache, stats in sorted(cache_stats.items()) if field in stats]
+        if samples:
+            lines.extend(_header(name, "counter"))
+            lines.extend(_sample(name, labels, value) for labels, value in samples)
+    lines.extend(gauge_lines("cache_entries", "Entries currently cached",
+                             (({"cache": cache}, stats["entries"]) for cache, stats in sorted(cache_stats.items()))))
+    lines.extend(gauge_lines("cache_hit_ratio", "Hits per lookup since start",
+                             (({"cache": cache}, stats["hit_rate"]) for cache, stats in sorted(cache_stats.items()))))
+    return lines
+
+
+REGISTRY = Registry()
+REGISTRY.histogram("stage_duration_seconds", "Duration of pipeline stages")
+REGISTRY.histogram("http_request_duration_seconds", "Duration of API requests")
+REGISTRY.histogram("encoder_batch_size", "Texts per sentence encoder call", BATCH_SIZE_BUCKETS)
+REGISTRY.counter("encoder_calls_total", "Sentence encoder calls")
+REGISTRY.counter("encoder_texts_total", "Texts sent to the sentence encoder")
+
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def timed(stage: str):
+    """Times a block into the stage histogram and the current request's timings."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        REGISTRY.observe("stage_duration_seconds", elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+def timed_stage(stage: str):
+    """Decorator form of timed() for plain and async functions."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timed(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_encode(batch_size: int):
+    REGISTRY.inc("encoder_calls_total")
+    REGISTRY.inc("encoder_texts_total", batch_size)
+    REGISTRY.observe("encoder_batch_size", batch_size)
+
+
+@contextmanager
+def collect_timings() -> Iterator[List[Tuple[str, float]]]:
+    """
+    Collects the stages timed in this context, including tasks and executor jobs
+    started from it (they inherit a copy of the context with the same list).
+    """
+    timings: List[Tuple[str, float]] = []
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def server_timing_header(timings: List[Tuple[str, float]]) -> str:
+    """Server-Timing value; repeated stages are summed, in order of first occurrence."""
+    totals: Dict[str, float] = {}
+    for stage, elapsed in timings:
+        totals[stage] = totals.get(stage, 0.0) + elapsed
+    return ", ".join(f"{stage};dur={elapsed * 1000:.1f}" for stage, elapsed in totals.items())
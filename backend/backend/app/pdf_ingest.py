@@ -0,0 +1,142 @@
+import io
+import mmap
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from app import config
+
+
+class PDFLimitError(ValueError):
+    """Raised when an uploaded PDF exceeds the configured size or page limits."""
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# PyMuPDF is not thread-safe: calls into it from this process (e.g. the resume and
+# transcript of one request, parsed in parallel threads) are serialized page by page
+_mupdf_lock = threading.Lock()
+
+
+def _page_pool() -> ProcessPoolExecutor:
+    # Large documents are extracted in parallel by worker processes, which do not share the lock.
+    # "spawn" keeps model weights and threads of the parent out of the workers.
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=config.PDF_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def page_text(page) -> str:
+    return "\n".join([block[4].replace("\n", " ") for block in page.get_text("blocks")])
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    import pymupdf
+    with pymupdf.open(path) as doc:
+        return [page_text(doc[i]) for i in range(start, stop)]
+
+
+@contextmanager
+def _pdf_buffer(pdf_file):
+    """
+    Yields a zero-copy view of the upload: the in-memory buffer of a spooled
+    upload, or an mmap of the file once it has been rolled over to disk.
+    """
+    if isinstance(pdf_file, (bytes, memoryview)):
+        yield memoryview(pdf_file)
+        return
+    raw = getattr(pdf_file, "_file", pdf_file)  # SpooledTemporaryFile wraps BytesIO or a real file
+    if isinstance(raw, io.BytesIO):
+        view = raw.getbuffer()
+        try:
+            yield view
+        finally:
+            view.release()
+        return
+    try:
+        fileno = raw.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        yield memoryview(pdf_file.read())
+        return
+    if os.fstat(fileno).st_size == 0:
+        yield memoryview(b"")
+        return
+    mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    try:
+        yield view
+    finally:
+        view.release()
+        mapped.close()
+
+
+@contextmanager
+def _worker_path(pdf_file, buffer):
+    """
+    Yields a path worker processes can open the upload by: the file itself when it
+    is on disk (unnamed temporary files through /proc on Linux). Only uploads that
+    are still in memory, or platforms without /proc, are written to a temporary file.
+    """
+    raw = getattr(pdf_file, "_file", pdf_file)
+    name = getattr(raw, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        yield name
+        return
+    try:
+        fd_path = f"/proc/{os.getpid()}/fd/{raw.fileno()}"
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fd_path = None
+    if fd_path is not None and os.path.exists(fd_path):
+        yield fd_path
+        return
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+        tmp.write(buffer)
+        tmp.flush()
+        yield tmp.name
+
+
+def iter_pdf_pages(pdf_file) -> Iterator[str]:
+    """
+    Yields the text of each page in order.
+    Documents with at least PDF_PARALLEL_MIN_PAGES pages are extracted by a process
+    pool in page ranges; pages are still yielded as soon as their range is done.
+    """
+    import pymupdf
+    with _pdf_buffer(pdf_file) as buffer:
+        if buffer.nbytes > config.MAX_PDF_BYTES:
+            raise PDFLimitError(f"PDF is larger than {config.MAX_PDF_BYTES} bytes")
+        with _mupdf_lock:
+            doc = pymupdf.open(stream=buffer, filetype="pdf")
+        try:
+            page_count = doc.page_count
+            if page_count > config.MAX_PDF_PAGES:
+                raise PDFLimitError(f"PDF has more than {config.MAX_PDF_PAGES} pages")
+            if page_count < config.PDF_PARALLEL_MIN_PAGES or config.PDF_WORKERS < 2:
+                for i in range(page_count):
+                    # The lock is not held while the consumer works on a page
+                    with _mupdf_lock:
+                        text = page_text(doc[i])
+                    yield text
+                return
+        finally:
+            with _mupdf_lock:
+                doc.close()
+        with _worker_path(pdf_file, buffer) as path:
+            step = config.PDF_PAGES_PER_TASK
+            ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+            pool = _page_pool()
+            futures = [pool.submit(_extract_page_range, path, start, stop) for start, stop in ranges]
+            try:
+                for future in futures:
+                    yield from future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
@@ -0,0 +1,111 @@
+"""
+Position taxonomy: roles with Russian/English aliases and thematic course keywords.
+
+A desired position is resolved to roles in two steps: an alias occurring in it
+as whole words (longest alias wins, e.g. "senior data scientist" -> data scientist), otherwise
+the roles whose aliases are nearest to it in embedding space, scored against
+all aliases at once. Resolutions are memoized per position string.
+"""
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from app import config
+from app.embedding_index import EmbeddingIndex
+from app.keyword_matcher import KeywordMatcher
+from app.response_cache import MemoryBackend
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "data", "positions.json")
+FALLBACK_KEYWORDS = ["python"]
+TOKEN_PATTERN = re.compile(r"[\w+#]+")
+
+
+def normalize_position(text: str) -> str:
+    """Lowercased tokens separated by single spaces and padded with spaces, so aliases match whole words only."""
+    return " " + " ".join(TOKEN_PATTERN.findall(text.lower())) + " "
+
+
+@dataclass
+class Role:
+    name: str
+    aliases: List[str]
+    keywords: List[str]
+
+
+class PositionTaxonomy:
+    def __init__(self, roles: List[Role], encode: Optional[Callable[[List[str]], np.ndarray]] = None,
+                 threshold: float = 0.6, max_roles: int = 2, cache_size: int = 10000):
+        self.roles = roles
+        self.encode = encode
+        self.threshold = threshold
+        self.max_roles = max_roles
+        aliases = [(normalize_position(alias), i) for i, role in enumerate(roles) for alias in [role.name] + role.aliases]
+        self.alias_matcher = KeywordMatcher([alias for alias, _ in aliases], [str(i) for _, i in aliases])
+        # Embedding rows are the aliases of role 0, then role 1, ...
+        self.alias_texts = [alias.strip() for alias, _ in aliases]
+        self.alias_roles = np.array([i for _, i in aliases])
+        self._index: Optional[EmbeddingIndex] = None
+        self._index_lock = threading.Lock()
+        self._resolved = MemoryBackend(cache_size)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, **kwargs) -> "PositionTaxonomy":
+        with open(path or DEFAULT_TAXONOMY_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        roles = [Role(r["role"], r.get("aliases", []), r["keywords"]) for r in data["roles"]]
+        return cls(roles, **kwargs)
+
+    @property
+    def index(self) -> EmbeddingIndex:
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = EmbeddingIndex(self.alias_texts, self.encode)
+        return self._index
+
+    def _alias_role(self, normalized: str) -> Optional[int]:
+        best = None
+        for _, i in self.alias_matcher.iter_matches(normalized):
+            if best is None or len(self.alias_matcher.keywords[i]) > len(self.alias_matcher.keywords[best]):
+                best = i
+        return None if best is None else int(self.alias_matcher.labels[best])
+
+    def _nearest_roles(self, normalized: str) -> List[int]:
+        sims = self.index.score_texts([normalized.strip()])[0]
+        # Best alias score per role, then roles above the threshold, nearest first
+        scores = np.full(len(self.roles), -1.0)
+        np.maximum.at(scores, self.alias_roles, sims)
+        order = np.argsort(-scores, kind="stable")[:self.max_roles]
+        return [int(i) for i in order if scores[i] >= self.threshold]
+
+    def resolve(self, position: str) -> List[Role]:
+        """Roles for a desired position (empty when nothing matches)."""
+        normalized = normalize_position(position)
+        cached = self._resolved.get(normalized)
+        if cached is None:
+            role = self._alias_role(normalized)
+            if role is not None:
+                cached = [role]
+            elif self.encode is not None and normalized.strip():
+                cached = self._nearest_roles(normalized)
+            else:
+                cached = []
+            self._resolved.set(normalized, cached)
+        return [self.roles[i] for i in cached]
+
+    def keywords(self, position: str) -> List[str]:
+        """Thematic keywords of the resolved roles, in role order (empty when nothing matches)."""
+        return list(dict.fromkeys(kw for role in self.resolve(position) for kw in role.keywords))
+
+
+def build_position_taxonomy(encode: Optional[Callable[[List[str]], np.ndarray]] = None) -> PositionTaxonomy:
+    """The taxonomy described by app.config (the bundled roles unless POSITION_TAXONOMY_PATH is set)."""
+    return PositionTaxonomy.load(
+        config.POSITION_TAXONOMY_PATH, encode=encode,
+        threshold=config.POSITION_MATCH_THRESHOLD, max_roles=config.POSITION_MAX_ROLES,
+    )
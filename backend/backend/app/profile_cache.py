@@ -0,0 +1,70 @@
+import hashlib
+import threading
+from typing import Dict, Optional
+
+from app import config
+from app.encoders import encoder_id
+from app.response_cache import MemoryBackend, SQLiteBackend
+
+# Bump whenever extraction output changes so stale analyses are not served
+PIPELINE_VERSION = "1"
+
+
+def file_digest(fileobj, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of an uploaded file, read in chunks; the file position is restored."""
+    position = fileobj.tell()
+    fileobj.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+        digest.update(chunk)
+    fileobj.seek(position)
+    return digest.hexdigest()
+
+
+class ProfileCache:
+    """
+    Per-document analysis results (extracted text, skills, education, structured
+    sections) keyed by document kind, content hash, model and pipeline version.
+    Uses the same size-bounded backends as the response cache.
+    """
+
+    def __init__(self, backend=None, model_name: Optional[str] = None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.model_name = model_name or encoder_id()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, kind: str, digest: str) -> str:
+        return f"{kind}:{self.model_name}:{PIPELINE_VERSION}:{digest}"
+
+    def get(self, kind: str, digest: str) -> Optional[Dict]:
+        entry = self.backend.get(self.key(kind, digest))
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def set(self, kind: str, digest: str, analysis: Dict):
+        self.backend.set(self.key(kind, digest), analysis)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.backend),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def build_profile_cache() -> ProfileCache:
+    """Creates the profile cache described by app.config (SQLite-backed when a path is set)."""
+    if config.PROFILE_CACHE_PATH:
+        backend = SQLiteBackend(config.PROFILE_CACHE_PATH, config.PROFILE_CACHE_SIZE, table="profile_cache")
+    else:
+        backend = MemoryBackend(config.PROFILE_CACHE_SIZE)
+    return ProfileCache(backend)
@@ -1,119 +1,267 @@
-import requests
-from typing import Dict, List
-import json
-import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+import numpy as np
+from app import config
+from app.course_catalog import LocalCatalog, build_course_catalog, classify_course, level_allows
+from app.cpu_pool import run_cpu
+from app.encoders import encoder_id
+from app.http_client import OutboundClient, default_client
+from app.keyword_matcher import compile_keywords
+from app.metrics import timed_stage
+from app.position_taxonomy import FALLBACK_KEYWORDS, build_position_taxonomy
+from app.response_cache import ResponseCache, build_response_cache
+from app.vacancy_ranking import VacancyRanker
+from app.vacancy_store import LEVEL_PREFIXES, LocalVacancies, build_vacancy_store, parse_vacancies, vacancy_search_text
+
+MAX_COURSES = 5
+MAX_VACANCIES = 5
 
 class RecommendationEngine:
-    def __init__(self):
-        self.stepik_api_url = "https://stepik.org/api/courses"
-        self.hh_api_url = "https://api.hh.ru/vacancies"
+    def __init__(self,
+                 search_concurrency: Optional[int] = None,
+                 cache: Optional[ResponseCache] = None,
+                 http: Optional[OutboundClient] = None,
+                 catalog: Optional[LocalCatalog] = None,
+                 encode: Optional[Callable[[List[str]], np.ndarray]] = None,
+                 vacancy_store: Optional[LocalVacancies] = None):
+        self.stepik_api_url = config.STEPIK_API_URL
+        self.hh_api_url = config.HH_API_URL
         self.hh_area = 113  # Russia
+        self.http = http if http is not None else default_client()
+        # Max Stepik keyword searches in flight (1 = sequential); the sync path shares one pool
+        self.search_concurrency = max(1, search_concurrency or config.STEPIK_SEARCH_CONCURRENCY)
+        self._search_pool = ThreadPoolExecutor(max_workers=self.search_concurrency, thread_name_prefix="stepik")
+        # Stepik/hh.ru responses keyed by normalized query parameters
+        self.cache = cache if cache is not None else build_response_cache()
+        # With a local catalog, courses are looked up in memory instead of searching Stepik;
+        # encode (normalized embeddings) ranks them against the user's skills
+        self.catalog = catalog if catalog is not None else build_course_catalog()
+        self.encode = encode
+        # Desired positions are resolved to roles by alias, or by embedding similarity with encode
+        self.positions = build_position_taxonomy(encode)
+        # hh.ru returns a larger page that is ranked against the skills when encode is available
+        self.vacancy_ranker = VacancyRanker(encode, config.VACANCY_EMBEDDING_CACHE_SIZE) if encode is not None else None
+        # With a local vacancy store, vacancies come from the ingestion worker's last poll
+        self.vacancy_store = vacancy_store if vacancy_store is not None else build_vacancy_store()
 
-    def is_russian(self, text):
-        cyrillic = len(re.findall(r'[а-яА-ЯёЁ]', text))
-        latin = len(re.findall(r'[a-zA-Z]', text))
-        return cyrillic > latin and cyrillic > 0
+    def _stepik_payload(self, data: Dict) -> Dict:
+        # Кэшируем только поля, нужные для фильтрации
+        return {"courses": [
+            {"id": c.get("id"), "title": c.get("title"), "summary": c.get("summary", "")}
+            for c in data.get("courses", [])
+        ]}
 
-    def is_english(self, text):
-        latin = len(re.findall(r'[a-zA-Z]', text))
-        cyrillic = len(re.findall(r'[а-яА-ЯёЁ]', text))
-        return latin > cyrillic and latin > 0
+    def _fetch_stepik(self, params: Dict) -> Dict:
+        resp = self.http.get(self.stepik_api_url, params=params, timeout=5)
+        resp.raise_for_status()
+        return self._stepik_payload(resp.json())
 
-    def is_kazakh(self, text):
-        kazakh_letters = "әғқңөұүһі"
-        return any(ch in text for ch in kazakh_letters)
+    async def _fetch_stepik_async(self, params: Dict) -> Dict:
+        resp = await self.http.aget(self.stepik_api_url, params=params, timeout=5)
+        resp.raise_for_status()
+        return self._stepik_payload(resp.json())
 
     def _search_and_filter(self, query: str, level: str = None, lang: str = 'ru') -> List[Dict]:
         params = {"search": query, "is_public": "true"}
         try:
-            resp = requests.get(self.stepik_api_url, params=params, timeout=5)
-            resp.raise_for_status()
-            data = resp.json()
-            results = []
-            exclude_keywords = [
-                "введение", "beginner", "основы", "для начинающих", "introduction",
-                "егэ", "школьный", "с нуля", "новичок"
-            ]
-            include_keywords = [
-                "data science", "machine learning", "deep learning", "statistics", "analysis",
-                "python", "ml", "ai", "specialization", "advanced", "pro", "expert", "intermediate"
-            ]
-            for course in data.get("courses", []):
-                title = (course.get("title") or "").lower()
-                summary = (course.get("summary") or "").lower()
-                # Языковой фильтр: только русский или английский, исключая казахский
-                if self.is_kazakh(title + summary):
-                    continue
-                if not (self.is_russian(title + summary) or self.is_english(title + summary)):
-                    continue
-                # Фильтрация по уровню
-                if level in ["intermediate", "advanced"]:
-                    if any(kw in title or kw in summary for kw in exclude_keywords):
-                        continue
-                    if not any(kw in title or kw in summary for kw in include_keywords):
-                        continue
-                if level == "beginner":
-                    if not any(kw in title or kw in summary for kw in exclude_keywords):
-                        continue
-                results.append({
-                    "title": course.get("title"),
-                    "url": f'https://stepik.org/course/{course.get("id")}',
-                    "summary": course.get("summary", "")
-                })
-                if len(results) >= 5:
-                    break
-            return results
-        except Exception as e:
+            data = self.cache.get_or_fetch("stepik", params, lambda: self._fetch_stepik(params))
+            return self._filter_courses(data, level)
+        except Exception:
+            return []
+
+    async def _search_and_filter_async(self, query: str, level: str = None) -> List[Dict]:
+        params = {"search": query, "is_public": "true"}
+        try:
+            data = await self.cache.get_or_fetch_async(
+                "stepik", params, lambda: self._fetch_stepik_async(params)
+            )
+            return self._filter_courses(data, level)
+        except Exception:
             return []
 
+    def _filter_courses(self, data: Dict, level: str = None) -> List[Dict]:
+        results = []
+        for course in data.get("courses", []):
+            flags = classify_course(course.get("title") or "", course.get("summary") or "")
+            # Языковой фильтр: только русский или английский, исключая казахский
+            if flags["language"] not in ("ru", "en"):
+                continue
+            # Фильтрация по уровню
+            if not level_allows(flags, level):
+                continue
+            results.append({
+                "title": course.get("title"),
+                "url": f'https://stepik.org/course/{course.get("id")}',
+                "summary": course.get("summary", "")
+            })
+            if len(results) >= 5:
+                break
+        return results
+
     def get_position_keywords(self, position: str) -> List[str]:
-        position = position.lower()
-        if "data scientist" in position or "data science" in position:
-            return [
-                "data science", "machine learning", "ml", "deep learning", "нейронные сети", "статистика",
-                "анализ данных", "big data", "pandas", "numpy", "scikit-learn", "regression", "classification",
-                "clustering", "ai", "data analysis", "data visualization", "matplotlib", "feature engineering",
-                "kaggle", "data mining", "time series", "nlp", "natural language processing", "tensorflow", "pytorch"
-            ]
-        # Можно добавить другие позиции и их ключевые слова
-        return []
+        # Роли и их ключевые слова задаются в app/data/positions.json
+        return self.positions.keywords(position)
 
-    def get_stepik_courses(self, query: str, level: str, skills: List[str], position: str) -> List[Dict]:
-        if level == "advanced":
-            return []
+    def _course_search_keywords(self, skills: List[str], position: str):
         thematic_keywords = self.get_position_keywords(position)
         if not thematic_keywords:
-            thematic_keywords = ["python"]  # fallback
-        search_keywords = [kw for kw in skills if kw in thematic_keywords]
+            thematic_keywords = FALLBACK_KEYWORDS
+        thematic_set = set(thematic_keywords)
+        search_keywords = [kw for kw in skills if kw in thematic_set]
         if not search_keywords:
             search_keywords = thematic_keywords
-        results = []
-        for kw in search_keywords:
-            found = self._search_and_filter(kw, level)
-            # Фильтруем только курсы, где есть тематические слова для позиции
-            filtered = [c for c in found if any(dk in (c['title'] or '').lower() or dk in (c['summary'] or '').lower() for dk in thematic_keywords)]
-            results.extend(filtered)
-            if len(results) >= 5:
-                break
-        return results[:5]
+        return thematic_keywords, search_keywords
+
+    def _thematic_courses(self, found: List[Dict], thematic_keywords: List[str]) -> List[Dict]:
+        # Фильтруем только курсы, где есть тематические слова для позиции
+        thematic = compile_keywords(tuple(thematic_keywords))
+        return [c for c in found if thematic.search((c['title'] or '').lower()) or thematic.search((c['summary'] or '').lower())]
+
+    def _merge_courses(self, results: List[Dict], seen: Set[str], found: List[Dict], thematic_keywords: List[str]):
+        # Курсы из разных поисковых запросов могут повторяться: оставляем первое вхождение
+        for course in self._thematic_courses(found, thematic_keywords):
+            if course["url"] not in seen:
+                seen.add(course["url"])
+                results.append(course)
+
+    def _catalog_courses(self, level: str, skills: List[str], position: str) -> List[Dict]:
+        thematic_keywords, search_keywords = self._course_search_keywords(skills, position)
+        index = self.catalog.index()
+        found = index.find(search_keywords, thematic_keywords, level)
+        if self.encode is not None and len(found) > MAX_COURSES and index.model == encoder_id():
+            query = self.encode(list(skills) + [position]).mean(axis=0)
+            found = index.rank(found, query / (np.linalg.norm(query) or 1.0))
+        return [index.courses[i].as_result() for i in found[:MAX_COURSES]]
 
-    def get_hh_vacancies(self, position: str, level: str) -> List[Dict]:
-        params = {"text": position, "area": self.hh_area, "per_page": 5}
+    @timed_stage("stepik_courses")
+    def get_stepik_courses(self, query: str, level: str, skills: List[str], position: str) -> List[Dict]:
+        """
+        Searches Stepik for each keyword in parallel (up to search_concurrency at a time).
+        Results are merged in keyword-priority order; remaining searches are
+        cancelled once enough courses are collected. With a local catalog the
+        courses are found in memory and ranked by similarity to the skills instead.
+        """
+        if level == "advanced":
+            return []
+        if self.catalog is not None:
+            return self._catalog_courses(level, skills, position)
+        thematic_keywords, search_keywords = self._course_search_keywords(skills, position)
+        results, seen = [], set()
+        futures = [self._search_pool.submit(self._search_and_filter, kw, level) for kw in search_keywords]
         try:
-            resp = requests.get(self.hh_api_url, params=params, timeout=5)
-            resp.raise_for_status()
-            data = resp.json()
-            results = []
-            for item in data.get("items", [])[:5]:
-                results.append({
-                    "name": item.get("name"),
-                    "url": item.get("alternate_url"),
-                    "snippet": item.get("snippet", {}).get("requirement", "")
-                })
-            return results
+            for future in futures:
+                self._merge_courses(results, seen, future.result(), thematic_keywords)
+                if len(results) >= MAX_COURSES:
+                    break
+        finally:
+            for future in futures:
+                future.cancel()
+        return results[:MAX_COURSES]
+
+    @timed_stage("stepik_courses")
+    async def get_stepik_courses_async(self, level: str, skills: List[str], position: str) -> List[Dict]:
+        """Non-blocking variant of get_stepik_courses."""
+        if level == "advanced":
+            return []
+        if self.catalog is not None:
+            # Index lookups and the query embedding are CPU work: keep them off the event loop
+            return await run_cpu(self._catalog_courses, level, skills, position)
+        # Positions without an alias are resolved with the encoder (and may build the alias index)
+        thematic_keywords, search_keywords = await run_cpu(self._course_search_keywords, skills, position)
+        semaphore = asyncio.Semaphore(self.search_concurrency)
+
+        async def search(kw: str) -> List[Dict]:
+            async with semaphore:
+                return await self._search_and_filter_async(kw, level)
+
+        results, seen = [], set()
+        tasks = [asyncio.ensure_future(search(kw)) for kw in search_keywords]
+        try:
+            for task in tasks:
+                self._merge_courses(results, seen, await task, thematic_keywords)
+                if len(results) >= MAX_COURSES:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        return results[:MAX_COURSES]
+
+    def _fetch_hh(self, params: Dict) -> List[Dict]:
+        resp = self.http.get(self.hh_api_url, params=params, timeout=5)
+        resp.raise_for_status()
+        return parse_vacancies(resp.json())
+
+    async def _fetch_hh_async(self, params: Dict) -> List[Dict]:
+        resp = await self.http.aget(self.hh_api_url, params=params, timeout=5)
+        resp.raise_for_status()
+        return parse_vacancies(resp.json())
+
+    def _hh_params(self, position: str) -> Dict:
+        per_page = config.HH_RANK_POOL if self.vacancy_ranker is not None else MAX_VACANCIES
+        return {"text": position, "area": self.hh_area, "per_page": per_page}
+
+    @timed_stage("vacancy_ranking")
+    def _top_vacancies(self, vacancies: List[Dict], skills: Optional[List[str]],
+                       embeddings: Optional[np.ndarray] = None) -> List[Dict]:
+        if self.vacancy_ranker is not None:
+            vacancies = self.vacancy_ranker.rank(vacancies, skills or [], MAX_VACANCIES, embeddings)
+        return [{key: v[key] for key in ("name", "url", "snippet")} for v in vacancies[:MAX_VACANCIES]]
+
+    def _stored_vacancies(self, position: str, level: str, skills: Optional[List[str]]) -> Optional[List[Dict]]:
+        """Top vacancies from the store for the position's roles (None when it has none of them)."""
+        index = self.vacancy_store.index()
+        # The position arrives as the hh.ru search text ("junior data scientist"); roles are resolved without the prefix
+        prefix = LEVEL_PREFIXES.get(level)
+        if prefix and position.startswith(prefix + " "):
+            position = position[len(prefix) + 1:]
+        rows = index.lookup([vacancy_search_text(role.name, level) for role in self.positions.resolve(position)])
+        if not rows:
+            return None
+        embeddings = None
+        if index.embeddings is not None and index.model == encoder_id():
+            embeddings = index.embeddings[rows]
+        return self._top_vacancies([index.vacancies[i] for i in rows], skills, embeddings)
+
+    @timed_stage("hh_vacancies")
+    def get_hh_vacancies(self, position: str, level: str, skills: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Vacancies for the position; with an encoder, a larger page is fetched and the
+        vacancies closest to the skills are returned. With a vacancy store, hh.ru is
+        only queried for positions the store has no vacancies for.
+        """
+        if self.vacancy_store is not None:
+            stored = self._stored_vacancies(position, level, skills)
+            if stored is not None or not config.VACANCY_LIVE_FALLBACK:
+                return stored or []
+        params = self._hh_params(position)
+        try:
+            vacancies = self.cache.get_or_fetch("hh", params, lambda: self._fetch_hh(params))
         except Exception as e:
             return [{"error": f"hh.ru API error: {str(e)}"}]
+        return self._top_vacancies(vacancies, skills)
 
+    @timed_stage("hh_vacancies")
+    async def get_hh_vacancies_async(self, position: str, level: str, skills: Optional[List[str]] = None) -> List[Dict]:
+        if self.vacancy_store is not None:
+            stored = await run_cpu(self._stored_vacancies, position, level, skills)
+            if stored is not None or not config.VACANCY_LIVE_FALLBACK:
+                return stored or []
+        params = self._hh_params(position)
+        try:
+            vacancies = await self.cache.get_or_fetch_async("hh", params, lambda: self._fetch_hh_async(params))
+        except Exception as e:
+            return [{"error": f"hh.ru API error: {str(e)}"}]
+        if self.vacancy_ranker is None:
+            return self._top_vacancies(vacancies, skills)
+        return await run_cpu(self._top_vacancies, vacancies, skills)
+
+    def _vacancy_query(self, desired_position: str, experience_level: str):
+        level = experience_level.lower() if experience_level in ("Beginner", "Intermediate") else "advanced"
+        kind = "internships" if level == "beginner" else "jobs"
+        return kind, vacancy_search_text(desired_position, level), level
+
+    @timed_stage("recommendations")
     def get_recommendations(self, 
                           desired_position: str,
                           experience_level: str,
@@ -126,16 +274,30 @@ class RecommendationEngine:
         recommendations["courses"] = self.get_stepik_courses(
             desired_position, experience_level.lower(), skills, desired_position
         )
-        if experience_level == "Beginner":
-            recommendations["internships"] = self.get_hh_vacancies(
-                f"intern {desired_position}", "beginner"
-            )
-        elif experience_level == "Intermediate":
-            recommendations["jobs"] = self.get_hh_vacancies(
-                f"junior {desired_position}", "intermediate"
-            )
-        else:  # Advanced
-            recommendations["jobs"] = self.get_hh_vacancies(
-                desired_position, "advanced"
-            )
-        return recommendations
\ No newline at end of file
+        kind, query, level = self._vacancy_query(desired_position, experience_level)
+        recommendations[kind] = self.get_hh_vacancies(query, level, skills)
+        return recommendations
+
+    @timed_stage("recommendations")
+    async def get_recommendations_async(self,
+                                        desired_position: str,
+                                        experience_level: str,
+                                        skills: List[str]) -> Dict:
+        """
+        Same as get_recommendations, with the Stepik and hh.ru lookups running concurrently.
+        """
+        recommendations = {
+            "courses": [],
+            "internships": [],
+            "jobs": []
+        }
+        kind, query, level = self._vacancy_query(desired_position, experience_level)
+        recommendations["courses"], recommendations[kind] = await asyncio.gather(
+            self.get_stepik_courses_async(experience_level.lower(), skills, desired_position),
+            self.get_hh_vacancies_async(query, level, skills),
+        )
+        return recommendations
+
+    def close(self):
+        """Stops the Stepik search pool (searches still queued are dropped)."""
+        self._search_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,258 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app import config
+
+
+class CachedUpstreamError(Exception):
+    """Raised when a recent upstream failure is served from the negative cache."""
+
+
+class MemoryBackend:
+    """In-process LRU store for cache entries."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Dict):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """
+    File-backed store shared by all worker processes on a host.
+    Entries are JSON-encoded; the oldest entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000, table: str = "response_cache"):
+        self.path = path
+        self.max_entries = max_entries
+        self.table = table
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, entry TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_stored_at ON {table} (stored_at)")
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT entry FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, entry: Dict):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, entry, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(entry, ensure_ascii=False), time.time()),
+            )
+            self._writes += 1
+            # Trimming scans the table, so it is amortized over many writes
+            if self._writes % 100 == 0:
+                self._trim()
+
+    def _trim(self):
+        self._conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} "
+            "ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+def normalize_params(params: Dict[str, Any]) -> str:
+    """Canonical form of query parameters: sorted keys, trimmed lowercase strings."""
+    normalized = {}
+    for name, value in params.items():
+        if isinstance(value, str):
+            value = " ".join(value.lower().split())
+        normalized[name] = value
+    return json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+
+class ResponseCache:
+    """
+    TTL cache for upstream API responses, keyed by source and normalized query parameters.
+
+    - fresh entries are served directly (per-source TTL);
+    - entries up to stale_ttl past expiry are served while a refresh runs in the background;
+    - failures are cached for error_ttl and re-raised as CachedUpstreamError.
+    """
+
+    def __init__(self,
+                 backend=None,
+                 ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 3600,
+                 stale_ttl: float = 600,
+                 error_ttl: float = 30,
+                 clock: Callable[[], float] = time.time):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.error_ttl = error_ttl
+        self.clock = clock
+        self.hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._refreshing = set()
+        self._tasks = set()
+        self._lock = threading.Lock()
+
+    def key(self, source: str, params: Dict[str, Any]) -> str:
+        return f"{source}:{normalize_params(params)}"
+
+    def _lookup(self, source: str, key: str):
+        """Returns (entry, state) where state is 'fresh', 'stale' or None."""
+        entry = self.backend.get(key)
+        if entry is None:
+            return None, None
+        age = self.clock() - entry["stored_at"]
+        if entry.get("error") is not None:
+            return (entry, "fresh") if age < self.error_ttl else (None, None)
+        ttl = self.ttls.get(source, self.default_ttl)
+        if age < ttl:
+            return entry, "fresh"
+        if age < ttl + self.stale_ttl:
+            return entry, "stale"
+        return None, None
+
+    def _serve(self, entry: Dict, state: str):
+        with self._lock:
+            if entry.get("error") is not None:
+                self.negative_hits += 1
+            elif state == "stale":
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+        if entry.get("error") is not None:
+            raise CachedUpstreamError(entry["error"])
+        return entry["value"]
+
+    def _store(self, key: str, value: Any = None, error: Optional[str] = None):
+        self.backend.set(key, {"value": value, "error": error, "stored_at": self.clock()})
+
+    def _claim_refresh(self, key: str) -> bool:
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _release_refresh(self, key: str):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def get_or_fetch(self, source: str, params: Dict[str, Any], fetch: Callable[[], Any]) -> Any:
+        key = self.key(source, params)
+        entry, state = self._lookup(source, key)
+        if entry is not None:
+            if state == "stale" and self._claim_refresh(key):
+                threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+            return self._serve(entry, state)
+        with self._lock:
+            self.misses += 1
+        try:
+            value = fetch()
+        except Exception as e:
+            self._store(key, error=str(e))
+            raise
+        self._store(key, value)
+        return value
+
+    def _refresh(self, key: str, fetch: Callable[[], Any]):
+        try:
+            self._store(key, fetch())
+        except Exception:
+            pass  # keep serving the stale value until it expires
+        finally:
+            self._release_refresh(key)
+
+    async def get_or_fetch_async(self, source: str, params: Dict[str, Any], fetch: Callable[[], Awaitable[Any]]) -> Any:
+        key = self.key(source, params)
+        entry, state = self._lookup(source, key)
+        if entry is not None:
+            if state == "stale" and self._claim_refresh(key):
+                task = asyncio.ensure_future(self._refresh_async(key, fetch))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return self._serve(entry, state)
+        with self._lock:
+            self.misses += 1
+        try:
+            value = await fetch()
+        except Exception as e:
+            self._store(key, error=str(e))
+            raise
+        self._store(key, value)
+        return value
+
+    async def _refresh_async(self, key: str, fetch: Callable[[], Awaitable[Any]]):
+        try:
+            self._store(key, await fetch())
+        except Exception:
+            pass
+        finally:
+            self._release_refresh(key)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.negative_hits + self.misses
+            return {
+                "entries": len(self.backend),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+            }
+
+
+def build_response_cache() -> ResponseCache:
+    """Creates the response cache described by app.config (SQLite-backed when a path is set)."""
+    if config.RESPONSE_CACHE_PATH:
+        backend = SQLiteBackend(config.RESPONSE_CACHE_PATH, config.RESPONSE_CACHE_SIZE)
+    else:
+        backend = MemoryBackend(config.RESPONSE_CACHE_SIZE)
+    return ResponseCache(
+        backend,
+        ttls={"stepik": config.STEPIK_CACHE_TTL, "hh": config.HH_CACHE_TTL},
+        stale_ttl=config.RESPONSE_CACHE_STALE_TTL,
+        error_ttl=config.RESPONSE_CACHE_ERROR_TTL,
+    )
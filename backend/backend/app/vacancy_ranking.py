@@ -0,0 +1,81 @@
+import hashlib
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.response_cache import MemoryBackend
+
+HIGHLIGHT_PATTERN = re.compile(r"</?highlighttext>")
+
+
+def vacancy_text(vacancy: Dict) -> str:
+    """Title and requirement snippet, without hh.ru's search highlighting."""
+    return HIGHLIGHT_PATTERN.sub("", f"{vacancy.get('name') or ''}. {vacancy.get('snippet') or ''}")
+
+
+class VacancyRanker:
+    """
+    Orders vacancies by similarity to a profile's skills. Vacancy embeddings are
+    kept by hh.ru vacancy id (re-encoded only if the vacancy text changed), and
+    the ones not seen yet are encoded together in one call.
+    """
+
+    def __init__(self, encode: Callable[[List[str]], np.ndarray], cache_size: int = 20000):
+        self.encode = encode
+        self.cache = MemoryBackend(cache_size)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def embeddings(self, vacancies: List[Dict]) -> np.ndarray:
+        texts = [vacancy_text(v) for v in vacancies]
+        digests = [hashlib.sha1(text.encode("utf-8")).hexdigest() for text in texts]
+        rows: List[Optional[np.ndarray]] = []
+        missing = []
+        for i, (vacancy, digest) in enumerate(zip(vacancies, digests)):
+            entry = self.cache.get(str(vacancy["id"])) if vacancy.get("id") is not None else None
+            if entry is not None and entry["digest"] == digest:
+                rows.append(entry["embedding"])
+            else:
+                rows.append(None)
+                missing.append(i)
+        with self._lock:
+            self.hits += len(vacancies) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            encoded = self.encode([texts[i] for i in missing])
+            for i, embedding in zip(missing, encoded):
+                rows[i] = embedding
+                if vacancies[i].get("id") is not None:
+                    self.cache.set(str(vacancies[i]["id"]), {"digest": digests[i], "embedding": embedding})
+        return np.vstack(rows)
+
+    def rank(self, vacancies: List[Dict], skills: List[str], k: int,
+             embeddings: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        The k vacancies closest to the mean skill embedding, best first (the first k without skills).
+        Precomputed vacancy embeddings (e.g. from the vacancy store) skip the cache and encoder.
+        """
+        if not skills or len(vacancies) <= 1:
+            return vacancies[:k]
+        profile = self.encode(list(skills)).mean(axis=0)
+        profile /= np.linalg.norm(profile) or 1.0
+        scores = (embeddings if embeddings is not None else self.embeddings(vacancies)) @ profile
+        if len(vacancies) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(vacancies))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [vacancies[i] for i in top]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,153 @@
+"""
+Local store of hh.ru vacancies filled by the ingestion worker (python -m app.ingestion).
+
+Vacancies are kept per search query (one per taxonomy role and experience level),
+with first-seen/last-seen timestamps and embeddings computed only for new or
+edited vacancies. With VACANCY_STORE_PATH set, RecommendationEngine serves
+vacancies from an in-memory snapshot of the store instead of calling hh.ru.
+"""
+import hashlib
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app import config
+from app.local_store import SQLiteStore, StoreSnapshot, stack_embeddings
+from app.vacancy_ranking import vacancy_text
+
+# Search prefix per experience level, as used for live hh.ru queries
+LEVEL_PREFIXES = {"beginner": "intern", "intermediate": "junior", "advanced": ""}
+
+
+def vacancy_search_text(position: str, level: str) -> str:
+    return f"{LEVEL_PREFIXES.get(level, '')} {position}".strip()
+
+
+def parse_vacancies(data: Dict) -> List[Dict]:
+    return [
+        {
+            "id": item.get("id"),
+            "name": item.get("name"),
+            "url": item.get("alternate_url"),
+            "snippet": (item.get("snippet") or {}).get("requirement", "")
+        }
+        for item in data.get("items", [])
+    ]
+
+
+class VacancyStore(SQLiteStore):
+    table = "vacancies"
+    meta_table = "vacancy_meta"
+    text_columns = "name, snippet"
+
+    def create_tables(self):
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vacancies (id TEXT PRIMARY KEY, name TEXT, url TEXT, snippet TEXT, "
+            "digest TEXT NOT NULL, embedding BLOB, first_seen REAL NOT NULL, updated_at REAL NOT NULL, "
+            "seen_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vacancy_queries (query TEXT NOT NULL, vacancy_id TEXT NOT NULL, "
+            "seen_at REAL NOT NULL, PRIMARY KEY (query, vacancy_id))"
+        )
+
+    def embedding_input(self, name: str, snippet: str) -> str:
+        return vacancy_text({"name": name, "snippet": snippet})
+
+    def upsert(self, query: str, vacancies: Iterable[Dict], now: Optional[float] = None) -> int:
+        """Stores the vacancies a query returned; returns how many were new or edited."""
+        now = time.time() if now is None else now
+        changed = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            for vacancy in vacancies:
+                if vacancy.get("id") is None:
+                    continue
+                vacancy_id = str(vacancy["id"])
+                digest = hashlib.sha1(vacancy_text(vacancy).encode("utf-8")).hexdigest()
+                row = self._conn.execute("SELECT digest FROM vacancies WHERE id = ?", (vacancy_id,)).fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO vacancies (id, name, url, snippet, digest, embedding, first_seen, updated_at, "
+                        "seen_at) VALUES (?, ?, ?, ?, ?, NULL, ?, ?, ?)",
+                        (vacancy_id, vacancy["name"], vacancy["url"], vacancy["snippet"], digest, now, now, now),
+                    )
+                    self._record_change(vacancy_id, "insert", now)
+                    changed += 1
+                elif row[0] != digest:
+                    self._conn.execute(
+                        "UPDATE vacancies SET name = ?, url = ?, snippet = ?, digest = ?, embedding = NULL, "
+                        "updated_at = ?, seen_at = ? WHERE id = ?",
+                        (vacancy["name"], vacancy["url"], vacancy["snippet"], digest, now, now, vacancy_id),
+                    )
+                    self._record_change(vacancy_id, "update", now)
+                    changed += 1
+                else:
+                    self._conn.execute("UPDATE vacancies SET seen_at = ? WHERE id = ?", (now, vacancy_id))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO vacancy_queries (query, vacancy_id, seen_at) VALUES (?, ?, ?)",
+                    (query, vacancy_id, now),
+                )
+            self._conn.execute("COMMIT")
+        return changed
+
+    def purge(self, max_age: float, now: Optional[float] = None) -> int:
+        """Deletes vacancies no query has returned for max_age seconds (closed or expired)."""
+        cutoff = (time.time() if now is None else now) - max_age
+        with self._lock:
+            self._conn.execute("BEGIN")
+            ids = [row[0] for row in self._conn.execute("SELECT id FROM vacancies WHERE seen_at < ?", (cutoff,))]
+            for vacancy_id in ids:
+                self._conn.execute("DELETE FROM vacancies WHERE id = ?", (vacancy_id,))
+                self._record_change(vacancy_id, "delete", cutoff + max_age)
+            self._conn.execute("DELETE FROM vacancy_queries WHERE seen_at < ?", (cutoff,))
+            self._conn.execute("COMMIT")
+        return len(ids)
+
+    def rows(self) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT q.query, v.id, v.name, v.url, v.snippet, v.embedding FROM vacancy_queries q "
+                "JOIN vacancies v ON v.id = q.vacancy_id ORDER BY q.query, v.first_seen DESC, v.id"
+            ).fetchall()
+
+
+class VacancyIndex:
+    """Stored vacancies grouped by search query, with their embedding matrix when complete."""
+
+    def __init__(self, vacancies: List[Dict], by_query: Dict[str, List[int]],
+                 embeddings: Optional[np.ndarray] = None, model: Optional[str] = None):
+        self.vacancies = vacancies
+        self.by_query = by_query
+        self.embeddings = embeddings
+        self.model = model
+
+    @classmethod
+    def from_store(cls, store: VacancyStore) -> "VacancyIndex":
+        vacancies, blobs, rows_by_id, by_query = [], [], {}, {}
+        for query, vacancy_id, name, url, snippet, embedding in store.rows():
+            if vacancy_id not in rows_by_id:
+                rows_by_id[vacancy_id] = len(vacancies)
+                vacancies.append({"id": vacancy_id, "name": name, "url": url, "snippet": snippet})
+                blobs.append(embedding)
+            by_query.setdefault(query, []).append(rows_by_id[vacancy_id])
+        return cls(vacancies, by_query, stack_embeddings(blobs), store.get_meta("encoder"))
+
+    def lookup(self, queries: List[str]) -> List[int]:
+        """Rows stored for any of the queries, newest first per query, without duplicates."""
+        return list(dict.fromkeys(i for query in queries for i in self.by_query.get(query, [])))
+
+
+class LocalVacancies(StoreSnapshot):
+    """The VacancyIndex of a vacancy store, rebuilt after each ingestion round."""
+
+    def __init__(self, store: VacancyStore, reload_interval: float = 60):
+        super().__init__(store, VacancyIndex.from_store, reload_interval)
+
+
+def build_vacancy_store() -> Optional[LocalVacancies]:
+    """The local vacancies described by app.config (None: query hh.ru per request)."""
+    if not config.VACANCY_STORE_PATH:
+        return None
+    return LocalVacancies(VacancyStore(config.VACANCY_STORE_PATH), config.VACANCY_STORE_RELOAD)
@@ -0,0 +1 @@
+"""Offline benchmarks for the profile analysis pipeline (see benchmarks.run)."""
@@ -0,0 +1,107 @@
+"""
+Compares an encoder backend (int8, onnx) with the reference PyTorch model on a
+fixed skill/section test set: embedding cosine similarity, agreement of the skill
+and section decisions made at the production thresholds, and encode latency.
+
+Usage (from backend/backend):
+    python -m benchmarks.encoder_accuracy --backend int8
+    python -m benchmarks.encoder_accuracy --backend onnx --onnx-file onnx/model_qint8_avx512_vnni.onnx
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.synthetic import resume_text
+
+SKILL_THRESHOLD = 0.45  # DataProcessor: whole-text vs skill
+
+
+def probe_lines(seed: int = 0) -> List[str]:
+    """Distinct resume lines in English and Russian (fixed for a given seed)."""
+    rng = random.Random(seed)
+    lines = []
+    for lang in ("en", "ru"):
+        for size in (4, 12):
+            lines.extend(line for line in resume_text(rng, lang, size).splitlines() if line.strip())
+    return list(dict.fromkeys(lines))
+
+
+def _encode(model, texts: List[str]) -> np.ndarray:
+    return model.encode(texts, convert_to_numpy=True, normalize_embeddings=True, batch_size=64)
+
+
+def _latency(model, texts: List[str], repeat: int) -> float:
+    _encode(model, texts)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _encode(model, texts)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def compare_backends(reference, candidate, repeat: int = 3, seed: int = 0) -> Dict:
+    from app.data_processor import IT_SKILLS, SECTION_KEYWORDS, SECTION_THRESHOLD
+
+    anchors = [kw for kws in SECTION_KEYWORDS.values() for kw in kws]
+    lines = probe_lines(seed)
+    texts = IT_SKILLS + anchors + lines
+    ref, cand = _encode(reference, texts), _encode(candidate, texts)
+    cosine = np.sum(ref * cand, axis=1)
+
+    def decisions(embeddings: np.ndarray):
+        skills = embeddings[:len(IT_SKILLS)]
+        section_anchors = embeddings[len(IT_SKILLS):len(IT_SKILLS) + len(anchors)]
+        probes = embeddings[len(IT_SKILLS) + len(anchors):]
+        return probes @ skills.T >= SKILL_THRESHOLD, probes @ section_anchors.T >= SECTION_THRESHOLD
+
+    ref_skills, ref_sections = decisions(ref)
+    cand_skills, cand_sections = decisions(cand)
+    ref_latency, cand_latency = _latency(reference, lines, repeat), _latency(candidate, lines, repeat)
+    return {
+        "texts": len(texts),
+        "cosine_min": round(float(cosine.min()), 5),
+        "cosine_mean": round(float(cosine.mean()), 5),
+        "skill_agreement": round(float((ref_skills == cand_skills).mean()), 5),
+        "skill_flips": int((ref_skills != cand_skills).sum()),
+        "section_agreement": round(float((ref_sections == cand_sections).mean()), 5),
+        "section_flips": int((ref_sections != cand_sections).sum()),
+        "reference_ms": round(ref_latency * 1000, 3),
+        "candidate_ms": round(cand_latency * 1000, 3),
+        "speedup": round(ref_latency / cand_latency, 3) if cand_latency else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from app import config
+    from app.encoders import ENCODER_BACKENDS, load_encoder
+
+    parser = argparse.ArgumentParser(description="Check an encoder backend against the PyTorch reference.")
+    parser.add_argument("--backend", default=config.SIM_BACKEND, choices=ENCODER_BACKENDS)
+    parser.add_argument("--onnx-file", default=config.SIM_ONNX_FILE)
+    parser.add_argument("--threads", type=int, default=config.ENCODER_THREADS)
+    parser.add_argument("--min-cosine", type=float, default=0.97, help="fail below this per-text cosine")
+    parser.add_argument("--min-agreement", type=float, default=0.99, help="fail below this decision agreement")
+    parser.add_argument("--repeat", type=int, default=3, help="timed encodes per backend")
+    args = parser.parse_args(argv)
+
+    reference = load_encoder(backend="torch", threads=args.threads)
+    candidate = load_encoder(backend=args.backend, threads=args.threads, onnx_file=args.onnx_file)
+    report = dict(compare_backends(reference, candidate, args.repeat), backend=args.backend,
+                  model=config.SIM_MODEL_NAME, threads=args.threads)
+    report["passed"] = (
+        report["cosine_min"] >= args.min_cosine
+        and min(report["skill_agreement"], report["section_agreement"]) >= args.min_agreement
+    )
+    print(json.dumps(report, indent=2))
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
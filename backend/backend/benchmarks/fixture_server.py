@@ -0,0 +1,165 @@
+"""
+Local stand-ins for the GitHub, Stepik and hh.ru APIs with deterministic payloads.
+
+Routes (point GITHUB_API_URL / STEPIK_API_URL / HH_API_URL at them):
+    /github/users/<name>/repos?per_page=...&page=...   (Link and ETag headers, 304 on If-None-Match)
+    /stepik/api/courses?search=...    (or ?page=... to list the whole catalog)
+    /hh/vacancies?text=...&per_page=...&page=...
+"""
+import hashlib
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+COURSE_TEMPLATES = [
+    ("{q}: advanced specialization", "Practical {q} for working engineers"),
+    ("{q} для начинающих", "Основы {q} с нуля"),
+    ("Продвинутый {q}", "Углубленный курс по {q} и machine learning"),
+    ("{q} in Python", "Data analysis projects with {q}"),
+    ("Introduction to {q}", "A beginner course"),
+    ("{q} негіздері", "Қазақ тілінде курс"),  # filtered out as Kazakh
+]
+
+
+def _seed(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def github_repos(username: str):
+    seed = _seed(username)
+    languages = ["Python", "Jupyter Notebook", "Go", "TypeScript", None]
+    return [
+        {
+            "name": f"repo-{i}",
+            "language": languages[(seed + i) % len(languages)],
+            "stargazers_count": (seed >> i) % 7,
+            "forks_count": (seed >> (i + 3)) % 3,
+        }
+        for i in range(seed % 25 + 5)
+    ]
+
+
+def stepik_courses(query: str):
+    seed = _seed(query)
+    courses = []
+    for i in range(20):
+        title, summary = COURSE_TEMPLATES[(seed + i) % len(COURSE_TEMPLATES)]
+        courses.append({
+            "id": seed % 100000 + i,
+            "title": title.format(q=query),
+            "summary": summary.format(q=query),
+            "is_public": True,
+        })
+    return {"meta": {"page": 1, "has_next": False}, "courses": courses}
+
+
+CATALOG_TOPICS = ["python", "machine learning", "data science", "sql", "deep learning", "statistics",
+                  "pandas", "nlp", "docker", "анализ данных"]
+
+
+def stepik_catalog(page: int, per_page: int = 20):
+    courses = [course for topic in CATALOG_TOPICS for course in stepik_courses(topic)["courses"]]
+    last = -(-len(courses) // per_page)
+    return {"meta": {"page": page, "has_next": page < last},
+            "courses": courses[(page - 1) * per_page:page * per_page]}
+
+
+def hh_vacancies(text: str, per_page: int, page: int = 0):
+    seed = _seed(text)
+    first = page * per_page
+    return {
+        "found": 1000,
+        "pages": -(-1000 // per_page),
+        "page": page,
+        "items": [
+            {
+                "id": str(seed % 1000000 + i),
+                "name": f"{text} #{i}",
+                "alternate_url": f"https://hh.ru/vacancy/{seed % 1000000 + i}",
+                "snippet": {"requirement": f"Опыт работы с Python, SQL и {text.split()[-1]}"},
+            }
+            for i in range(first, first + per_page)
+        ],
+    }
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    latency = 0.0  # seconds added to every response
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query: Dict[str, str] = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+        headers: Dict[str, str] = {}
+        if parts[:2] == ["github", "users"] and len(parts) == 4 and parts[3] == "repos":
+            repos = github_repos(parts[2])
+            per_page, page = int(query.get("per_page", 30)), int(query.get("page", 1))
+            body = repos[(page - 1) * per_page:page * per_page]
+            last = max(1, -(-len(repos) // per_page))
+            if last > 1:
+                headers["Link"] = f'<{url.path}?per_page={per_page}&page={last}>; rel="last"'
+            headers["ETag"] = '"%s"' % hashlib.md5(json.dumps(body).encode()).hexdigest()
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                self.send_response(304)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                return
+        elif parts == ["stepik", "api", "courses"]:
+            if "search" in query:
+                body = stepik_courses(query["search"])
+            else:
+                body = stepik_catalog(int(query.get("page", 1)))
+        elif parts == ["hh", "vacancies"]:
+            body = hh_vacancies(query.get("text", ""), int(query.get("per_page", 20)), int(query.get("page", 0)))
+        else:
+            self.send_error(404)
+            return
+        if self.latency:
+            time.sleep(self.latency)
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Runs the fixture APIs on 127.0.0.1 in a background thread."""
+
+    def __init__(self, latency: float = 0.0, port: int = 0):
+        handler = type("Handler", (FixtureHandler,), {"latency": latency})
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environment(self) -> Dict[str, str]:
+        """Config overrides that route every upstream call to this server."""
+        return {
+            "GITHUB_API_URL": f"{self.base_url}/github",
+            "STEPIK_API_URL": f"{self.base_url}/stepik/api/courses",
+            "HH_API_URL": f"{self.base_url}/hh/vacancies",
+        }
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
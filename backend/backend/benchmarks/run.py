@@ -0,0 +1,259 @@
+"""
+Offline benchmark of the analysis and recommendation pipeline.
+
+GitHub, Stepik and hh.ru are served by a local fixture server; documents are
+synthetic resumes/transcripts of several sizes in English and Russian plus the
+bundled test_files/ PDFs. Models are loaded as configured (SIM_MODEL_NAME, SIM_BACKEND etc.).
+
+Usage (from backend/backend):
+    python -m benchmarks.run -o results.json
+    python -m benchmarks.run --baseline baseline.json --tolerance 0.2   # exit code 1 on regression
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.synthetic import Document, generate
+
+TEST_FILES_DIR = Path(__file__).resolve().parents[2] / "test_files"
+POSITIONS = ["Data Scientist", "Backend Developer", "ML Engineer", "Аналитик данных"]
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+
+
+def summarize(samples: List[float]) -> Dict:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+    }
+
+
+def measure(func: Callable, repeat: int, warmup: int = 1) -> Dict:
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bundled_documents():
+    """The PDFs in test_files/; files PyMuPDF cannot open are reported as skipped."""
+    import pymupdf
+    documents, skipped = [], []
+    for path in sorted(TEST_FILES_DIR.glob("*.pdf")):
+        data = path.read_bytes()
+        try:
+            with pymupdf.open(stream=data, filetype="pdf") as doc:
+                text = "".join(page.get_text() for page in doc)
+        except Exception as e:
+            skipped.append({"name": path.name, "reason": f"not a readable PDF: {e}"})
+            continue
+        kind = "transcript" if "transcript" in path.name else "resume"
+        documents.append(Document(path.stem, kind, "unknown", text, data))
+    return documents, skipped
+
+
+def stage_benchmarks(documents: List[Document], repeat: int) -> Dict[str, Dict]:
+    """
+    Times every DataProcessor/RecommendationEngine stage with the embedding and response
+    caches disabled, so each iteration does the full model and upstream work.
+    """
+    from app.data_processor import DataProcessor
+    from app.embedding_cache import EmbeddingCache
+    from app.encoders import encoder_id
+    from app.recommendation_engine import RecommendationEngine
+    from app.response_cache import MemoryBackend, ResponseCache
+
+    processor = DataProcessor()
+    processor.embedding_cache = EmbeddingCache(encoder_id(), max_entries=0)
+    engine = RecommendationEngine(cache=ResponseCache(MemoryBackend(max_entries=0)), encode=processor.encode)
+    processor.warm_up()
+
+    stages: Dict[str, Dict] = {}
+    for doc in documents:
+        stages[f"pdf_text/{doc.name}"] = measure(
+            lambda: processor.extract_text_from_pdf(io.BytesIO(doc.pdf)), repeat
+        )
+        text = processor.extract_text_from_pdf(io.BytesIO(doc.pdf))
+        if doc.kind == "resume":
+            stages[f"skills/{doc.name}"] = measure(lambda: processor.extract_skills(text), repeat)
+            stages[f"structured_resume/{doc.name}"] = measure(
+                lambda: processor.extract_structured_resume(text), repeat
+            )
+
+            def shared_context():
+                contexts = processor.document_contexts([text])
+                processor.prepare_contexts(contexts, skills=True, sections=True)
+                processor.skills_from_contexts(contexts)
+                processor.structured_resume_from_contexts(contexts)
+
+            stages[f"resume_shared_context/{doc.name}"] = measure(shared_context, repeat)
+        else:
+            stages[f"education/{doc.name}"] = measure(lambda: processor.extract_education(text), repeat)
+            stages[f"structured_transcript/{doc.name}"] = measure(
+                lambda: processor.extract_structured_transcript(text), repeat
+            )
+
+    stages["github"] = measure(lambda: processor.analyze_github_profile("https://github.com/bench-user"), repeat)
+    skills = ["python", "sql", "pandas", "docker"]
+    for level in LEVELS:
+        stages[f"stepik_courses/{level.lower()}"] = measure(
+            lambda: engine.get_stepik_courses("Data Scientist", level.lower(), skills, "Data Scientist"), repeat
+        )
+        stages[f"recommendations/{level.lower()}"] = measure(
+            lambda: engine.get_recommendations("Data Scientist", level, skills), repeat
+        )
+    stages["hh_vacancies"] = measure(
+        lambda: engine.get_hh_vacancies("junior Data Scientist", "intermediate", skills), repeat
+    )
+    return stages
+
+
+async def _load(requests: int, concurrency: int, pairs: List, cache_documents: bool) -> Dict:
+    import httpx
+    from app import config, main
+    from app.profile_cache import ProfileCache
+    from app.response_cache import MemoryBackend
+
+    # Fresh document cache per phase; size 0 turns it off
+    main.profile_cache = ProfileCache(MemoryBackend(max_entries=config.PROFILE_CACHE_SIZE if cache_documents else 0))
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(client, i):
+        nonlocal errors
+        resume, transcript = pairs[i % len(pairs)]
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(
+                "/analyze-profile",
+                data={"desired_position": POSITIONS[i % len(POSITIONS)],
+                      "github_profile": f"https://github.com/user{i % 7}"},
+                files={"resume": ("resume.pdf", resume.pdf, "application/pdf"),
+                       "transcript": ("transcript.pdf", transcript.pdf, "application/pdf")},
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+    return dict(summarize(latencies), requests=requests, concurrency=concurrency,
+                errors=errors, rps=round(requests / elapsed, 3))
+
+
+def end_to_end(documents: List[Document], requests: int, concurrency: int) -> Dict[str, Dict]:
+    """
+    /analyze-profile under concurrent load, in-process through ASGI.
+    "cold": the document cache is off, every request runs the whole pipeline;
+    "repeat": the same documents are resubmitted with other positions (cache on).
+    """
+    from app import main
+    main.data_processor.warm_up()
+    resumes = [doc for doc in documents if doc.kind == "resume"]
+    transcripts = [doc for doc in documents if doc.kind == "transcript"]
+    pairs = list(zip(resumes, transcripts))
+    return {
+        "cold": asyncio.run(_load(requests, concurrency, pairs, cache_documents=False)),
+        "repeat": asyncio.run(_load(requests, concurrency, pairs, cache_documents=True)),
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float, min_delta_ms: float) -> List[Dict]:
+    """Stages whose median got slower, and load phases whose throughput dropped, beyond tolerance."""
+    regressions = []
+    for name, stats in results["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if not base:
+            continue
+        delta = stats["median_ms"] - base["median_ms"]
+        if stats["median_ms"] > base["median_ms"] * (1 + tolerance) and delta >= min_delta_ms:
+            regressions.append({"metric": f"stages.{name}.median_ms",
+                                "baseline": base["median_ms"], "current": stats["median_ms"]})
+    for phase, stats in results.get("end_to_end", {}).items():
+        base = baseline.get("end_to_end", {}).get(phase)
+        if base and stats["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append({"metric": f"end_to_end.{phase}.rps", "baseline": base["rps"], "current": stats["rps"]})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the profile analysis pipeline.")
+    parser.add_argument("--output", "-o", help="results .json file (default: stdout)")
+    parser.add_argument("--baseline", help="earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--repeat", type=int, default=5, help="timed iterations per stage")
+    parser.add_argument("--requests", type=int, default=32, help="/analyze-profile calls per load phase")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent /analyze-profile calls")
+    parser.add_argument("--upstream-latency-ms", type=float, default=20.0, help="delay added by the fixture APIs")
+    parser.add_argument("--sizes", default="2,8,32", help="synthetic document sizes (experience entries)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-load", action="store_true", help="only time the individual stages")
+    args = parser.parse_args(argv)
+
+    with FixtureServer(latency=args.upstream_latency_ms / 1000) as server:
+        # app.config reads the environment on import, so point it at the fixtures first
+        os.environ.update(server.environment())
+        os.environ.setdefault("WARMUP_ON_STARTUP", "0")
+        os.environ.pop("RESPONSE_CACHE_PATH", None)
+        os.environ.pop("PROFILE_CACHE_PATH", None)
+        from app import config
+
+        documents = generate(args.seed, sizes=[int(size) for size in args.sizes.split(",")])
+        bundled, skipped = bundled_documents()
+        results = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "model": config.SIM_MODEL_NAME,
+                "encoder_backend": config.SIM_BACKEND,
+                "encoder_threads": config.ENCODER_THREADS,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "args": vars(args),
+            },
+            "documents": [
+                {"name": doc.name, "kind": doc.kind, "lang": doc.lang, "chars": len(doc.text), "bytes": len(doc.pdf)}
+                for doc in documents + bundled
+            ],
+            "skipped": skipped,
+            "stages": stage_benchmarks(documents + bundled, args.repeat),
+        }
+        if not args.skip_load:
+            results["end_to_end"] = end_to_end(documents, args.requests, args.concurrency)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            results["regressions"] = compare(results, json.load(f), args.tolerance, args.min_delta_ms)
+    report = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    for regression in results.get("regressions", []):
+        print(f"REGRESSION {regression['metric']}: {regression['baseline']} -> {regression['current']}",
+              file=sys.stderr)
+    return 1 if results.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
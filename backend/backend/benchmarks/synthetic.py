@@ -0,0 +1,129 @@
+"""
+Deterministic synthetic resumes and transcripts (English and Russian) rendered to PDF.
+"""
+import html
+import random
+from dataclasses import dataclass
+from typing import List
+
+SKILLS = [
+    "Python", "SQL", "Docker", "Kubernetes", "PyTorch", "TensorFlow", "pandas", "NumPy", "scikit-learn",
+    "Git", "Linux", "FastAPI", "Django", "React", "Spark", "Tableau", "Excel", "Go", "Java", "C++",
+]
+COMPANIES = ["Yandex", "Sber", "Tinkoff", "Ozon", "Kaspersky", "VK", "JetBrains", "Avito", "MTS", "Acme Corp"]
+ROLES = {
+    "en": ["Data Analyst", "ML Engineer", "Backend Developer", "Research Intern", "Data Scientist"],
+    "ru": ["Аналитик данных", "Инженер ML", "Разработчик", "Стажер-исследователь", "Специалист по данным"],
+}
+UNIVERSITIES = ["MIPT", "HSE", "ITMO", "Moscow State University", "Skoltech", "Kazan Federal University"]
+SECTIONS = {
+    "en": {
+        "summary": "Summary: motivated engineer who enjoys turning data into products",
+        "projects": ["Project: recommendation service for {x}", "Project: forecasting demand with {x}"],
+        "certifications": ["Certificate: {x} professional", "Certification in {x}"],
+        "languages": ["Languages: English (C1), Russian (native)"],
+        "achievements": ["Award: hackathon winner ({x} track)", "Achievement: top 5% on Kaggle"],
+        "interests": ["Interests: chess, hiking", "Hobby: open source in {x}"],
+        "publications": ["Publication: efficient {x} pipelines, workshop paper"],
+        "volunteer": ["Volunteer: mentor at a {x} school", "Extracurricular: student council"],
+        "filler": ["Worked closely with product teams on {x} features.",
+                   "Improved latency of the {x} stack by a third.",
+                   "Led code reviews and onboarding for new engineers."],
+    },
+    "ru": {
+        "summary": "О себе: инженер, который любит превращать данные в продукты",
+        "projects": ["Проект: рекомендательный сервис на {x}", "Проект: прогноз спроса с {x}"],
+        "certifications": ["Сертификат: {x} для профессионалов"],
+        "languages": ["Языки: русский (родной), английский (B2)"],
+        "achievements": ["Награда: победитель хакатона ({x})", "Достижение: топ-5% на Kaggle"],
+        "interests": ["Интересы: шахматы, походы", "Хобби: open source на {x}"],
+        "publications": ["Публикация: эффективные конвейеры {x}"],
+        "volunteer": ["Волонтер: наставник в школе {x}", "Внеучебная деятельность: студсовет"],
+        "filler": ["Работал с продуктовыми командами над функциями {x}.",
+                   "Сократил задержки сервиса на {x} на треть.",
+                   "Проводил ревью кода и онбординг новых инженеров."],
+    },
+}
+COURSE_NAMES = [
+    "Introduction to Data Science", "Machine Learning", "Deep Learning", "Statistics", "Databases",
+    "Numerical Methods", "Computer Vision", "Natural Language Processing", "Optimization", "Algorithms",
+]
+LINES_PER_PAGE = 48
+
+
+@dataclass
+class Document:
+    name: str
+    kind: str  # "resume" or "transcript"
+    lang: str
+    text: str
+    pdf: bytes
+
+
+def resume_text(rng: random.Random, lang: str, size: int) -> str:
+    """A resume with `size` experience entries and proportionally more free text."""
+    sections = SECTIONS[lang]
+    pick = lambda options: rng.choice(options).format(x=rng.choice(SKILLS))
+    lines = [
+        "Ivan Petrov" if lang == "en" else "Иван Петров",
+        f"ivan.petrov{rng.randint(1, 999)}@example.com  +7 (999) 123-45-{rng.randint(10, 99)}",
+        "github.com/ivan-petrov  linkedin.com/in/ivan-petrov",
+        sections["summary"],
+        ("Skills:" if lang == "en" else "Навыки:") + " " + ", ".join(rng.sample(SKILLS, 8)),
+        "",
+    ]
+    year = 2024
+    for _ in range(size):
+        start = year - rng.randint(1, 3)
+        lines.append(f"{rng.choice(COMPANIES)}, {rng.choice(ROLES[lang])}, {start}-{year}")
+        lines.extend(pick(sections["filler"]) for _ in range(3))
+        year = start
+    lines.append(f"{rng.choice(UNIVERSITIES)}, BSc Applied Mathematics, {year - 4}-{year}")
+    for section in ("projects", "certifications", "languages", "achievements", "interests",
+                    "publications", "volunteer"):
+        lines.extend(pick(sections[section]) for _ in range(max(1, size // 2)))
+    return "\n".join(lines)
+
+
+def transcript_text(rng: random.Random, lang: str, courses: int) -> str:
+    """A transcript in the layout the field extractors expect, with `courses` course rows."""
+    lines = [
+        "Skolkovo Institute of Science and Technology",
+        f"Student Ivan Petrov Date of Birth 1999-Jan-0{rng.randint(1, 9)} Student ID {rng.randint(100, 999)}-45",
+        "Matriculation Date 2021-Sep-01 Date of Completion / Expected Date of 2023-Jun-30",
+        "Completion Level Master of Science Educational Program Data Science Field of Knowledge Computer Science",
+        f"The language of instruction is {'English' if lang == 'en' else 'Russian'}. GPA: {rng.uniform(3, 5):.2f}",
+    ]
+    for i in range(courses):
+        name = rng.choice(COURSE_NAMES)
+        lines.append(f"MA{30111 + i:06d} {name} {rng.randint(3, 6)} {rng.choice('ABC')} "
+                     f"{rng.randint(3, 6) * 36} Term {rng.randint(1, 4)} 2022-2023")
+    return "\n".join(lines)
+
+
+def to_pdf(text: str) -> bytes:
+    """Renders text to a PDF, LINES_PER_PAGE lines per page (Cyrillic included)."""
+    import pymupdf
+    lines = text.splitlines()
+    doc = pymupdf.open()
+    for start in range(0, max(len(lines), 1), LINES_PER_PAGE):
+        page = doc.new_page()
+        body = "<br>".join(html.escape(line) for line in lines[start:start + LINES_PER_PAGE])
+        page.insert_htmlbox(page.rect + (40, 40, -40, -40), f'<div style="font-size:9px">{body}</div>')
+    try:
+        return doc.tobytes()
+    finally:
+        doc.close()
+
+
+def generate(seed: int = 0, sizes=(2, 8, 32), langs=("en", "ru")) -> List[Document]:
+    """One resume and one transcript per size and language."""
+    rng = random.Random(seed)
+    documents = []
+    for size in sizes:
+        for lang in langs:
+            resume = resume_text(rng, lang, size)
+            transcript = transcript_text(rng, lang, size * 3)
+            documents.append(Document(f"resume-{lang}-{size}", "resume", lang, resume, to_pdf(resume)))
+            documents.append(Document(f"transcript-{lang}-{size}", "transcript", lang, transcript, to_pdf(transcript)))
+    return documents
@@ -0,0 +1,144 @@
+"""
+Stand-ins shared by the tests: deterministic encoders that record their batches
+(and the threads they ran on), a spaCy-like NER pipeline, an HTTP client that
+must not be called, and a client for the API app.
+"""
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.data_processor import DataProcessor
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+class RecordingEncoder:
+    """Base of the stand-in sentence encoders: records every batch and the thread it ran on."""
+
+    def __init__(self):
+        self.batches = []
+        self.threads = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        self.threads.append(threading.current_thread().name)
+        return self.vectors(list(texts))
+
+    def encode(self, texts, **kwargs):
+        # SentenceTransformer-style entry point (model servers)
+        return self(texts)
+
+    @property
+    def calls(self):
+        """Batch sizes, in call order."""
+        return [len(batch) for batch in self.batches]
+
+    def vectors(self, texts):
+        raise NotImplementedError
+
+
+class KeywordEncoder(RecordingEncoder):
+    """One dimension per topic word plus a bias dimension, L2-normalized."""
+
+    def __init__(self, words, bias: float = 0.1):
+        super().__init__()
+        self.words = list(words)
+        self.bias = bias
+
+    def vectors(self, texts):
+        rows = np.array([[float(w in t.lower()) for w in self.words] + [self.bias] for t in texts], dtype=np.float32)
+        return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+class LetterEncoder(RecordingEncoder):
+    """Bag of letters, L2-normalized: texts sharing words (or anagrams) are close."""
+
+    def vectors(self, texts):
+        rows = np.array([[t.lower().count(ch) for ch in ALPHABET] for t in texts], dtype=np.float32)
+        return rows / np.maximum(np.linalg.norm(rows, axis=1, keepdims=True), 1e-9)
+
+
+class LengthEncoder(RecordingEncoder):
+    """[len(text), 1] per text; fails on "boom" and optionally waits for an event first."""
+
+    def __init__(self, delay: threading.Event = None):
+        super().__init__()
+        self.delay = delay
+
+    def vectors(self, texts):
+        if self.delay is not None:
+            self.delay.wait(timeout=5)
+        if "boom" in texts:
+            raise ValueError("boom")
+        return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+class EntityNLP:
+    """Stand-in for spaCy: every word "docker" is a PRODUCT entity."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def pipe(self, texts, batch_size=None):
+        self.calls += 1
+        for text in texts:
+            yield SimpleNamespace(ents=[
+                SimpleNamespace(text=word, label_="PRODUCT") for word in text.split() if word == "docker"
+            ])
+
+
+class NoNetwork:
+    """HTTP client for code paths that must be served locally."""
+
+    def get(self, *args, **kwargs):
+        raise AssertionError("unexpected outbound request")
+
+    async def aget(self, *args, **kwargs):
+        raise AssertionError("unexpected outbound request")
+
+
+@pytest.fixture
+def keyword_encoder():
+    """Factory: keyword_encoder(words, bias=0.1)."""
+    return KeywordEncoder
+
+
+@pytest.fixture
+def letter_encoder():
+    return LetterEncoder()
+
+
+@pytest.fixture
+def length_encoder():
+    """Factory: length_encoder(delay=None)."""
+    return LengthEncoder
+
+
+@pytest.fixture
+def no_network():
+    return NoNetwork()
+
+
+@pytest.fixture
+def entity_nlp():
+    return EntityNLP()
+
+
+@pytest.fixture
+def processor(keyword_encoder, no_network, entity_nlp):
+    """A DataProcessor on the stand-in encoder and NER pipeline, without an embedding cache."""
+    processor = DataProcessor(http=no_network)
+    processor._encode_uncached = keyword_encoder(["python", "docker", "project", "hobby"])
+    processor._nlp = entity_nlp
+    processor.embedding_cache.max_entries = 0  # count every text the encoder sees
+    return processor
+
+
+@pytest.fixture
+def client():
+    # Without the lifespan: no background warm-up, models stay unloaded
+    return TestClient(main.app)
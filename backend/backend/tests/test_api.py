@@ -0,0 +1,46 @@
+import pytest
+
+from app import data_processor, main
+
+
+def upload(name="doc.pdf"):
+    return (name, b"%PDF-1.4", "application/pdf")
+
+
+@pytest.mark.parametrize("priority", [-11, 11])
+def test_job_priority_is_bounded(client, priority):
+    response = client.post("/jobs/analyze-profile", data={"desired_position": "Data Scientist", "priority": priority},
+                           files={"transcript": upload(), "resume": upload()})
+    assert response.status_code == 422
+    assert main.job_queue.stats() == {"queued": 0, "running": 0}
+
+
+def test_models_load_lazily_and_ready_follows_warm_up(client, monkeypatch, no_network, letter_encoder, entity_nlp):
+    loaded = []
+    monkeypatch.setattr(data_processor, "load_nlp", lambda: loaded.append("nlp") or entity_nlp)
+    monkeypatch.setattr(data_processor, "load_encoder", lambda: loaded.append("encoder") or letter_encoder)
+    processor = data_processor.DataProcessor(http=no_network)
+    processor.embedding_cache.max_entries = 0
+    monkeypatch.setattr(main, "data_processor", processor)
+    assert loaded == []
+    assert client.get("/health").status_code == 200
+    response = client.get("/ready")
+    assert (response.status_code, response.json()) == (503, {"status": "loading"})
+    processor.warm_up()
+    assert sorted(loaded) == ["encoder", "nlp"]
+    assert len(letter_encoder.batches) == 2  # skill and section indexes
+    response = client.get("/ready")
+    assert (response.status_code, response.json()) == (200, {"status": "ready"})
+
+
+def test_ready_reports_a_failed_warm_up(client, monkeypatch, no_network):
+    def fail():
+        raise OSError("model not found")
+
+    monkeypatch.setattr(data_processor, "load_nlp", fail)
+    processor = data_processor.DataProcessor(http=no_network)
+    monkeypatch.setattr(main, "data_processor", processor)
+    with pytest.raises(OSError):
+        processor.warm_up()
+    response = client.get("/ready")
+    assert (response.status_code, response.json()) == (503, {"status": "error", "detail": "model not found"})
@@ -0,0 +1,127 @@
+import io
+import json
+import zipfile
+
+import pytest
+
+from app import batch, main
+
+COHORT = {
+    "alice_transcript.pdf": "Bachelor of Computer Science",
+    "alice_resume.pdf": "Python\nProject: docker bot",
+    "bob/transcript.pdf": "Master of Data Science",
+    "bob/resume.pdf": "docker\nHobby chess",
+    "carol_resume.pdf": "Python",
+    "Dana_Transcript.pdf": "Bachelor of Physics",
+    "dana_resume.pdf": "Python",
+    "notes.txt": "ignored",
+    "manifest.csv": "student_id,desired_position,github_profile\nBOB,ML Engineer,\n",
+    # Added by macOS after the real files; must not replace them
+    "__MACOSX/._alice_resume.pdf": "AppleDouble junk",
+    "__MACOSX/bob/._resume.pdf": "AppleDouble junk",
+    "bob/.hidden_resume.pdf": "junk",
+}
+
+
+def cohort_zip(files=COHORT) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, text in files.items():
+            zf.writestr(name, text)
+    return buffer.getvalue()
+
+
+def open_zip(files=COHORT) -> zipfile.ZipFile:
+    """The archive, recording the members read from it."""
+    archive = zipfile.ZipFile(io.BytesIO(cohort_zip(files)))
+    archive.reads = []
+    read = archive.read
+    archive.read = lambda member: archive.reads.append(getattr(member, "filename", member)) or read(member)
+    return archive
+
+
+@pytest.fixture
+def text_processor(processor):
+    # The archive holds plain text instead of PDFs
+    processor.extract_text_from_pdf = lambda file: file.read().decode("utf-8")
+    return processor
+
+
+def check_results(results):
+    by_student = {result["student_id"]: result for result in results}
+    assert sorted(by_student) == ["Dana", "alice", "bob", "carol"]
+    assert by_student["carol"] == {"student_id": "carol", "status": "error", "message": "missing transcript"}
+    assert by_student["alice"]["data"]["skills"] == ["docker", "python"]
+    assert by_student["alice"]["data"]["desired_position"] == "Data Scientist"
+    assert by_student["bob"]["data"]["desired_position"] == "ML Engineer"
+    assert by_student["bob"]["data"]["structured_resume"]["interests"] == ["Hobby chess"]
+    assert by_student["Dana"]["status"] == "success"
+
+
+def test_zip_is_grouped_by_student_with_manifest_overrides():
+    items = batch.collect_from_zip(open_zip())
+    assert [item.student_id for item in items] == ["alice", "bob", "carol", "Dana"]
+    assert sorted(items[1].documents) == ["resume", "transcript"]
+    assert items[1].desired_position == "ML Engineer"
+    assert items[0].documents["resume"]() == b"Python\nProject: docker bot"
+    assert sorted(items[3].documents) == ["resume", "transcript"]
+
+
+def test_documents_are_read_chunk_by_chunk(text_processor):
+    archive = open_zip()
+    items = batch.collect_from_zip(archive)
+    assert archive.reads == ["manifest.csv"]
+    results = batch.analyze_batch(text_processor, None, items, "Data Scientist", chunk_size=1)
+    assert next(results)["student_id"] == "alice"
+    assert archive.reads == ["manifest.csv", "alice_transcript.pdf", "alice_resume.pdf"]
+
+
+def test_oversized_documents_are_not_read(monkeypatch, text_processor):
+    monkeypatch.setattr(batch.config, "MAX_PDF_BYTES", 50)
+    archive = open_zip({"eve_transcript.pdf": "x" * 10, "eve_resume.pdf": "y" * 100})
+    [result] = batch.analyze_batch(text_processor, None, batch.collect_from_zip(archive), "Data Scientist")
+    assert result == {"student_id": "eve", "status": "error",
+                      "message": "could not read PDF: eve_resume.pdf is larger than 50 bytes"}
+    assert archive.reads == ["eve_transcript.pdf"]
+
+
+def test_results_are_written_as_json_lines(text_processor):
+    items = batch.collect_from_zip(open_zip())
+    lines = list(batch.to_jsonl(batch.analyze_batch(text_processor, None, items, "Data Scientist", chunk_size=1)))
+    assert all(line.endswith("\n") and line.count("\n") == 1 for line in lines)
+    check_results([json.loads(line) for line in lines])
+
+
+def test_cli_writes_jsonl(tmp_path, monkeypatch, text_processor):
+    archive = tmp_path / "cohort.zip"
+    archive.write_bytes(cohort_zip())
+    output = tmp_path / "results.jsonl"
+    monkeypatch.setattr(batch, "DataProcessor", lambda: text_processor)
+    batch.main([str(archive), "--position", "Data Scientist", "--no-recommendations", "-o", str(output)])
+    check_results([json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()])
+
+
+def test_cli_rejects_a_file_that_is_not_a_zip(tmp_path, capsys):
+    archive = tmp_path / "cohort.zip"
+    archive.write_bytes(b"not a zip")
+    with pytest.raises(SystemExit) as exit_info:
+        batch.main([str(archive), "--position", "Data Scientist"])
+    assert exit_info.value.code == 2
+    assert "cannot read" in capsys.readouterr().err
+
+
+def test_endpoint_streams_jsonl(client, monkeypatch, text_processor):
+    monkeypatch.setattr(main, "data_processor", text_processor)
+    monkeypatch.setattr(main, "recommendation_engine", None)
+    response = client.post("/analyze-batch", data={"desired_position": "Data Scientist"},
+                           files={"archive": ("cohort.zip", cohort_zip(), "application/zip")})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    check_results([json.loads(line) for line in response.text.splitlines()])
+
+
+def test_endpoint_rejects_a_file_that_is_not_a_zip(client):
+    response = client.post("/analyze-batch", data={"desired_position": "Data Scientist"},
+                           files={"archive": ("cohort.zip", b"not a zip", "application/zip")})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "archive is not a valid zip file"}
@@ -0,0 +1,25 @@
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.run import compare
+from app.http_client import OutboundClient
+from app.recommendation_engine import RecommendationEngine
+from app.response_cache import MemoryBackend, ResponseCache
+
+
+def test_engine_runs_against_fixture_apis():
+    with FixtureServer() as server:
+        engine = RecommendationEngine(cache=ResponseCache(MemoryBackend()), http=OutboundClient(retries=0))
+        engine.stepik_api_url = server.environment()["STEPIK_API_URL"]
+        engine.hh_api_url = server.environment()["HH_API_URL"]
+        recommendations = engine.get_recommendations("Data Scientist", "Intermediate", ["python"])
+    assert 0 < len(recommendations["courses"]) <= 5
+    assert len(recommendations["jobs"]) == 5
+    assert all("error" not in job for job in recommendations["jobs"])
+
+
+def test_compare_flags_slowdowns_beyond_tolerance():
+    baseline = {"stages": {"skills": {"median_ms": 10.0}, "github": {"median_ms": 0.1}},
+                "end_to_end": {"cold": {"rps": 20.0}}}
+    results = {"stages": {"skills": {"median_ms": 13.0}, "github": {"median_ms": 0.5}},
+               "end_to_end": {"cold": {"rps": 19.0}}}
+    regressions = compare(results, baseline, tolerance=0.25, min_delta_ms=1.0)
+    assert [r["metric"] for r in regressions] == ["stages.skills.median_ms"]
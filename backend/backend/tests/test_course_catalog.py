@@ -0,0 +1,94 @@
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from app.course_catalog import CatalogIndex, Course, CourseStore, LocalCatalog, classify_course, embedding_text, sync_catalog
+from app.encoders import encoder_id
+from app.http_client import OutboundClient
+from app.recommendation_engine import RecommendationEngine
+from app.response_cache import MemoryBackend, ResponseCache
+
+
+@pytest.fixture
+def keyword_encode(keyword_encoder):
+    return keyword_encoder(["pandas", "sql", "docker", "learning"])
+
+
+def synced_store(tmp_path, keyword_encode):
+    store = CourseStore(str(tmp_path / "courses.db"))
+    with FixtureServer() as server:
+        report = sync_catalog(store, OutboundClient(retries=0), server.environment()["STEPIK_API_URL"],
+                              max_pages=100, encode=keyword_encode, model=encoder_id())
+    return store, report
+
+
+def test_classification_matches_course_filters():
+    assert classify_course("Python для начинающих", "Основы с нуля") == \
+        {"language": "ru", "introductory": True, "in_depth": True}
+    assert classify_course("SQL: advanced specialization", "")["introductory"] is False
+    assert classify_course("SQL негіздері", "Қазақ тілінде курс")["language"] == "kk"
+
+
+def test_sync_is_incremental(tmp_path, keyword_encode):
+    store, report = synced_store(tmp_path, keyword_encode)
+    assert report["pages"] > 1 and report["changed"] == report["courses"] == report["embedded"]
+    with FixtureServer() as server:
+        again = sync_catalog(store, OutboundClient(retries=0), server.environment()["STEPIK_API_URL"],
+                             max_pages=100, encode=keyword_encode, model=encoder_id())
+    assert again["changed"] == again["embedded"] == 0
+
+
+def test_index_search_matches_phrases():
+    index = CatalogIndex([
+        Course(1, "Machine learning in Python", "", "en", False, True),
+        Course(2, "Learning machine code", "", "en", False, False),
+        Course(3, "HTML basics", "", "en", False, False),
+    ])
+    assert index.search("machine learning") == [0]
+    assert index.search("ml") == []
+    assert index.search("python") == [0]
+
+
+def test_thematic_phrases_do_not_span_title_and_summary():
+    index = CatalogIndex([
+        Course(1, "Python for machine", "learning to code", "en", False, True),
+        Course(2, "Python basics", "Intro to machine learning", "en", False, True),
+    ])
+    assert index.find(["python"], ["machine learning"], "intermediate") == [1]
+
+
+def test_engine_answers_from_catalog_with_semantic_ranking(tmp_path, keyword_encode, no_network):
+    store, _ = synced_store(tmp_path, keyword_encode)
+    catalog = LocalCatalog(store)
+    unranked = RecommendationEngine(cache=ResponseCache(MemoryBackend()), http=no_network, catalog=catalog)
+    ranked = RecommendationEngine(cache=ResponseCache(MemoryBackend()), http=no_network, catalog=catalog,
+                                  encode=keyword_encode)
+    args = ("Data Scientist", "intermediate", ["nlp", "pandas"], "Data Scientist")
+    courses = ranked.get_stepik_courses(*args)
+    assert len(courses) == 5
+    assert all(c["url"].startswith("https://stepik.org/course/") for c in courses)
+    # Same candidates, ordered by similarity to the skills and position instead of keyword priority
+    query = keyword_encode(["nlp", "pandas", "Data Scientist"]).mean(axis=0)
+    scores = [float(keyword_encode([embedding_text(c["title"], c["summary"])])[0] @ query) for c in courses]
+    assert scores == sorted(scores, reverse=True)
+    assert courses != unranked.get_stepik_courses(*args)
+
+
+def test_parallel_stepik_search_keeps_sequential_order_and_dedups():
+    skills = ["pandas", "sql", "pandas", "numpy", "sql", "python"]
+    with FixtureServer(latency=0.01) as server:
+        engines = [RecommendationEngine(search_concurrency=n, cache=ResponseCache(MemoryBackend()),
+                                        http=OutboundClient(retries=0), catalog=None) for n in (1, 8)]
+        for engine in engines:
+            engine.stepik_api_url = server.environment()["STEPIK_API_URL"]
+        sequential, parallel = [engine.get_stepik_courses("", "beginner", skills, "Data Scientist")
+                                for engine in engines]
+        pool = engines[1]._search_pool
+        # The pool belongs to the engine and is reused by later searches
+        assert engines[1].get_stepik_courses("", "beginner", skills, "Data Scientist") == parallel
+        assert engines[1]._search_pool is pool
+    assert parallel == sequential
+    assert len(parallel) == 5
+    assert len({c["url"] for c in parallel}) == len(parallel)
+    for engine in engines:
+        engine.close()
+    assert pool._shutdown
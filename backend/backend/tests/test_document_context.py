@@ -0,0 +1,72 @@
+import pytest
+
+from app.data_processor import IT_SKILLS, SECTION_KEYWORDS
+
+RESUMES = [
+    "Python developer\nDocker and Kubernetes in production\nProject: docker bot\nHobby: chess",
+    "Аналитик данных\nSQL, Excel, Power BI\nСертификат Yandex\nЯзыки: английский",
+    "Summary: backend engineer\nAwards: hackathon winner\nVolunteer teacher\nPublications: 2\nPublications: 2",
+    "",
+]
+
+
+def reference_skills(processor, text):
+    """The original implementation: one semantic_match per skill and per entity."""
+    found = {skill for skill in IT_SKILLS if processor.semantic_match(skill, [text], threshold=0.45)}
+    doc = next(processor.nlp.pipe([text.lower()]))
+    for ent in doc.ents:
+        if ent.label_ in ["ORG", "PRODUCT"]:
+            found.update(processor.semantic_match(ent.text.lower(), IT_SKILLS, threshold=0.7))
+    return sorted(found)
+
+
+def reference_sections(processor, text):
+    """The original per-section methods: every line against every anchor of the section, one by one."""
+    return {
+        section: [line.strip() for line in text.splitlines()
+                  if any(processor.semantic_match(line, [kw], threshold=0.6) for kw in keywords)]
+        for section, keywords in SECTION_KEYWORDS.items()
+    }
+
+
+@pytest.fixture
+def letter_processor(processor, letter_encoder):
+    # Bag-of-letters embeddings: many partial matches near both thresholds
+    processor._encode_uncached = letter_encoder
+    return processor
+
+
+def test_skills_and_sections_share_one_ner_pass_and_one_encoder_call(processor):
+    processor.skill_index, processor.section_index
+    encoder = processor._encode_uncached
+    encoder.batches.clear()
+    contexts = processor.document_contexts(["Python\nProject: docker bot\nHobby chess", "Docker"])
+    processor.prepare_contexts(contexts, skills=True, sections=True)
+    skills = processor.skills_from_contexts(contexts)
+    resumes = processor.structured_resume_from_contexts(contexts)
+    assert len(encoder.batches) == 1
+    assert processor.nlp.calls == 1
+    assert skills == [["docker", "python"], ["docker"]]
+    assert resumes[0]["projects"] == ["Project: docker bot"]
+    assert resumes[0]["interests"] == ["Hobby chess"]
+
+
+def test_batch_methods_match_context_methods(processor):
+    texts = ["Python\nProject: docker bot", ""]
+    contexts = processor.document_contexts(texts)
+    assert processor.extract_skills_batch(texts) == processor.skills_from_contexts(contexts)
+    assert processor.extract_structured_resume_batch(texts) == processor.structured_resume_from_contexts(contexts)
+
+
+def test_skill_index_matches_per_skill_loop(letter_processor):
+    expected = [reference_skills(letter_processor, text) for text in RESUMES]
+    assert any(expected) and not all(skills == IT_SKILLS for skills in expected)
+    assert letter_processor.extract_skills_batch(RESUMES) == expected
+    assert [letter_processor.extract_skills(text) for text in RESUMES] == expected
+
+
+def test_batched_sections_match_per_section_classification(letter_processor):
+    expected = [reference_sections(letter_processor, text) for text in RESUMES]
+    assert any(lines for sections in expected for lines in sections.values())
+    assert letter_processor.classify_sections_batch(RESUMES) == expected
+    assert letter_processor.extract_projects_section(RESUMES[0]) == expected[0]["projects"]
@@ -0,0 +1,37 @@
+import numpy as np
+
+from app.embedding_cache import EmbeddingCache
+
+
+def test_repeated_texts_are_encoded_once(letter_encoder):
+    """Cached and duplicate texts are not sent to the encoder again."""
+    cache = EmbeddingCache("test-model", max_entries=10)
+    first = cache.encode(["python", "java", "python"], letter_encoder)
+    second = cache.encode(["java", "sql"], letter_encoder)
+    assert letter_encoder.batches == [["python", "java"], ["sql"]]
+    assert np.array_equal(first[0], first[2])
+    assert np.array_equal(first[1], second[0])
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+
+
+def test_lru_eviction(letter_encoder):
+    """The least recently used entry is evicted when the cache is full."""
+    cache = EmbeddingCache("test-model", max_entries=2)
+    cache.encode(["a", "b"], letter_encoder)
+    cache.encode(["a"], letter_encoder)
+    cache.encode(["c"], letter_encoder)
+    assert cache.stats()["evictions"] == 1
+    cache.encode(["b"], letter_encoder)
+    assert letter_encoder.batches[-1] == ["b"]
+
+
+def test_disk_tier_survives_restart(tmp_path, letter_encoder):
+    """Embeddings written to the on-disk tier are served to a fresh cache."""
+    cache = EmbeddingCache("test/model", max_entries=10, disk_dir=str(tmp_path))
+    expected = cache.encode(["data science", "pandas"], letter_encoder)
+    restarted = EmbeddingCache("test/model", max_entries=10, disk_dir=str(tmp_path))
+    assert np.array_equal(restarted.encode(["pandas", "data science"], letter_encoder), expected[::-1])
+    assert len(letter_encoder.batches) == 1
+    assert restarted.stats()["disk_hits"] == 2
@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+from app.encode_scheduler import EncodeQueueFull, EncodeScheduler
+
+
+def test_concurrent_requests_are_merged_and_split_back(length_encoder):
+    encoder = length_encoder()
+    scheduler = EncodeScheduler(encoder, max_batch=256, max_wait=0.05)
+    results = {}
+
+    def call(i):
+        results[i] = scheduler.encode(["x" * i, "y" * (i + 100)])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(1, 21)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(results[i][:, 0].tolist() == [i, i + 100] for i in results)
+    assert len(encoder.batches) < 20
+    stats = scheduler.stats()
+    assert stats["requests"] == 20 and stats["requests_per_batch"] > 1
+
+
+def test_batches_respect_max_batch(length_encoder):
+    encoder = length_encoder()
+    scheduler = EncodeScheduler(encoder, max_batch=4, max_wait=0.05)
+    futures = [scheduler.submit(["a", "bb"]) for _ in range(6)]
+    assert [f.result(timeout=5).shape for f in futures] == [(2, 2)] * 6
+    assert all(len(batch) <= 4 for batch in encoder.batches)
+
+
+def test_errors_reach_every_caller_of_the_batch(length_encoder):
+    scheduler = EncodeScheduler(length_encoder(), max_wait=0.05)
+    futures = [scheduler.submit(["boom"]), scheduler.submit(["fine"])]
+    for future in futures:
+        with pytest.raises(ValueError, match="boom"):
+            future.result(timeout=5)
+    assert scheduler.encode(["ok"]).shape == (1, 2)
+
+
+def test_full_queue_rejects_after_timeout(length_encoder):
+    release = threading.Event()
+    scheduler = EncodeScheduler(length_encoder(delay=release), max_batch=1, max_wait=0, max_queue=1,
+                                submit_timeout=0.05)
+    first = scheduler.submit(["a"])  # taken by the worker, which blocks on the encoder
+    while scheduler.stats()["queue_depth"]:
+        time.sleep(0.001)
+    scheduler.submit(["b"])  # fills the queue
+    with pytest.raises(EncodeQueueFull):
+        scheduler.submit(["c"])
+    release.set()
+    assert first.result(timeout=5).shape == (1, 2)
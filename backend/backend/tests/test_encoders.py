@@ -0,0 +1,15 @@
+import pytest
+
+from app.encoders import encoder_id, load_encoder
+
+
+def test_encoder_id_distinguishes_backends():
+    assert encoder_id("m", "torch", None) == "m"
+    assert encoder_id("m", "int8", None) == "m:int8"
+    assert encoder_id("m", "onnx", None) == "m:onnx"
+    assert encoder_id("m", "onnx", "onnx/model_qint8.onnx") == "m:onnx:onnx/model_qint8.onnx"
+
+
+def test_unknown_backend_is_rejected_before_loading():
+    with pytest.raises(ValueError, match="openvino"):
+        load_encoder("m", backend="openvino")
@@ -0,0 +1,84 @@
+import random
+
+from app import field_extraction as fx
+
+TRANSCRIPT = (
+    "Skolkovo Institute of Science and Technology\n"
+    "Student Ivan Petrov Date of Birth 1999-Jan-02 Student ID 123-45\n"
+    "Matriculation Date 2021-Sep-01 Date of Completion / Expected Date of 2023-Jun-30\n"
+    "Completion Level MSc Educational Program Data Science Field of Knowledge Computer Science\n"
+    "The language of instruction is English. GPA: 4.75\n"
+    "MA030111 Introduction to Data Science 3 A 108 Term 1B 2022-2023\n"
+    "MA060222 Machine Learning 6 B 216 Term 2 2022-2023\n"
+)
+
+FRAGMENTS = [
+    "Student ", "Student ID ", "Anna Smith", "Date of Birth 2000-Feb-03", "Moscow State University",
+    "University", "Skolkovo Institute of Science and Technology", "GPA ", "gpa: 3.9", "Program AI ",
+    "Educational Program Robotics Field of Knowledge", "Completion Level BSc ", "Field of Knowledge",
+    "MA030111 Data Science 3 A 108 Term 1B 2022-2023", "XMA030111 Intro 3 Pass 108 Term 2 2021-2022",
+    "Matriculation Date 2019-Sep-01", "language of instruction is Russian", " ", "\n", ", ", "12", "Ёлка",
+]
+
+
+def reference_transcript(text):
+    """The original per-field search/finditer implementation."""
+    info = {}
+    for key, pattern in (("full_name", fx.FULL_NAME_PATTERN), ("date_of_birth", fx.DATE_OF_BIRTH_PATTERN),
+                         ("student_id", fx.STUDENT_ID_PATTERN)):
+        match = pattern.search(text)
+        if match:
+            info[key] = match.group(1).strip() if key == "full_name" else match.group(1)
+    dates = {}
+    for key, pattern in (("matriculation", fx.MATRICULATION_PATTERN), ("completion", fx.COMPLETION_PATTERN)):
+        match = pattern.search(text)
+        if match:
+            dates[key] = match.group(1)
+    degree = fx.DEGREE_PATTERN.search(text)
+    major = fx.MAJOR_PROGRAM_PATTERN.search(text)
+    gpa = fx.GPA_PATTERN.search(text)
+    university = fx.UNIVERSITY_PATTERN.search(text)
+    lang = fx.LANGUAGE_OF_INSTRUCTION_PATTERN.search(text)
+    return {
+        "courses": [
+            {"code": c, "name": n.strip(), "ects": e, "grade": g, "hours": h}
+            for c, n, e, g, h in (m.groups() for m in fx.COURSE_PATTERN.finditer(text))
+        ],
+        "personal_info": info,
+        "degree": degree.group(1).strip() + ' ' + degree.group(2).strip() if degree else "",
+        "major_program": major.group(1).strip() if major else "",
+        "dates": dates,
+        "gpa": gpa.group(1) if gpa else None,
+        "university": university.group(0) if university else None,
+        "language_of_instruction": lang.group(1) if lang else None,
+    }
+
+
+def test_scan_transcript_fields():
+    result = fx.scan_transcript(TRANSCRIPT)
+    assert result["personal_info"] == {
+        "full_name": "Ivan Petrov Date of Birth", "date_of_birth": "1999-Jan-02", "student_id": "123-45"
+    }
+    assert result["degree"] == "MSc Data Science"
+    assert result["major_program"] == "Data Science"
+    assert result["dates"] == {"matriculation": "2021-Sep-01", "completion": "2023-Jun-30"}
+    assert result["gpa"] == "4.75"
+    assert result["university"] == "Skolkovo Institute of Science and Technology"
+    assert result["language_of_instruction"] == "English"
+    assert [c["code"] for c in result["courses"]] == ["MA030111", "MA060222"]
+
+
+def test_single_pass_matches_per_field_search():
+    """The one-pass scanner returns exactly what the separate searches return."""
+    rng = random.Random(42)
+    for _ in range(500):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 25)))
+        assert fx.scan_transcript(text) == reference_transcript(text), text
+
+
+def test_dated_entries_shared_by_experience_and_education():
+    text = "Acme Corp, Data Analyst, 2020-2022\nMIPT, BSc Applied Math, 2016–2020"
+    assert fx.scan_dated_entries(text) == [
+        ("Acme Corp", "Data Analyst", "2020", "2022"),
+        ("MIPT", "BSc Applied Math", "2016", "2020"),
+    ]
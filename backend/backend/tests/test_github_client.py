@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fixture_server import FixtureServer, github_repos
+from app.data_processor import DataProcessor
+from app.github_client import GitHubAPIError, GitHubClient, last_page
+from app.http_client import OutboundClient
+
+
+def expected(username):
+    repos = github_repos(username)
+    return {
+        "repositories": len(repos),
+        "stars": sum(r["stargazers_count"] for r in repos),
+        "forks": sum(r["forks_count"] for r in repos),
+        "languages": sorted({r["language"].lower() for r in repos if r["language"]}),
+    }
+
+
+def test_last_page_from_link_header():
+    link = ('<https://api.github.com/user/1/repos?per_page=100&page=2>; rel="next", '
+            '<https://api.github.com/user/1/repos?per_page=100&page=7>; rel="last"')
+    assert last_page(link) == 7
+    assert last_page(None) == 1
+
+
+def test_all_pages_are_aggregated_and_revalidated():
+    with FixtureServer() as server:
+        client = GitHubClient(OutboundClient(retries=0), api_url=server.environment()["GITHUB_API_URL"], per_page=4)
+        assert client.repositories("octocat").as_dict() == expected("octocat")
+        pages = client.stats()["misses"]
+        assert pages > 1
+        # Unchanged pages are answered with 304 and served from the cached aggregates
+        assert client.repositories("octocat").as_dict() == expected("octocat")
+        assert client.stats()["hits"] == pages
+
+
+def test_async_variant_matches_sync():
+    with FixtureServer() as server:
+        client = GitHubClient(OutboundClient(retries=0), api_url=server.environment()["GITHUB_API_URL"], per_page=3)
+        assert asyncio.run(client.repositories_async("torvalds")).as_dict() == expected("torvalds")
+
+
+def test_error_status_is_raised():
+    with FixtureServer() as server:
+        client = GitHubClient(OutboundClient(retries=0), api_url=server.base_url + "/missing")
+        with pytest.raises(GitHubAPIError) as error:
+            client.repositories("octocat")
+    assert error.value.status_code == 404
+
+
+def test_unreachable_github_degrades_to_an_error_entry(monkeypatch):
+    with FixtureServer() as server:
+        closed_url = server.base_url  # nothing listens here once the server has stopped
+    processor = DataProcessor(http=OutboundClient(retries=0, failure_threshold=1, reset_timeout=60))
+    monkeypatch.setattr(processor.github, "api_url", closed_url)
+    # The first call fails to connect and opens the breaker; the next ones are rejected by it
+    first = processor.analyze_github_profile("https://github.com/octocat")
+    assert first["error"].startswith("GitHub API error") and first["username"] == "octocat"
+    for result in (processor.analyze_github_profile("https://github.com/octocat"),
+                   asyncio.run(processor.analyze_github_profile_async("https://github.com/octocat"))):
+        assert result == {"error": f"GitHub API error: circuit open for {closed_url.split('//')[1]}",
+                          "username": "octocat"}
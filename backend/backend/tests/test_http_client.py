@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+import requests
+
+from app.http_client import CircuitBreaker, CircuitOpenError, OutboundClient
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+def test_breaker_opens_and_half_opens():
+    """The breaker fails fast after repeated failures and lets one probe through later."""
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    clock.now += 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_retries_transient_statuses(monkeypatch):
+    """503 responses are retried with backoff and the final response is returned."""
+    client = OutboundClient(retries=2, backoff=0)
+    statuses = iter([503, 503, 200])
+    monkeypatch.setattr(client.session, "get", lambda *a, **k: FakeResponse(next(statuses)))
+    assert client.get("https://api.hh.ru/vacancies").status_code == 200
+    stats = client.stats()["api.hh.ru"]
+    assert stats["requests"] == 3
+    assert stats["retries"] == 2
+    assert stats["errors"] == 2
+
+
+def test_open_circuit_fails_fast(monkeypatch):
+    """Once a host has failed repeatedly, calls are rejected without touching the network."""
+    client = OutboundClient(retries=0, failure_threshold=2)
+    calls = []
+
+    def refuse(*args, **kwargs):
+        calls.append(1)
+        raise requests.ConnectionError("connection refused")
+
+    monkeypatch.setattr(client.session, "get", refuse)
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            client.get("https://stepik.org/api/courses")
+    with pytest.raises(CircuitOpenError):
+        client.get("https://stepik.org/api/courses")
+    assert len(calls) == 2
+    assert client.stats()["stepik.org"]["circuit"] == "open"
+
+
+def half_open_client(clock):
+    client = OutboundClient(retries=0, failure_threshold=1, reset_timeout=10)
+    _, breaker, _ = client._host_state("http://upstream/path")
+    breaker.clock = clock
+    breaker.record_failure()
+    clock.now += 10
+    return client, breaker
+
+
+def test_cancelled_trial_frees_the_half_open_slot(monkeypatch):
+    """A cancelled probe neither counts as a failure nor keeps the host blocked."""
+    clock = Clock()
+    client, breaker = half_open_client(clock)
+
+    class AsyncClient:
+        def __init__(self):
+            self.hang = True
+
+        async def get(self, *args, **kwargs):
+            if self.hang:
+                await asyncio.Event().wait()
+            return FakeResponse(200)
+
+    upstream = AsyncClient()
+    monkeypatch.setattr(client, "_get_async_client", lambda: upstream)
+
+    async def scenario():
+        trial = asyncio.ensure_future(client.aget("http://upstream/path"))
+        await asyncio.sleep(0)
+        assert breaker._trial_in_flight
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        assert not breaker._trial_in_flight and breaker.state == "half_open"
+        upstream.hang = False
+        return await client.aget("http://upstream/path")
+
+    assert asyncio.run(scenario()).status_code == 200
+    assert breaker.state == "closed"
+
+
+def test_unexpected_errors_count_as_failures(monkeypatch):
+    """Errors outside the retried set still end the half-open trial as a failure."""
+    clock = Clock()
+    client, breaker = half_open_client(clock)
+
+    def redirect_loop(*args, **kwargs):
+        raise requests.TooManyRedirects("redirect loop")
+
+    monkeypatch.setattr(client.session, "get", redirect_loop)
+    with pytest.raises(requests.TooManyRedirects):
+        client.get("http://upstream/path")
+    assert breaker.state == "open" and not breaker._trial_in_flight
+    assert client.stats()["upstream"]["errors"] == 1
+    clock.now += 10
+    monkeypatch.setattr(client.session, "get", lambda *a, **k: FakeResponse(200))
+    assert client.get("http://upstream/path").status_code == 200
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.inference import InferenceClient, InferenceServer, RemoteInferenceError
+
+
+class UpperNLP:
+    """Stand-in for spaCy: capitalized words are ORG entities."""
+
+    def pipe(self, texts):
+        for text in texts:
+            yield SimpleNamespace(ents=[SimpleNamespace(text=w, label_="ORG") for w in text.split() if w.istitle()])
+
+
+@pytest.fixture
+def server(tmp_path, length_encoder):
+    server = InferenceServer(str(tmp_path / "inference.sock"), max_batch=64, max_wait=0.05)
+    server.encoder, server.nlp = length_encoder(), UpperNLP()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.serve(), loop)
+    InferenceClient(server.path).wait_ready(timeout=5)
+    yield server
+
+    async def shutdown():
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def test_encode_and_entities_round_trip(server):
+    client = InferenceClient(server.path)
+    assert client.encode(["ab", "abcd"]).tolist() == [[2.0, 1.0], [4.0, 1.0]]
+    docs = client.entities(["worked at Yandex and Sber", "nothing"])
+    assert [[(e.text, e.label_) for e in doc] for doc in docs] == [[("Yandex", "ORG"), ("Sber", "ORG")], []]
+
+
+def test_concurrent_requests_share_model_calls(server):
+    client = InferenceClient(server.path)
+    results = {}
+
+    def call(i):
+        results[i] = client.encode(["x" * i])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(1, 17)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(results[i][0, 0] == i for i in results)
+    assert len(server.encoder.batches) < 16
+
+
+def test_model_errors_are_reported_to_the_caller(server):
+    client = InferenceClient(server.path)
+    with pytest.raises(RemoteInferenceError, match="boom"):
+        client.encode(["boom"])
+    assert client.encode(["ok"]).shape == (1, 2)
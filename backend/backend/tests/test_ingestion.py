@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from app import config
+from app.encoders import encoder_id
+from app.http_client import OutboundClient
+from app.ingestion import IngestionWorker
+from app.local_store import SQLiteStore
+from app.position_taxonomy import PositionTaxonomy, Role
+from app.recommendation_engine import RecommendationEngine
+from app.response_cache import MemoryBackend, ResponseCache
+from app.vacancy_store import LocalVacancies, VacancyStore
+
+
+TAXONOMY = PositionTaxonomy([
+    Role("data scientist", ["датасаентист"], ["machine learning"]),
+    Role("data analyst", ["аналитик данных"], ["sql"]),
+])
+
+
+@pytest.fixture
+def keyword_encode(keyword_encoder):
+    return keyword_encoder(["python", "sql", "analyst", "scientist"])
+
+
+def ingested_store(tmp_path, encode):
+    store = VacancyStore(str(tmp_path / "vacancies.db"))
+    with FixtureServer() as server:
+        worker = IngestionWorker(TAXONOMY, OutboundClient(retries=0), vacancies=store,
+                                 encode=encode, model=encoder_id(), hh_pages=2)
+        worker.hh_api_url = server.environment()["HH_API_URL"]
+        first = worker.ingest_vacancies()
+        second = worker.ingest_vacancies()
+    return store, first, second
+
+
+def test_ingestion_embeds_only_new_vacancies(tmp_path, keyword_encode):
+    store, first, second = ingested_store(tmp_path, keyword_encode)
+    assert first["queries"] == 6 and first["failed"] == []
+    # 2 pages of 100 per role and level
+    assert first["vacancies"] == 1200 == first["changed"] == first["embedded"] == sum(keyword_encode.calls)
+    assert second["changed"] == second["embedded"] == second["purged"] == 0
+    feed = store.changes(limit=5000)
+    assert len(feed) == 1200 and {change["op"] for change in feed} == {"insert"}
+    assert store.changes(since=feed[-2]["seq"]) == feed[-1:]
+
+
+def test_change_feed_records_updates_and_purges(tmp_path, keyword_encode):
+    store = VacancyStore(str(tmp_path / "vacancies.db"))
+    vacancy = {"id": "1", "name": "Junior Python developer", "url": "https://hh.ru/vacancy/1", "snippet": "Python"}
+    assert store.upsert("junior python developer", [vacancy], now=100.0) == 1
+    assert store.upsert("junior python developer", [vacancy], now=200.0) == 0
+    assert store.upsert("junior python developer", [dict(vacancy, snippet="Python, SQL")], now=300.0) == 1
+    assert store.embed_missing(keyword_encode, encoder_id()) == 1
+    assert store.purge(max_age=1000, now=1200.0) == 0
+    assert store.purge(max_age=1000, now=1400.0) == 1
+    assert [(c["id"], c["op"]) for c in store.changes()] == [("1", "insert"), ("1", "update"), ("1", "delete")]
+    assert len(store) == 0
+
+
+def test_stores_must_define_their_tables(tmp_path):
+    with pytest.raises(TypeError):
+        SQLiteStore(str(tmp_path / "store.db"))
+
+
+def test_failed_queries_are_skipped(tmp_path):
+    store = VacancyStore(str(tmp_path / "vacancies.db"))
+
+    class Down:
+        def get(self, *args, **kwargs):
+            raise ConnectionError("hh.ru is down")
+
+    report = IngestionWorker(TAXONOMY, Down(), vacancies=store).ingest_vacancies()
+    assert len(report["failed"]) == report["queries"] == 6
+    assert report["vacancies"] == 0 and store.get_meta("synced_at") is not None
+
+
+def test_engine_serves_vacancies_from_store(tmp_path, monkeypatch, keyword_encode, no_network):
+    store, *_ = ingested_store(tmp_path, keyword_encode)
+    engine = RecommendationEngine(cache=ResponseCache(MemoryBackend()), http=no_network,
+                                  vacancy_store=LocalVacancies(store), encode=keyword_encode)
+    engine.positions = TAXONOMY
+    jobs = engine.get_hh_vacancies("junior Senior Data Analyst", "intermediate", ["sql"])
+    assert len(jobs) == 5 and all(set(job) == {"name", "url", "snippet"} for job in jobs)
+    assert all(job["name"].startswith("junior data analyst #") for job in jobs)
+    internships = asyncio.run(engine.get_hh_vacancies_async("intern аналитик данных", "beginner", ["sql"]))
+    assert all(job["name"].startswith("intern data analyst #") for job in internships)
+    # Positions outside the store go to hh.ru unless the live fallback is disabled
+    monkeypatch.setattr(config, "VACANCY_LIVE_FALLBACK", False)
+    assert engine.get_hh_vacancies("junior Pastry Chef", "intermediate", ["sql"]) == []
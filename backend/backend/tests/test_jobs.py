@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from app import metrics
+from app.jobs import DONE, FAILED, JobQueue, JobQueueFull, sse_event
+
+
+def staged(stages, gate=None, fail=False):
+    async def run(emit):
+        if gate is not None:
+            await gate.wait()
+        for stage in stages:
+            await asyncio.sleep(0)
+            emit(stage, {"stage": stage})
+        if fail:
+            raise ValueError("PDF has too many pages")
+        return {"stages": list(stages)}
+    return run
+
+
+def test_jobs_run_by_priority_within_the_worker_limit():
+    async def scenario():
+        queue = JobQueue(workers=1, max_queued=10)
+        order = []
+        gate = asyncio.Event()
+
+        def job(name):
+            async def run(emit):
+                await gate.wait()
+                order.append(name)
+            return run
+
+        blocker = queue.submit(job("blocker"))
+        await asyncio.sleep(0)  # the worker takes the first job
+        low, high, normal = queue.submit(job("low"), -1), queue.submit(job("high"), 5), queue.submit(job("normal"))
+        assert queue.stats() == {"queued": 3, "running": 1}
+        gate.set()
+        while not all(j.state == DONE for j in (blocker, low, high, normal)):
+            await asyncio.sleep(0.001)
+        await queue.close()
+        return order
+
+    assert asyncio.run(scenario()) == ["blocker", "high", "normal", "low"]
+
+
+def test_workers_do_not_inherit_the_first_request_context():
+    async def run(emit):
+        with metrics.timed("job_stage"):
+            await asyncio.sleep(0)
+
+    async def scenario():
+        queue = JobQueue(workers=2, max_queued=200)
+        with metrics.collect_timings() as timings:
+            jobs = [queue.submit(run)]
+        jobs += [queue.submit(run) for _ in range(100)]
+        while not all(job.state == DONE for job in jobs):
+            await asyncio.sleep(0.001)
+        await queue.close()
+        return timings
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_full_queue_rejects_submissions():
+    async def scenario():
+        queue = JobQueue(workers=1, max_queued=1)
+        gate = asyncio.Event()
+        queue.submit(staged([], gate))
+        await asyncio.sleep(0)
+        queue.submit(staged([], gate))
+        with pytest.raises(JobQueueFull):
+            queue.submit(staged([], gate))
+        gate.set()
+        await queue.close()
+
+    asyncio.run(scenario())
+
+
+def test_events_stream_stages_then_result_and_resume():
+    async def scenario():
+        queue = JobQueue()
+        job = queue.submit(staged(["skills", "structured", "recommendations"]))
+        streamed = [(i, stage) async for i, stage, _ in queue.events(job)]
+        resumed = [(i, stage) async for i, stage, _ in queue.events(job, since=2)]
+        failed = queue.submit(staged(["skills"], fail=True))
+        errors = [(stage, data) async for _, stage, data in queue.events(failed)]
+        await queue.close()
+        return job, streamed, resumed, failed, errors
+
+    job, streamed, resumed, failed, errors = asyncio.run(scenario())
+    assert streamed == [(1, "skills"), (2, "structured"), (3, "recommendations"), (4, "result")]
+    assert resumed == [(3, "recommendations"), (4, "result")]
+    assert job.as_dict()["state"] == DONE and set(job.as_dict()["stages"]) == {"skills", "structured", "recommendations"}
+    assert failed.state == FAILED and errors[-1] == ("error", {"message": "PDF has too many pages"})
+    assert sse_event(4, "result", {"ok": "да"}) == 'id: 4\nevent: result\ndata: {"ok": "да"}\n\n'
+
+
+def test_finished_jobs_expire():
+    async def scenario():
+        queue = JobQueue(result_ttl=0)
+        job = queue.submit(staged([]))
+        async for _ in queue.events(job):
+            pass
+        await asyncio.sleep(0.01)
+        await queue.close()
+        return queue.get(job.id)
+
+    assert asyncio.run(scenario()) is None
@@ -0,0 +1,29 @@
+import random
+
+from app.keyword_matcher import KeywordMatcher, detect_language, script_counts
+
+
+def test_matches_like_substring_search():
+    """Every keyword occurrence is found, including overlapping and nested keywords."""
+    rng = random.Random(0)
+    keywords = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(30)]
+    matcher = KeywordMatcher(keywords)
+    for _ in range(200):
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 20)))
+        assert matcher.found(text) == {kw for kw in keywords if kw in text}
+        assert matcher.search(text) == any(kw in text for kw in keywords)
+
+
+def test_labels_group_keywords():
+    matcher = KeywordMatcher(["Bachelor", "бакалавр", "master"], ["BSc", "BSc", "MSc"])
+    assert matcher.found("бакалавр и master of science") == {"BSc", "MSc"}
+    assert matcher.found("bachelor") == {"BSc"}
+    assert not KeywordMatcher([]).search("anything")
+
+
+def test_script_detection():
+    assert script_counts("Python для всех") == {"cyrillic": 7, "latin": 6, "kazakh": 0}
+    assert detect_language("Основы языка Python") == "ru"
+    assert detect_language("Intro to Machine Learning на русском") == "en"
+    assert detect_language("Қазақ тілінде") == "kk"
+    assert detect_language("123 — !") is None
@@ -0,0 +1,50 @@
+import asyncio
+import contextvars
+
+from app import metrics
+from app.http_client import HostStats
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = metrics.Registry()
+    registry.histogram("stage_duration_seconds", "Duration of pipeline stages", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        registry.observe("stage_duration_seconds", value, stage="pdf_text")
+    lines = registry.render()
+    assert 'advisor_stage_duration_seconds_bucket{stage="pdf_text",le="0.1"} 1' in lines
+    assert 'advisor_stage_duration_seconds_bucket{stage="pdf_text",le="1.0"} 3' in lines
+    assert 'advisor_stage_duration_seconds_bucket{stage="pdf_text",le="+Inf"} 4' in lines
+    assert 'advisor_stage_duration_seconds_count{stage="pdf_text"} 4' in lines
+
+
+def test_timings_are_collected_from_tasks_and_executor_jobs():
+    def blocking_stage():
+        with metrics.timed("encode"):
+            pass
+
+    async def handle():
+        with metrics.collect_timings() as timings:
+            with metrics.timed("request"):
+                context = contextvars.copy_context()
+                await asyncio.gather(
+                    asyncio.get_running_loop().run_in_executor(None, context.run, blocking_stage),
+                    asyncio.sleep(0),
+                )
+        return timings
+
+    timings = asyncio.run(handle())
+    assert [stage for stage, _ in timings] == ["encode", "request"]
+    header = metrics.server_timing_header(timings + [("encode", 0.5)])
+    assert header.startswith("encode;dur=") and header.endswith("request;dur=%.1f" % (timings[1][1] * 1000))
+
+
+def test_outbound_and_cache_lines():
+    stats = HostStats()
+    stats.observe(0.02, error=False)
+    stats.observe(9.0, error=True)
+    lines = metrics.outbound_lines({"api.hh.ru": dict(stats.as_dict(), circuit="open")})
+    assert 'advisor_outbound_errors_total{host="api.hh.ru"} 1' in lines
+    assert 'advisor_outbound_request_duration_seconds_bucket{host="api.hh.ru",le="+Inf"} 2' in lines
+    assert 'advisor_outbound_circuit_open{host="api.hh.ru"} 1' in lines
+    lines = metrics.cache_lines({"profile": {"entries": 3, "hits": 1, "misses": 1, "hit_rate": 0.5}})
+    assert 'advisor_cache_hit_ratio{cache="profile"} 0.5' in lines
@@ -0,0 +1,71 @@
+import tempfile
+
+import pytest
+
+from app import config, pdf_ingest
+from app.pdf_ingest import PDFLimitError, _mupdf_lock, iter_pdf_pages
+
+pymupdf = pytest.importorskip("pymupdf")
+
+
+def make_pdf(pages: int) -> bytes:
+    doc = pymupdf.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {i}")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def upload(data: bytes, max_size: int):
+    """Like Starlette's UploadFile.file: kept in memory up to max_size, then rolled over to disk."""
+    spooled = tempfile.SpooledTemporaryFile(max_size=max_size)
+    spooled.write(data)
+    spooled.seek(0)
+    return spooled
+
+
+@pytest.mark.parametrize("max_size", [1 << 24, 1], ids=["spooled", "rolled_over"])
+def test_pages_are_read_from_the_upload_in_order(max_size):
+    with upload(make_pdf(3), max_size) as file:
+        assert file._rolled == (max_size == 1)
+        assert [text.strip() for text in iter_pdf_pages(file)] == ["Page 0", "Page 1", "Page 2"]
+
+
+@pytest.mark.parametrize("max_size", [1 << 24, 1], ids=["spooled", "rolled_over"])
+def test_parallel_extraction_matches_sequential(monkeypatch, max_size):
+    data = make_pdf(5)
+    expected = list(iter_pdf_pages(data))
+    monkeypatch.setattr(config, "PDF_PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setattr(config, "PDF_WORKERS", 2)
+    monkeypatch.setattr(config, "PDF_PAGES_PER_TASK", 2)
+    with upload(data, max_size) as file:
+        if file._rolled:
+            # Workers open the rolled-over upload itself instead of a copy
+            monkeypatch.setattr(pdf_ingest.tempfile, "NamedTemporaryFile", None)
+        assert list(iter_pdf_pages(file)) == expected
+
+
+@pytest.mark.parametrize("parallel", [False, True], ids=["sequential", "parallel"])
+def test_closing_the_stream_early_releases_the_upload(monkeypatch, parallel):
+    if parallel:
+        monkeypatch.setattr(config, "PDF_PARALLEL_MIN_PAGES", 2)
+        monkeypatch.setattr(config, "PDF_WORKERS", 2)
+        monkeypatch.setattr(config, "PDF_PAGES_PER_TASK", 1)
+    with upload(make_pdf(6), 1) as file:
+        pages = iter_pdf_pages(file)
+        assert next(pages).strip() == "Page 0"
+        pages.close()  # would raise BufferError if the mmap were still exported
+        assert not _mupdf_lock.locked()
+        file.seek(0)
+        assert len(list(iter_pdf_pages(file))) == 6
+
+
+def test_limits_are_enforced(monkeypatch):
+    data = make_pdf(3)
+    monkeypatch.setattr(config, "MAX_PDF_PAGES", 2)
+    with pytest.raises(PDFLimitError, match="pages"):
+        list(iter_pdf_pages(data))
+    monkeypatch.setattr(config, "MAX_PDF_BYTES", len(data) - 1)
+    with pytest.raises(PDFLimitError, match="bytes"):
+        list(iter_pdf_pages(data))
@@ -0,0 +1,61 @@
+import asyncio
+
+from benchmarks.fixture_server import FixtureServer
+from app.http_client import OutboundClient
+from app.position_taxonomy import PositionTaxonomy, Role
+from app.recommendation_engine import RecommendationEngine
+from app.response_cache import MemoryBackend, ResponseCache
+
+DATA_SCIENTIST_KEYWORDS = [
+    "data science", "machine learning", "ml", "deep learning", "нейронные сети", "статистика",
+    "анализ данных", "big data", "pandas", "numpy", "scikit-learn", "regression", "classification",
+    "clustering", "ai", "data analysis", "data visualization", "matplotlib", "feature engineering",
+    "kaggle", "data mining", "time series", "nlp", "natural language processing", "tensorflow", "pytorch"
+]
+
+
+def test_bundled_taxonomy_keeps_data_scientist_keywords():
+    engine = RecommendationEngine(cache=ResponseCache(MemoryBackend()))
+    assert engine.get_position_keywords("Senior Data Scientist") == DATA_SCIENTIST_KEYWORDS
+    assert engine.get_position_keywords("Data Science intern") == DATA_SCIENTIST_KEYWORDS
+    assert engine.get_position_keywords("Аналитик данных")[:2] == ["data analysis", "анализ данных"]
+    # Without an encoder unknown positions fall back to python courses
+    assert engine._course_search_keywords([], "Астронавт")[0] == ["python"]
+
+
+def test_aliases_match_whole_words_and_longest_wins():
+    taxonomy = PositionTaxonomy.load()
+    assert [r.name for r in taxonomy.resolve("Django developer")] == ["software engineer"]
+    assert [r.name for r in taxonomy.resolve("Go developer (middle)")] == ["go developer"]
+    assert [r.name for r in taxonomy.resolve("Business analyst")] == ["business analyst"]
+    assert [r.name for r in taxonomy.resolve("Quality assurance")] == ["qa engineer"]
+    assert [r.name for r in taxonomy.resolve("Junior QA")] == ["qa engineer"]
+    assert [r.name for r in taxonomy.resolve("SRE")] == ["devops engineer"]
+    # Short aliases are not prefixes of unrelated words ("quant", "qa", "sre")
+    assert [r.name for r in taxonomy.resolve("Quantum computing engineer")] == []
+    assert [r.name for r in taxonomy.resolve("Qantas pilot")] == []
+    assert [r.name for r in taxonomy.resolve("Sretensky")] == []
+
+
+def test_embedding_lookup_is_vectorized_and_memoized(letter_encoder):
+    taxonomy = PositionTaxonomy([
+        Role("gardener", ["садовник"], ["plants"]),
+        Role("baker", ["пекарь"], ["bread"]),
+    ], encode=letter_encoder, threshold=0.9)
+    # No alias occurs in "kbaer"; its letters are those of "baker"
+    assert taxonomy.keywords("kbaer") == ["bread"]
+    calls = len(letter_encoder.batches)
+    assert taxonomy.keywords("Kbaer!") == ["bread"]
+    assert len(letter_encoder.batches) == calls
+    assert taxonomy.keywords("zzz") == []
+
+
+def test_async_courses_resolve_positions_off_the_event_loop(letter_encoder):
+    with FixtureServer() as server:
+        engine = RecommendationEngine(cache=ResponseCache(MemoryBackend()), http=OutboundClient(retries=0),
+                                      encode=letter_encoder)
+        engine.stepik_api_url = server.environment()["STEPIK_API_URL"]
+        # No alias matches: the position is embedded and compared with every alias
+        asyncio.run(engine.get_stepik_courses_async("beginner", ["python"], "Scientist of data"))
+    assert len(letter_encoder.batches) == 2
+    assert all(name.startswith("cpu-stage") for name in letter_encoder.threads)
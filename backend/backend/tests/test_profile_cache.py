@@ -0,0 +1,36 @@
+import io
+
+from app import profile_cache as pc
+from app.response_cache import MemoryBackend, SQLiteBackend
+
+
+def test_digest_depends_on_content_and_restores_position():
+    upload = io.BytesIO(b"%PDF-1.4 resume")
+    upload.seek(3)
+    digest = pc.file_digest(upload, chunk_size=4)
+    assert upload.tell() == 3
+    assert digest == pc.file_digest(io.BytesIO(b"%PDF-1.4 resume"))
+    assert digest != pc.file_digest(io.BytesIO(b"%PDF-1.4 resume 2"))
+
+
+def test_key_includes_kind_model_and_version():
+    cache = pc.ProfileCache(MemoryBackend(), model_name="model-a")
+    cache.set("resume", "abc", {"skills": ["python"]})
+    assert cache.get("resume", "abc") == {"skills": ["python"]}
+    assert cache.get("transcript", "abc") is None
+    assert pc.ProfileCache(cache.backend, model_name="model-b").get("resume", "abc") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_sqlite_backend_survives_restart_and_is_bounded(tmp_path):
+    path = str(tmp_path / "profiles.db")
+    cache = pc.ProfileCache(SQLiteBackend(path, max_entries=2, table="profile_cache"), model_name="m")
+    cache.set("resume", "abc", {"text": "cv", "skills": []})
+    restarted = pc.ProfileCache(SQLiteBackend(path, max_entries=2, table="profile_cache"), model_name="m")
+    assert restarted.get("resume", "abc") == {"text": "cv", "skills": []}
+
+    bounded = pc.ProfileCache(MemoryBackend(max_entries=2), model_name="m")
+    for digest in ("a", "b", "c"):
+        bounded.set("resume", digest, {})
+    assert bounded.get("resume", "a") is None
+    assert len(bounded.backend) == 2
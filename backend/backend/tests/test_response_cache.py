@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from app.response_cache import CachedUpstreamError, MemoryBackend, ResponseCache, SQLiteBackend
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_params_are_normalized():
+    """Queries differing only in case, whitespace or key order share an entry."""
+    cache = ResponseCache(clock=Clock())
+    calls = []
+    fetch = lambda: calls.append(1) or ["vacancy"]
+    cache.get_or_fetch("hh", {"text": "Junior  Data Scientist", "area": 113}, fetch)
+    cache.get_or_fetch("hh", {"area": 113, "text": "junior data scientist "}, fetch)
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_ttl_and_stale_while_revalidate():
+    """Expired entries are served stale while a background refresh replaces them."""
+    clock = Clock()
+    cache = ResponseCache(ttls={"stepik": 10}, stale_ttl=5, clock=clock)
+    values = iter(["old", "new"])
+    fetch = lambda: next(values)
+    assert cache.get_or_fetch("stepik", {"search": "ml"}, fetch) == "old"
+    clock.now += 12
+    assert cache.get_or_fetch("stepik", {"search": "ml"}, fetch) == "old"
+    deadline = time.time() + 2
+    while cache.get_or_fetch("stepik", {"search": "ml"}, fetch) != "new":
+        assert time.time() < deadline
+        time.sleep(0.01)
+    assert cache.stats()["stale_hits"] >= 1
+
+
+def test_errors_are_negatively_cached():
+    """A failed fetch is not retried until error_ttl has passed."""
+    clock = Clock()
+    cache = ResponseCache(error_ttl=30, clock=clock)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise RuntimeError("503 Service Unavailable")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_fetch("hh", {"text": "intern"}, failing)
+    with pytest.raises(CachedUpstreamError, match="503"):
+        cache.get_or_fetch("hh", {"text": "intern"}, failing)
+    clock.now += 31
+    with pytest.raises(RuntimeError):
+        cache.get_or_fetch("hh", {"text": "intern"}, failing)
+    assert len(calls) == 2
+
+
+def test_memory_backend_is_size_bounded():
+    backend = MemoryBackend(max_entries=2)
+    cache = ResponseCache(backend, clock=Clock())
+    for query in ["a", "b", "c"]:
+        cache.get_or_fetch("stepik", {"search": query}, lambda: query)
+    assert len(backend) == 2
+
+
+def test_sqlite_backend_is_shared(tmp_path):
+    """Two caches on the same SQLite file (e.g. two workers) share results."""
+    path = str(tmp_path / "responses.db")
+    first = ResponseCache(SQLiteBackend(path))
+    second = ResponseCache(SQLiteBackend(path))
+    first.get_or_fetch("stepik", {"search": "pandas"}, lambda: {"courses": [{"id": 1}]})
+    assert second.get_or_fetch("stepik", {"search": "pandas"}, lambda: None) == {"courses": [{"id": 1}]}
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from app.http_client import OutboundClient
+from app.recommendation_engine import RecommendationEngine
+from app.response_cache import MemoryBackend, ResponseCache
+from app.vacancy_ranking import VacancyRanker, vacancy_text
+
+
+
+@pytest.fixture
+def encoder(keyword_encoder):
+    return keyword_encoder(["python", "sql", "java", "excel"], bias=0.01)
+
+
+def vacancy(i, text):
+    return {"id": str(i), "name": f"Vacancy {i}", "url": f"https://hh.ru/vacancy/{i}", "snippet": text}
+
+
+def test_ranks_by_skills_and_reuses_embeddings_by_id(encoder):
+    ranker = VacancyRanker(encoder)
+    vacancies = [vacancy(1, "Excel reports"), vacancy(2, "<highlighttext>Java</highlighttext> backend"),
+                 vacancy(3, "Python and SQL"), vacancy(4, "SQL only")]
+    assert [v["id"] for v in ranker.rank(vacancies, ["python", "sql"], 2)] == ["3", "4"]
+    assert encoder.calls == [2, 4]  # skills, then all vacancy texts in one call
+    ranker.rank(vacancies + [vacancy(5, "Python")], ["java"], 1)
+    assert encoder.calls[-1] == 1  # only the unseen vacancy is encoded
+    # An edited vacancy is encoded again
+    ranker.rank([vacancy(1, "Python now")] + vacancies[1:], ["python"], 1)
+    assert encoder.calls[-1] == 1
+    assert ranker.stats()["hits"] == 3 + 4
+
+
+def test_highlighting_is_removed():
+    assert vacancy_text(vacancy(1, "<highlighttext>Python</highlighttext>")) == "Vacancy 1. Python"
+
+
+def test_engine_returns_top_vacancies_from_a_larger_page(encoder):
+    with FixtureServer() as server:
+        engine = RecommendationEngine(cache=ResponseCache(MemoryBackend()), http=OutboundClient(retries=0),
+                                      encode=encoder)
+        engine.hh_api_url = server.environment()["HH_API_URL"]
+        jobs = engine.get_hh_vacancies("junior Data Scientist", "intermediate", ["python"])
+        jobs_async = asyncio.run(engine.get_hh_vacancies_async("junior Data Scientist", "intermediate", ["python"]))
+    assert len(jobs) == 5 and jobs == jobs_async
+    assert set(jobs[0]) == {"name", "url", "snippet"}
+    assert engine.vacancy_ranker.stats()["entries"] == 50
+
+
+def test_async_ranking_runs_in_the_cpu_pool(encoder):
+    with FixtureServer() as server:
+        engine = RecommendationEngine(cache=ResponseCache(MemoryBackend()), http=OutboundClient(retries=0),
+                                      encode=encoder)
+        engine.hh_api_url = server.environment()["HH_API_URL"]
+        asyncio.run(engine.get_hh_vacancies_async("junior Data Scientist", "intermediate", ["python"]))
+    assert encoder.threads and all(name.startswith("cpu-stage") for name in encoder.threads)